@@ -0,0 +1,72 @@
+"""Compares API calls per second with and without connection pooling
+
+Usage:
+
+    python benchmarks/bench_connection_pool.py [num_calls]
+
+The "unpooled" scenario issues every call through the module level
+``requests.get`` function, which is how RestIO used to talk to the API, so
+a fresh TCP connection is opened for every call. The "pooled" scenario sends
+the same calls through a :class:`friendlypins.utils.rest_io.RestIO` object,
+which re-uses the connections held by its session. The API emulator runs
+without TLS, so the real-world gain against api.pinterest.com, where every
+new connection also pays for a TLS handshake, is larger than what is
+reported here.
+"""
+import sys
+import time
+import requests
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer)
+from friendlypins.utils.rest_io import RestIO
+
+
+def _unpooled(url, num_calls):
+    """Issues API calls with a new connection each time"""
+    for _ in range(num_calls):
+        response = requests.get(url + "/me", params={"access_token": "abcd"})
+        response.raise_for_status()
+        response.json()
+
+
+def _pooled(url, num_calls):
+    """Issues API calls through a shared, pooled session"""
+    with RestIO("abcd", root_url=url) as rest_io:
+        for _ in range(num_calls):
+            rest_io.get("me")
+
+
+def _measure(func, url, num_calls):
+    """Times a benchmark scenario
+
+    Returns:
+        float: number of calls completed per second
+    """
+    start = time.perf_counter()
+    func(url, num_calls)
+    return num_calls / (time.perf_counter() - start)
+
+
+def main(num_calls=500):
+    """Runs both scenarios against a local API emulator and reports results
+
+    Args:
+        num_calls (int): number of API calls to make in each scenario
+    """
+    # both scenarios share one token, so the rate limit must cover them all
+    emulator = Emulator(conditions=ApiConditions(rate_limit=10 ** 9))
+    with EmulatorServer(emulator) as server:
+        # warm up both code paths before measuring anything
+        _unpooled(server.url, 10)
+        _pooled(server.url, 10)
+
+        before = _measure(_unpooled, server.url, num_calls)
+        after = _measure(_pooled, server.url, num_calls)
+
+    print("unpooled: {0:8.1f} calls/sec".format(before))
+    print("pooled:   {0:8.1f} calls/sec".format(after))
+    print("speedup:  {0:8.2f}x".format(after / before))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,131 @@
+"""Measures the CPU cost of decoding one page of pin results
+
+Usage:
+
+    python benchmarks/bench_page_decode.py [num_pages]
+
+The "text + json" scenario mimics how RestIO used to handle every response:
+the body was converted to text for a debug log message, which runs the
+character set detection in the requests library, and then decoded again by
+``response.json()``. The "raw bytes" scenario parses the response body once,
+straight from the raw bytes, using whichever JSON backend is available. No
+network traffic is involved, so the numbers reflect parsing cost alone.
+"""
+import json
+import sys
+import time
+import requests
+from friendlypins.utils import json_codec
+
+
+def make_page(num_pins=100):
+    """Generates JSON data that mimics one page of pins returned by the API
+
+    Args:
+        num_pins (int): number of pins to include on the page
+
+    Returns:
+        dict: the generated page of results
+    """
+    pins = list()
+    for i in range(num_pins):
+        unique_id = str(1000000000 + i)
+        pins.append({
+            "id": unique_id,
+            "link": "https://www.example.com/articles/{0}".format(i),
+            "url": "https://www.pinterest.com/pin/{0}/".format(unique_id),
+            "board": {
+                "id": "987654321",
+                "name": "My Board",
+                "url": "https://www.pinterest.com/MyUserName/my-board/",
+            },
+            "created_at": "2018-03-31T10:58:09",
+            "note": "Pin number {0} with a café description".format(i),
+            "color": "#4c4c4c",
+            "counts": {"saves": i, "comments": 0},
+            "media": {"type": "image"},
+            "attribution": None,
+            "image": {
+                "original": {
+                    "url": "https://i.pinimg.com/originals/{0}.jpg".format(
+                        unique_id),
+                    "width": 736,
+                    "height": 1104,
+                }
+            },
+            "metadata": {},
+            "original_link": "https://www.example.com/articles/{0}".format(i),
+        })
+    return {
+        "data": pins,
+        "page": {
+            "cursor": "LT4xMjM0NTY3ODkwfDEyMzQ1Njc4OTA=",
+            "next": None,
+        },
+    }
+
+
+def _make_response(body):
+    """Builds a response object like the ones returned by the API
+
+    Args:
+        body (bytes): raw body of the response
+
+    Returns:
+        requests.Response: the response
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    # pylint: disable=protected-access
+    response._content = body
+    return response
+
+
+def _text_and_json(body):
+    """Decodes a response the way RestIO used to"""
+    response = _make_response(body)
+    str(response.text)
+    return response.json()
+
+
+def _raw_bytes(body):
+    """Decodes a response the way RestIO does now"""
+    response = _make_response(body)
+    return json_codec.loads(response.content)
+
+
+def _measure(func, body, num_pages):
+    """Times a benchmark scenario
+
+    Returns:
+        float: average number of milliseconds spent decoding each page
+    """
+    start = time.perf_counter()
+    for _ in range(num_pages):
+        func(body)
+    return (time.perf_counter() - start) * 1000 / num_pages
+
+
+def main(num_pages=200):
+    """Runs both scenarios and reports results
+
+    Args:
+        num_pages (int): number of pages to decode in each scenario
+    """
+    body = json.dumps(make_page()).encode("utf-8")
+    _text_and_json(body)
+    _raw_bytes(body)
+
+    before = _measure(_text_and_json, body, num_pages)
+    after = _measure(_raw_bytes, body, num_pages)
+
+    print("page size:     {0:8d} bytes".format(len(body)))
+    print("json backend:  {0:>8}".format(json_codec.backend()))
+    print("text + json:   {0:8.3f} ms/page".format(before))
+    print("raw bytes:     {0:8.3f} ms/page".format(after))
+    print("speedup:       {0:8.2f}x".format(before / after))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,351 @@
+"""Performance baselines for the core operations of the library
+
+Usage:
+
+    python benchmarks/bench_suite.py [--output FILE] [--compare FILE]
+                                     [--scale N] [--only NAME]
+
+Every scenario runs against in-memory data, the fake transport or a local
+API emulator, so results reflect the cost of the library itself rather than
+the network. Each scenario reports one or more metrics. Timings are the
+best of several repeats, to reduce noise from other processes.
+
+Results are written as JSON, along with the library and Python versions
+they were recorded with. Provide the results file from an earlier run with
+``--compare`` to report how each metric has changed, and to exit with an
+error when any of them regressed by more than the allowed tolerance.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from unittest import mock
+from dateutil import tz
+from friendlypins.board import Board
+from friendlypins.headers import Headers
+from friendlypins.pin import Pin
+from friendlypins.utils import console_actions
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer, SyntheticAccount)
+from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.transport import FakeTransport
+from friendlypins.version import __version__
+
+# number of pins on each page of paged results
+PAGE_SIZE = 100
+
+# registry of all benchmark scenarios, in the order they are run
+SCENARIOS = list()
+
+# sample headers returned by the API, used to measure parsing costs
+SAMPLE_HEADERS = {
+    "Date": "Sat, 31 Mar 2018 10:58:09 GMT",
+    "Content-Type": "application/json; charset=utf-8",
+    "Content-Length": "4120",
+    "X-Ratelimit-Limit": "1000",
+    "X-Ratelimit-Remaining": "998",
+    "X-Ratelimit-Refresh": "3600",
+}
+
+# metrics where a larger value is better, keyed by unit
+HIGHER_IS_BETTER = {"ops/sec": True, "pages/sec": True, "pins/sec": True,
+                    "bytes/pin": False, "usec/op": False}
+
+
+def scenario(func):
+    """Decorator that registers a benchmark scenario"""
+    SCENARIOS.append(func)
+    return func
+
+
+def best_time(func, repeat=5):
+    """Times a function, keeping the fastest of several runs
+
+    Args:
+        func (callable): function to time
+        repeat (int): number of times to run the function
+
+    Returns:
+        float: the fastest run time, in seconds
+    """
+    retval = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if retval is None or elapsed < retval:
+            retval = elapsed
+    return retval
+
+
+def make_pins(count, board_index=0):
+    """Generates response data for synthetic pins
+
+    Args:
+        count (int): number of pins to generate
+        board_index (int): which synthetic board the pins come from
+
+    Returns:
+        list (dict): response data for each pin
+    """
+    account = SyntheticAccount(
+        num_boards=board_index + 1, pins_per_board=count)
+    board_id = account.boards()[board_index]["id"]
+    return account.pins(board_id, 0, count, "http://localhost")[0]
+
+
+def make_transport(num_pages):
+    """Creates a fake transport serving a board with several pages of pins
+
+    Args:
+        num_pages (int): number of pages of pins on the board
+
+    Returns:
+        FakeTransport: the transport
+    """
+    pins = make_pins(num_pages * PAGE_SIZE)
+    transport = FakeTransport(rate_limit=10 ** 9)
+    for page in range(num_pages):
+        start = page * PAGE_SIZE
+        cursor = "page{0}".format(page + 1) if page + 1 < num_pages else None
+        params = {"cursor": "page{0}".format(page)} if page else None
+        transport.add_response("boards/1234/pins", {
+            "data": pins[start:start + PAGE_SIZE],
+            "page": {"cursor": cursor, "next": None},
+        }, params=params)
+    return transport
+
+
+@scenario
+def get_pages(scale):
+    """Throughput of paging through results with RestIO.get_pages"""
+    num_pages = 10 * scale
+    results = dict()
+    for stream in (False, True):
+        transport = make_transport(num_pages)
+        rest_io = RestIO.from_kwargs(
+            "abcd", transport=transport, stream_pages=stream)
+
+        def run():
+            for page in rest_io.get_pages("boards/1234/pins"):
+                for _ in page["data"]:
+                    pass
+
+        name = "stream_pages" if stream else "pages"
+        results[name] = (num_pages / best_time(run), "pages/sec")
+    return results
+
+
+@scenario
+def hydration(scale):
+    """Rate at which Pin and Board objects are built from response data"""
+    num_items = 10000 * scale
+    pins = make_pins(num_items)
+    boards = [
+        {"id": str(500000000000000000 + i), "name": "Board", "counts": {}}
+        for i in range(num_items)]
+
+    def build_pins():
+        for cur in pins:
+            Pin.from_json(cur, None)
+
+    def build_boards():
+        for cur in boards:
+            Board.from_json(cur, None)
+
+    return {
+        "pin_from_json": (num_items / best_time(build_pins), "ops/sec"),
+        "board_from_json": (num_items / best_time(build_boards), "ops/sec"),
+    }
+
+
+@scenario
+def header_parsing(scale):
+    """Cost of parsing dates and rate limit details out of headers"""
+    count = 2000 * scale
+    headers = Headers(SAMPLE_HEADERS)
+
+    def parse_date():
+        for _ in range(count):
+            headers.date  # pylint: disable=pointless-statement
+
+    def parse_refresh():
+        for _ in range(count):
+            headers.time_to_refresh  # pylint: disable=pointless-statement
+
+    return {
+        "headers_date": (best_time(parse_date) * 1e6 / count, "usec/op"),
+        "headers_time_to_refresh": (
+            best_time(parse_refresh) * 1e6 / count, "usec/op"),
+    }
+
+
+@scenario
+def board_dates(scale):
+    """Cost of parsing the creation date of a board"""
+    count = 2000 * scale
+    board = Board.from_json(
+        {"id": "1234", "created_at": "2020-07-21T16:16:03"}, None)
+
+    def run():
+        for _ in range(count):
+            board.creation_date  # pylint: disable=pointless-statement
+
+    return {"board_creation_date": (best_time(run) * 1e6 / count, "usec/op")}
+
+
+@scenario
+def pin_memory(scale):
+    """Memory used by each Pin object, including its response data"""
+    num_pins = 5000 * scale
+    raw = json.dumps(make_pins(num_pins)).encode("utf-8")
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pins = [Pin.from_json(cur, None) for cur in json.loads(raw)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(pins) == num_pins
+    return {"pin_memory": ((after - before) / num_pins, "bytes/pin")}
+
+
+@scenario
+def download_thumbnails(scale):
+    """End to end throughput of the fpins thumbnail downloader"""
+    num_pins = 200 * scale
+    account = SyntheticAccount(num_boards=1, pins_per_board=num_pins)
+    emulator = Emulator(account, page_size=PAGE_SIZE,
+                        conditions=ApiConditions(rate_limit=10 ** 9))
+    with EmulatorServer(emulator) as server:
+        api = partial(console_actions.API, root_url=server.url)
+
+        def run():
+            with tempfile.TemporaryDirectory() as folder:
+                result = console_actions.download_thumbnails(
+                    "abcd", "Board 0", folder)
+                assert result == 0
+
+        with mock.patch.object(console_actions, "API", api), \
+                mock.patch.object(
+                    console_actions, "DISABLE_PROGRESS_BARS", True):
+            elapsed = best_time(run, repeat=3)
+    return {"download_thumbnails": (num_pins / elapsed, "pins/sec")}
+
+
+def run_all(scale, only=None):
+    """Runs the benchmark scenarios
+
+    Args:
+        scale (int): multiplier for the amount of work done by each scenario
+        only (list of str): optional names of the scenarios to run
+
+    Returns:
+        dict: results of every scenario, keyed by metric name
+    """
+    results = dict()
+    for func in SCENARIOS:
+        if only and func.__name__ not in only:
+            continue
+        print("running {0}...".format(func.__name__), file=sys.stderr)
+        for name, (value, unit) in func(scale).items():
+            results[name] = {"value": value, "unit": unit}
+    return results
+
+
+def compare(baseline, current, tolerance):
+    """Reports how metrics changed relative to an earlier run
+
+    Args:
+        baseline (dict): results from the earlier run
+        current (dict): results from this run
+        tolerance (float):
+            fraction by which a metric may get worse before it is
+            considered a regression
+
+    Returns:
+        list (str): names of metrics that regressed
+    """
+    regressions = list()
+    for name, result in sorted(current.items()):
+        if name not in baseline:
+            continue
+        old = baseline[name]["value"]
+        new = result["value"]
+        if not old:
+            continue
+        if HIGHER_IS_BETTER.get(result["unit"], True):
+            change = new / old - 1
+        else:
+            change = old / new - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print("{0:28} {1:>14.3f} -> {2:>14.3f} {3:10} {4:+7.1%}{5}".format(
+            name, old, new, result["unit"], change, flag))
+    return regressions
+
+
+def main(args=None):
+    """Entry point for the benchmark suite
+
+    Returns:
+        int: zero on success, non-zero if any metric regressed
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--output", help="path to a file to store the results in, as JSON")
+    parser.add_argument(
+        "--compare", help="path to results from an earlier run to compare to")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1,
+        help="fraction by which a metric may get worse before it is "
+             "reported as a regression (default: %(default)s)")
+    parser.add_argument(
+        "--scale", type=int, default=1,
+        help="multiplier for the amount of work done by each scenario")
+    parser.add_argument(
+        "--only", action="append",
+        choices=[cur.__name__ for cur in SCENARIOS],
+        help="only run the named scenario. May be repeated.")
+    options = parser.parse_args(args)
+
+    results = run_all(options.scale, options.only)
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "date": datetime.now(tz=tz.tzutc()).isoformat(),
+        "scale": options.scale,
+        "results": results,
+    }
+
+    for name, result in sorted(results.items()):
+        print("{0:28} {1:>14.3f} {2}".format(
+            name, result["value"], result["unit"]))
+
+    if options.output:
+        with open(options.output, "w") as handle:
+            json.dump(report, handle, indent=4, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as handle:
+            baseline = json.load(handle)
+        print("\ncompared to {0} (python {1}):".format(
+            baseline["version"], baseline["python"]))
+        if compare(baseline["results"], results, options.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
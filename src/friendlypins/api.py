@@ -1,23 +1,52 @@
 """Primary entry point for the Friendly Pinterest library"""
 import logging
-from friendlypins.user import User
-from friendlypins.board import Board
-from friendlypins.pin import Pin
+from friendlypins.user import User, AsyncUser
+from friendlypins.board import Board, AsyncBoard
+from friendlypins.pin import Pin, AsyncPin
 from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.async_rest_io import AsyncRestIO
+from friendlypins.utils.bulk_fetch import bulk_fetch
+from friendlypins.utils.instrumentation import CallStats
 
 
 class API(object):
-    """High level abstraction for the core Pinterest API"""
+    """High level abstraction for the core Pinterest API
 
-    def __init__(self, personal_access_token):
+    Connections to the REST API are pooled for the lifetime of this object.
+    Use :meth:`close`, or use the object as a context manager, to release
+    them once you are done with the API.
+    """
+
+    def __init__(self, personal_access_token, **kwargs):
         """
         Args:
             personal_access_token (str):
                 API authentication token used for secure access to a users'
-                Pinterest data
+                Pinterest data, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool` of tokens
+                with access to the same data to spread requests across
+            kwargs:
+                optional settings for the underlying
+                :class:`~friendlypins.utils.rest_io.RestIO` object, such as
+                the size of the connection pool, as accepted by
+                :meth:`~friendlypins.utils.rest_io.RestIO.from_kwargs`
         """
         self._log = logging.getLogger(__name__)
-        self._io = RestIO(personal_access_token)
+        self._io = RestIO.from_kwargs(personal_access_token, **kwargs)
+        self._stats = CallStats()
+        self._io.add_hooks(
+            on_response=self._stats.on_response,
+            on_error=self._stats.on_error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases all network connections held by this object"""
+        self._io.close()
 
     def get_board_by_id(self, board_id):
         """Locates a specific Pinterest board given it's internal identifier
@@ -53,28 +82,219 @@ class API(object):
         pin_url = "pins/{0}".format(pin_id)
         return Pin(pin_url, self._io)
 
+    def get_boards_by_ids(self, board_ids, max_workers=8, ordered=True):
+        """Loads the data for many Pinterest boards concurrently
+
+        Boards that fail to load are reported in the results, without
+        stopping the rest of the batch.
+
+        Args:
+            board_ids (iterable): unique identifiers of the boards
+            max_workers (int):
+                maximum number of requests sent at once. Requests are still
+                paced by the rate governor, if one is in use.
+            ordered (bool):
+                when True, results are produced in the same order as the
+                identifiers. When False, they are produced as soon as each
+                board loads.
+
+        Yields:
+            FetchResult: the loaded board, or the error raised loading it
+        """
+        return bulk_fetch(Board, board_ids, self._io, max_workers, ordered)
+
+    def get_pins_by_ids(self, pin_ids, max_workers=8, ordered=True):
+        """Loads the data for many Pinterest pins concurrently
+
+        Pins that fail to load are reported in the results, without
+        stopping the rest of the batch.
+
+        Args:
+            pin_ids (iterable): unique identifiers of the pins
+            max_workers (int):
+                maximum number of requests sent at once. Requests are still
+                paced by the rate governor, if one is in use.
+            ordered (bool):
+                when True, results are produced in the same order as the
+                identifiers. When False, they are produced as soon as each
+                pin loads.
+
+        Yields:
+            FetchResult: the loaded pin, or the error raised loading it
+        """
+        return bulk_fetch(Pin, pin_ids, self._io, max_workers, ordered)
+
+    @property
+    def stats(self):
+        """CallStats: statistics describing the requests sent to each API
+        endpoint"""
+        return self._stats
+
     @property
     def user(self):
         """User: Gets all primitives associated with the authenticated user"""
         return User("me", self._io)
 
+    @property
+    def rate_limit_state(self):
+        """RateLimitState: record of the rate limit details, updated from
+        every response we receive"""
+        return self._io.rate_limit_state
+
+    @property
+    def rate_limit(self):
+        """RateLimitSnapshot: rate limit details reported by the most recent
+        API response. Reading them never sends a request."""
+        return self._io.rate_limit_state.snapshot()
+
+    def refresh_rate_limit(self):
+        """Sends a request to the API to get up to date rate limit details
+
+        Returns:
+            RateLimitSnapshot: the updated details
+        """
+        self._io.probe_rate_limit()
+        return self.rate_limit
+
     @property
     def rate_limit_refresh(self):
         """datetime.datetime: Gets the time when the next refresh for API
-        queries takes effect"""
-        return self._io.headers.time_to_refresh
+        queries takes effect, or None if no response has reported it yet"""
+        return self.rate_limit.time_to_refresh
 
     @property
     def transaction_limit(self):
-        """int: Gets the total number of transactions per hour we're allotted
-        """
-        return self._io.headers.rate_limit
+        """int: Gets the total number of transactions per hour we're
+        allotted, or None if no response has reported it yet"""
+        return self.rate_limit.rate_limit
 
     @property
     def transaction_remaining(self):
-        """int: Gets the total number of transactions per hour we're allotted
+        """int: Gets the number of transactions remaining in the current
+        hour, as of the most recent response, or None if no response has
+        reported it yet"""
+        return self.rate_limit.rate_remaining
+
+
+class AsyncAPI(object):
+    """Asynchronous variant of :class:`API`, for use with asyncio
+
+    Example:
+
+        >>> async with AsyncAPI(token) as api:
+        >>>     board = await api.get_board_by_id(1234).load()
+        >>>     async for pin in board.pins:
+        >>>         print(pin.note)
+    """
+
+    def __init__(self, personal_access_token, **kwargs):
+        """
+        Args:
+            personal_access_token (str):
+                API authentication token used for secure access to a users'
+                Pinterest data, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool` of tokens
+                with access to the same data to spread requests across
+            kwargs:
+                optional settings passed along to the underlying
+                :class:`~friendlypins.utils.async_rest_io.AsyncRestIO` object
+        """
+        self._log = logging.getLogger(__name__)
+        self._io = AsyncRestIO(personal_access_token, **kwargs)
+        self._stats = CallStats()
+        self._io.sync_io.add_hooks(
+            on_response=self._stats.on_response,
+            on_error=self._stats.on_error)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Releases all network connections held by this object"""
+        await self._io.close()
+
+    def get_board_by_id(self, board_id):
+        """Locates a specific Pinterest board given it's internal identifier
+
+        The board data is not loaded until :meth:`AsyncBoard.load` is awaited.
+
+        Args:
+            board_id (int):
+                the unique identifier for the board
+
+        Returns:
+            AsyncBoard: reference to the Pinterest board
+        """
+        return AsyncBoard(Board.default_url(board_id), self._io)
+
+    def get_pin_by_id(self, pin_id):
+        """Locates a specific Pinterest pin given it's internal identifier
+
+        The pin data is not loaded until :meth:`AsyncPin.load` is awaited.
+
+        Args:
+            pin_id (int):
+                the unique identifier for the pin
+
+        Returns:
+            AsyncPin: reference to the Pinterest pin
+        """
+        return AsyncPin(Pin.default_url(pin_id), self._io)
+
+    @property
+    def stats(self):
+        """CallStats: statistics describing the requests sent to each API
+        endpoint"""
+        return self._stats
+
+    @property
+    def user(self):
+        """AsyncUser: Gets all primitives associated with the authenticated
+        user"""
+        return AsyncUser("me", self._io)
+
+    @property
+    def rate_limit_state(self):
+        """RateLimitState: record of the rate limit details, updated from
+        every response we receive"""
+        return self._io.rate_limit_state
+
+    @property
+    def rate_limit(self):
+        """RateLimitSnapshot: rate limit details reported by the most recent
+        API response. Reading them never sends a request."""
+        return self._io.rate_limit_state.snapshot()
+
+    async def refresh_rate_limit(self):
+        """Sends a request to the API to get up to date rate limit details
+
+        Returns:
+            RateLimitSnapshot: the updated details
         """
-        return self._io.headers.rate_remaining
+        await self._io.probe_rate_limit()
+        return self.rate_limit
+
+    @property
+    def rate_limit_refresh(self):
+        """datetime.datetime: Gets the time when the next refresh for API
+        queries takes effect, or None if no response has reported it yet"""
+        return self.rate_limit.time_to_refresh
+
+    @property
+    def transaction_limit(self):
+        """int: Gets the total number of transactions per hour we're
+        allotted, or None if no response has reported it yet"""
+        return self.rate_limit.rate_limit
+
+    @property
+    def transaction_remaining(self):
+        """int: Gets the number of transactions remaining in the current
+        hour, as of the most recent response, or None if no response has
+        reported it yet"""
+        return self.rate_limit.rate_remaining
 
 
 if __name__ == "__main__":  # pragma: no cover
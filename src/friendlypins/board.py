@@ -1,12 +1,15 @@
 """Primitives for interacting with Pinterest boards"""
 from datetime import datetime
 from dateutil import tz
-from friendlypins.pin import Pin
+from friendlypins.pin import Pin, AsyncPin
+from friendlypins.utils.bulk_delete import delete_pins, delete_pins_async
 from friendlypins.utils.base_object import BaseObject
+from friendlypins.utils.async_base_object import AsyncObjectMixin
 
 
-class Board(BaseObject):
-    """Abstraction around a Pinterest board"""
+class BaseBoard(BaseObject):
+    """Properties shared by the blocking and asynchronous abstractions
+    around a Pinterest board"""
     @staticmethod
     def default_url(unique_id):
         """Generates a URL for the REST API endpoint for a board with a given
@@ -83,10 +86,49 @@ class Board(BaseObject):
         """str: description of the restriction / privacy level of the board"""
         return self._data["privacy"]
 
+    def _pin_form(self, note, image_url, link):
+        """Generates the form data used to create a pin on this board
+
+        Args:
+            note (str): descriptive text for the pin
+            image_url (str): address of the image the pin shows
+            link (str): optional source URL for the pin
+
+        Returns:
+            dict: the form data
+        """
+        data = {
+            "board": str(self.unique_id),
+            "note": note,
+            "image_url": image_url,
+        }
+        if link:
+            data["link"] = link
+        return data
+
+
+class Board(BaseBoard):
+    """Abstraction around a Pinterest board"""
+
     @property
     def pins(self):
         """pins linked to this board
 
+        Yield:
+            Pin:
+                generator that lazy loads the definitions for every pin
+                on this board
+        """
+        return self.get_pins()
+
+    def get_pins(self, prefetch_pages=None):
+        """Loads the pins linked to this board
+
+        Args:
+            prefetch_pages (int):
+                optional number of pages of pins to load ahead of the
+                caller. Defaults to the setting of the API.
+
         Yield:
             Pin:
                 generator that lazy loads the definitions for every pin
@@ -99,7 +141,8 @@ class Board(BaseObject):
         }
 
         path = "{0}/pins".format(self._relative_url)
-        for cur_page in self._io.get_pages(path, properties):
+        for cur_page in self._io.get_pages(
+                path, properties, prefetch_pages=prefetch_pages):
             assert 'data' in cur_page
 
             for cur_item in cur_page['data']:
@@ -110,6 +153,119 @@ class Board(BaseObject):
         self._log.debug('Deleting board %s', self._relative_url)
         self._io.delete(self._relative_url)
 
+    def create_pin(self, note, image_url, link=None):
+        """Creates a new pin on this board
+
+        Args:
+            note (str): descriptive text for the pin
+            image_url (str): address of the image the pin shows
+            link (str): optional source URL for the pin
+
+        Returns:
+            Pin: reference to the newly created pin
+        """
+        properties = {
+            "fields": ','.join(Pin.default_fields())
+        }
+        result = self._io.post(
+            "pins", self._pin_form(note, image_url, link), properties)
+        return Pin.from_json(result['data'], self._io)
+
+    def delete_pins(self, predicate=None, concurrency=4, progress=None):
+        """Removes the pins on this board that match a predicate
+
+        Pins are checked as they are loaded, and matching pins are deleted
+        concurrently. See :mod:`friendlypins.utils.bulk_delete` for
+        predicates matching common criteria.
+
+        Args:
+            predicate (callable):
+                function taking a pin and returning True if it should be
+                deleted. When not provided, every pin is deleted.
+            concurrency (int): maximum number of deletes sent at once
+            progress (callable):
+                optional function called with the summary every time a pin
+                is checked or deleted
+
+        Returns:
+            DeleteSummary: the pins that were deleted, and those that failed
+        """
+        self._log.debug('Deleting pins from board %s', self._relative_url)
+        return delete_pins(self.pins, predicate, concurrency, progress)
+
+
+class AsyncBoard(AsyncObjectMixin, BaseBoard):
+    """Asynchronous variant of :class:`Board`
+
+    Await :meth:`load` before reading properties from boards that were not
+    created from pre-loaded JSON data.
+    """
+
+    @property
+    async def pins(self):
+        """pins linked to this board
+
+        Yield:
+            AsyncPin:
+                asynchronous generator that loads the definitions for every
+                pin on this board
+        """
+        self._log.debug('Loading pins for board %s...', self._relative_url)
+
+        properties = {
+            "fields": ','.join(Pin.default_fields())
+        }
+
+        path = "{0}/pins".format(self._relative_url)
+        async for cur_page in self._io.get_pages(path, properties):
+            assert 'data' in cur_page
+
+            for cur_item in cur_page['data']:
+                yield AsyncPin.from_json(cur_item, self._io)
+
+    async def delete(self):
+        """Removes this board and all pins attached to it"""
+        self._log.debug('Deleting board %s', self._relative_url)
+        await self._io.delete(self._relative_url)
+
+    async def create_pin(self, note, image_url, link=None):
+        """Creates a new pin on this board
+
+        Args:
+            note (str): descriptive text for the pin
+            image_url (str): address of the image the pin shows
+            link (str): optional source URL for the pin
+
+        Returns:
+            AsyncPin: reference to the newly created pin
+        """
+        properties = {
+            "fields": ','.join(Pin.default_fields())
+        }
+        result = await self._io.post(
+            "pins", self._pin_form(note, image_url, link), properties)
+        return AsyncPin.from_json(result['data'], self._io)
+
+    async def delete_pins(self, predicate=None, concurrency=4,
+                          progress=None):
+        """Removes the pins on this board that match a predicate
+
+        Args:
+            predicate (callable):
+                function taking a pin and returning True if it should be
+                deleted. When not provided, every pin is deleted.
+            concurrency (int): maximum number of deletes sent at once
+            progress (callable):
+                optional function called with the summary every time a pin
+                is checked or deleted
+
+        Returns:
+            DeleteSummary: the pins that were deleted, and those that failed
+        """
+        self._log.debug('Deleting pins from board %s', self._relative_url)
+        return await delete_pins_async(
+            self.pins, predicate, concurrency, progress)
+
 
 if __name__ == "__main__":  # pragma: no cover
     pass
@@ -29,3 +29,34 @@ class RateLimitException(HTTPError):
         time_to_renew = self.rate_renewal - datetime.now(tz=tz.tzutc())
         fmt = naturaltime(time_to_renew.total_seconds(), future=True)
         return "Rate limit reached. Try again " + fmt
+
+
+class ObjectNotLoadedError(Exception):
+    """Raised when reading properties from an asynchronous Pinterest object
+    before its data has been loaded from the REST API"""
+    def __init__(self, url):
+        """
+        Args:
+            url (str): URL of the object, relative to the API root
+        """
+        super().__init__(
+            "Data for {0} has not been loaded yet. "
+            "Await the load() method first.".format(url))
+        self.url = url
+
+
+class LazyLoadError(Exception):
+    """Raised by a strict lazy loading audit when Pinterest objects are
+    loaded from the REST API one at a time, in a repeated pattern"""
+    def __init__(self, fetch):
+        """
+        Args:
+            fetch (LazyFetch): details of the repeated fetches
+        """
+        super().__init__(
+            "{0}.{1} was loaded {2} times, one object at a time, from {3}. "
+            "Use pre-loaded objects, such as those returned from paged "
+            "results, instead.".format(
+                fetch.object_type, fetch.attribute, fetch.count,
+                fetch.call_site))
+        self.fetch = fetch
@@ -19,6 +19,13 @@ class Headers(object):
     def __repr__(self):
         return "<{0} ({1})>".format(self.__class__.__name__, self.date)
 
+    @property
+    def has_rate_limit(self):
+        """bool: True if the response described the rate limit of the API,
+        which responses from outside of the API do not"""
+        return any(
+            cur.lower().startswith("x-ratelimit-") for cur in self._data)
+
     @property
     def rate_limit(self):
         """int: number of API requests in total permitted for the
@@ -53,6 +60,14 @@ class Headers(object):
         diff = timedelta(seconds=int(self._data['X-Ratelimit-Refresh']))
         return self.date + diff
 
+    @property
+    def seconds_to_refresh(self):
+        """int: number of seconds until the rate limiting threshold is
+        renewed, or None if the response did not say"""
+        if "X-Ratelimit-Refresh" not in self._data:
+            return None
+        return int(self._data['X-Ratelimit-Refresh'])
+
     @property
     def date(self):
         """datetime.datetime: Date/time when this header was last populated"""
@@ -73,6 +88,18 @@ class Headers(object):
         # return time data in current locale for convenience
         return date_with_tz.astimezone(tz.tzlocal())
 
+    @property
+    def etag(self):
+        """str: entity tag identifying the version of the response data, or
+        None if not provided"""
+        return self._data.get('ETag')
+
+    @property
+    def last_modified(self):
+        """str: time stamp of when the response data last changed, or None
+        if not provided"""
+        return self._data.get('Last-Modified')
+
     @property
     def bytes(self):
         """int: Gets the number of bytes contained in the response data"""
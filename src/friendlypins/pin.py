@@ -1,10 +1,14 @@
 """Primitives for operating on Pinterest pins"""
+from datetime import datetime
+from dateutil import tz
 from friendlypins.thumbnail import Thumbnail
 from friendlypins.utils.base_object import BaseObject
+from friendlypins.utils.async_base_object import AsyncObjectMixin
 
 
-class Pin(BaseObject):
-    """Abstraction around a Pinterest pin"""
+class BasePin(BaseObject):
+    """Properties shared by the blocking and asynchronous abstractions
+    around a Pinterest pin"""
 
     @staticmethod
     def default_url(unique_id):
@@ -70,17 +74,42 @@ class Pin(BaseObject):
 
         return self._data['media']['type']
 
+    @property
+    def creation_date(self):
+        """datetime.datetime: when this pin was created"""
+        # sample datetime to parse: "2020-07-21T16:16:03" (in UTC)
+        retval = datetime.strptime(self._data["created_at"],
+                                   "%Y-%m-%dT%H:%M:%S")
+        return retval.replace(tzinfo=tz.tzutc())
+
     @property
     def thumbnail(self):
         """Thumbnail: the thumbnail image associated with this pin"""
         assert 'image' in self._data
         return Thumbnail(self._data['image'])
 
+
+class Pin(BasePin):
+    """Abstraction around a Pinterest pin"""
+
     def delete(self):
         """Removes this pin from it's respective board"""
         self._log.debug('Deleting pin %s', self._relative_url)
         self._io.delete(self._relative_url)
 
 
+class AsyncPin(AsyncObjectMixin, BasePin):
+    """Asynchronous variant of :class:`Pin`
+
+    Await :meth:`load` before reading properties from pins that were not
+    created from pre-loaded JSON data.
+    """
+
+    async def delete(self):
+        """Removes this pin from it's respective board"""
+        self._log.debug('Deleting pin %s', self._relative_url)
+        await self._io.delete(self._relative_url)
+
+
 if __name__ == "__main__":  # pragma: no cover
     pass
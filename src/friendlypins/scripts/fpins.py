@@ -1,10 +1,20 @@
 """Command line interface for the friendly pins APIs"""
 import argparse
 import logging
+import os
 import shlex
 import sys
+from datetime import timedelta
+from friendlypins.utils.bulk_delete import older_than, media_type_in, \
+    link_domain_in, all_of
 from friendlypins.utils.console_actions import download_thumbnails, \
-    delete_board, check_rate_limit, create_board
+    delete_board, check_rate_limit, create_board, delete_pins, \
+    estimate_download_thumbnails, estimate_delete_board, \
+    estimate_create_board, estimate_delete_pins, create_from_manifest, \
+    estimate_create_from_manifest, StorageOptions
+from friendlypins.utils.disk_cache import SqliteCache
+from friendlypins.utils.metrics import ClientMetrics
+from friendlypins.utils.quota_ledger import QuotaLedger
 
 
 def _download_thumbnails(args):
@@ -17,7 +27,16 @@ def _download_thumbnails(args):
     Returns:
         int: zero on success, non-zero on failure
     """
-    return download_thumbnails(args.token, args.board, args.path)
+    storage = StorageOptions(args.cache, args.ledger)
+    if args.dry_run:
+        return estimate_download_thumbnails(args.token, args.board, storage)
+    metrics = ClientMetrics() if args.metrics_file else None
+    try:
+        return download_thumbnails(
+            args.token, args.board, args.path, storage, metrics)
+    finally:
+        if metrics:
+            metrics.write(args.metrics_file)
 
 
 def _edit_board(args):
@@ -31,17 +50,71 @@ def _edit_board(args):
         int: zero on success, non-zero on failure
     """
     log = logging.getLogger(__name__)
+    storage = StorageOptions(args.cache, args.ledger)
+    if args.dry_run:
+        estimate = estimate_delete_board if args.delete \
+            else estimate_create_board
+        return estimate(args.token, args.board_name, storage)
     if args.delete:
         log.debug("Deleting board %s", args.board_name)
-        return delete_board(args.token, args.board_name)
+        return delete_board(args.token, args.board_name, storage)
     if args.create:
         log.debug("Creating board %s", args.board_name)
-        return create_board(args.token, args.board_name)
+        return create_board(args.token, args.board_name, storage)
 
     log.error("Unsupported board edit option")
     return 1
 
 
+def _delete_pins(args):
+    """Callback for deleting the pins on a board that match a set of criteria
+
+    Args:
+        args (argparse.ArgumentParser):
+            Command line arguments customizing the behavior of the action
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    log = logging.getLogger(__name__)
+    criteria = list()
+    if args.older_than is not None:
+        criteria.append(older_than(timedelta(days=args.older_than)))
+    if args.media_type:
+        criteria.append(media_type_in(*args.media_type))
+    if args.domain:
+        criteria.append(link_domain_in(*args.domain))
+    if not criteria and not args.all:
+        log.error("Select the pins to delete, or use --all to delete every "
+                  "pin on the board")
+        return 1
+    predicate = all_of(*criteria) if criteria else None
+
+    storage = StorageOptions(args.cache, args.ledger)
+    if args.dry_run:
+        return estimate_delete_pins(args.token, args.board, predicate, storage)
+    return delete_pins(
+        args.token, args.board, predicate, args.concurrency, storage)
+
+
+def _create_from_manifest(args):
+    """Callback for creating the boards and pins described by a manifest
+
+    Args:
+        args (argparse.ArgumentParser):
+            Command line arguments customizing the behavior of the action
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    storage = StorageOptions(args.cache, args.ledger)
+    if args.dry_run:
+        return estimate_create_from_manifest(
+            args.token, args.manifest, storage)
+    return create_from_manifest(
+        args.token, args.manifest, args.results, args.concurrency, storage)
+
+
 def _check_rate_refresh(args):
     """Callback for checking when the next rate limite renewal is to occur
 
@@ -52,7 +125,8 @@ def _check_rate_refresh(args):
     Returns:
         int: zero on success, non-zero on failure
     """
-    return check_rate_limit(args.token)
+    return check_rate_limit(
+        args.token, StorageOptions(args.cache, args.ledger))
 
 
 def get_args(args):
@@ -79,6 +153,25 @@ def get_args(args):
         '--token', '-t',
         required=True,
         help="Pinterest API token to use for authentication")
+    parser.add_argument(
+        '--cache',
+        default=os.environ.get(SqliteCache.ENV_VAR),
+        help="Path to a database file used to cache API responses between "
+             "runs. May also be set using the {0} environment "
+             "variable".format(SqliteCache.ENV_VAR))
+    parser.add_argument(
+        '--ledger',
+        default=os.environ.get(QuotaLedger.ENV_VAR),
+        help="Path to a database file recording every API call made, along "
+             "with the operation that made it. May also be set using the "
+             "{0} environment variable".format(QuotaLedger.ENV_VAR))
+    parser.add_argument(
+        '--dry-run', '--estimate',
+        dest="dry_run",
+        action="store_true",
+        help="Reports the number of API calls, amount of data and time an "
+             "operation needs, and whether it fits in the remaining rate "
+             "limit, without performing it")
     sub_commands = parser.add_subparsers()
 
     # Thumnail Downloader subparser
@@ -100,6 +193,11 @@ def get_args(args):
         required=True,
         help="Path to the folder where thumbnails are to be downloaded",
     )
+    thumbnails_cmd.add_argument(
+        '--metrics-file',
+        help="Path to a file to write metrics describing the download to, "
+             "in OpenMetrics text format",
+    )
 
     # Board manipulation sub-command
     desc = 'Manipulates boards owned by the authenticated user'
@@ -126,6 +224,73 @@ def get_args(args):
         help="Name of the board to manipulate"
     )
 
+    # Bulk pin deletion sub-command
+    desc = 'Deletes the pins on a board that match a set of criteria'
+    pins_cmd = sub_commands.add_parser(
+        'delete_pins',
+        description=desc,
+        help=desc)
+    pins_cmd.set_defaults(func=_delete_pins)
+
+    pins_cmd.add_argument(
+        '--board', '-b',
+        required=True,
+        help="Name of the board where the pins to delete are located",
+    )
+    pins_cmd.add_argument(
+        '--older-than',
+        type=float,
+        metavar="DAYS",
+        help="only deletes pins created more than this many days ago",
+    )
+    pins_cmd.add_argument(
+        '--media-type',
+        action="append",
+        help="only deletes pins with this type of media. May be repeated.",
+    )
+    pins_cmd.add_argument(
+        '--domain',
+        action="append",
+        help="only deletes pins linking to this domain, or its sub-domains. "
+             "May be repeated.",
+    )
+    pins_cmd.add_argument(
+        '--all',
+        action="store_true",
+        help="deletes every pin on the board, when no other criteria are "
+             "given",
+    )
+    pins_cmd.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help="maximum number of pins deleted at once",
+    )
+
+    # Bulk creation sub-command
+    desc = 'Creates the boards and pins described by a manifest file'
+    manifest_cmd = sub_commands.add_parser(
+        'create_from_manifest',
+        description=desc,
+        help=desc)
+    manifest_cmd.set_defaults(func=_create_from_manifest)
+
+    manifest_cmd.add_argument(
+        "manifest",
+        help="JSON Lines or CSV file describing the boards and pins to create"
+    )
+    manifest_cmd.add_argument(
+        '--results', '-r',
+        help="file where the ID created for each row of the manifest is "
+             "written, in the same format as the manifest",
+    )
+    manifest_cmd.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help="maximum number of objects created at once",
+    )
+
     # Rate limit check subcommand
     desc = 'Checks when the next rate limit renewal is due to occur'
     rate_cmd = sub_commands.add_parser(
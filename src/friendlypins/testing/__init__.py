@@ -0,0 +1,4 @@
+"""Helpers for testing and benchmarking code built on this library
+
+Nothing in the library itself depends on this package.
+"""
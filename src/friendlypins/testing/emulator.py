@@ -0,0 +1,839 @@
+"""Local emulator of the Pinterest v1 REST API, for load and benchmark tests
+
+The emulator serves a synthetic Pinterest account from memory, implementing
+the endpoints used by this library:
+
+* GET ``me``, ``me/boards``, ``boards/<id>``, ``boards/<id>/pins`` and
+  ``pins/<id>``
+* POST ``boards`` and ``pins``
+* DELETE ``boards/<id>`` and ``pins/<id>``
+
+Paged results, rate limit headers, artificial latency and randomly rejected
+requests can all be configured, so the library can be exercised at
+realistic scale without talking to the real API. Thumbnail images for every
+pin are served from the ``images`` path of the emulator.
+
+Example:
+
+    >>> account = SyntheticAccount(num_boards=10, pins_per_board=5000)
+    >>> emulator = Emulator(
+    >>>     account, conditions=ApiConditions(latency=lambda: 0.05))
+    >>> with EmulatorServer(emulator) as server:
+    >>>     with API("token", root_url=server.url) as api:
+    >>>         for board in api.user.boards:
+    >>>             print(board.name, board.num_pins)
+"""
+import base64
+import json
+import math
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+# contents served for every thumbnail image: a tiny, valid GIF file
+_IMAGE_DATA = base64.b64decode(
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# first identifiers assigned to synthetic boards and pins
+_FIRST_BOARD_ID = 500000000000000000
+_FIRST_PIN_ID = 700000000000000000
+
+# maximum number of pins on one synthetic board
+_MAX_PINS_PER_BOARD = 10 ** 9
+
+
+class SyntheticAccount(object):
+    """A generated Pinterest user along with their boards and pins
+
+    Pin data is generated on demand from the position of the pin on its
+    board, so accounts with millions of pins take very little memory.
+    """
+
+    def __init__(self, num_boards=5, pins_per_board=100,
+                 username="emulated_user"):
+        """
+        Args:
+            num_boards (int): number of boards owned by the user
+            pins_per_board (int or list of int):
+                number of pins on each board. Provide a list to use a
+                different count for each board.
+            username (str): name of the user
+        """
+        if isinstance(pins_per_board, int):
+            pins_per_board = [pins_per_board] * num_boards
+        if len(pins_per_board) != num_boards:
+            raise ValueError("A pin count is required for every board")
+
+        self._lock = threading.Lock()
+        self._username = username
+        self._boards = list()
+        self._deleted_pins = set()
+        # details provided for pins created through the API, by pin ID
+        self._created_pins = dict()
+        for index, num_pins in enumerate(pins_per_board):
+            self._add_board(
+                "Board {0}".format(index), "Synthetic board", num_pins)
+
+    @property
+    def username(self):
+        """str: name of the user"""
+        return self._username
+
+    def _add_board(self, name, description, num_pins):
+        """Adds a new board to the account
+
+        Returns:
+            dict: state of the new board
+        """
+        index = len(self._boards)
+        board = {
+            "index": index,
+            "id": str(_FIRST_BOARD_ID + index),
+            "name": name,
+            "description": description,
+            "num_pins": num_pins,
+            "deleted": False,
+        }
+        self._boards.append(board)
+        return board
+
+    def create_board(self, name, description=""):
+        """Creates a new, empty board
+
+        Args:
+            name (str): name of the board
+            description (str): descriptive text for the board
+
+        Returns:
+            dict: response data describing the board
+        """
+        with self._lock:
+            board = self._add_board(name, description, 0)
+            return self._board_data(board)
+
+    def create_pin(self, board_id, note, image_url, link=None,
+                   image_root=""):
+        """Adds a new pin to the end of a board
+
+        Args:
+            board_id (str): ID of the board
+            note (str): descriptive text for the pin
+            image_url (str): address of the image the pin shows
+            link (str): optional source URL for the pin
+            image_root (str): root URL for thumbnail images
+
+        Returns:
+            dict: response data describing the pin, or None if there is no
+            such board
+        """
+        with self._lock:
+            board = self._find_board(board_id)
+            if board is None:
+                return None
+            position = board["num_pins"]
+            board["num_pins"] += 1
+            pin_id = str(_FIRST_PIN_ID +
+                         board["index"] * _MAX_PINS_PER_BOARD + position)
+            self._created_pins[pin_id] = {
+                "note": note,
+                "link": link or "",
+                "original_link": link or image_url,
+                "metadata": {"image_url": image_url},
+            }
+            return self._pin_data(board, position, image_root)
+
+    def _find_board(self, board_id):
+        """Locates a board that has not been deleted
+
+        Returns:
+            dict: state of the board, or None if not found
+        """
+        try:
+            index = int(board_id) - _FIRST_BOARD_ID
+        except ValueError:
+            return None
+        if index < 0 or index >= len(self._boards):
+            return None
+        board = self._boards[index]
+        return None if board["deleted"] else board
+
+    @staticmethod
+    def _split_pin_id(pin_id):
+        """Gets the board index and position on the board from a pin ID
+
+        Returns:
+            tuple: board index and pin position, or None if invalid
+        """
+        try:
+            offset = int(pin_id) - _FIRST_PIN_ID
+        except ValueError:
+            return None
+        if offset < 0:
+            return None
+        return divmod(offset, _MAX_PINS_PER_BOARD)
+
+    def _find_pin(self, pin_id):
+        """Locates a pin that has not been deleted
+
+        Returns:
+            tuple: state of the board the pin is on, and the position of the
+            pin on the board. None if not found.
+        """
+        parts = self._split_pin_id(pin_id)
+        if parts is None or str(pin_id) in self._deleted_pins:
+            return None
+        board = self._find_board(_FIRST_BOARD_ID + parts[0])
+        if board is None or parts[1] >= board["num_pins"]:
+            return None
+        return board, parts[1]
+
+    def user_data(self):
+        """dict: response data describing the user"""
+        with self._lock:
+            live = [
+                self._board_data(cur)
+                for cur in self._boards if not cur["deleted"]]
+        num_pins = sum(cur["counts"]["pins"] for cur in live)
+        return {
+            "id": "100000000000000000",
+            "username": self._username,
+            "first_name": "Emulated",
+            "last_name": "User",
+            "bio": "Synthetic account served by the API emulator",
+            "created_at": "2020-07-21T16:16:03",
+            "counts": {
+                "pins": num_pins,
+                "following": 0,
+                "followers": 0,
+                "boards": len(live),
+                "likes": 0,
+            },
+            "image": {},
+            "account_type": "individual",
+            "url": "https://www.pinterest.com/{0}/".format(self._username),
+        }
+
+    def _board_data(self, board):
+        """Generates response data describing a board
+
+        Returns:
+            dict: the response data
+        """
+        deleted = sum(
+            1 for cur in self._deleted_pins
+            if self._split_pin_id(cur)[0] == board["index"])
+        return {
+            "id": board["id"],
+            "name": board["name"],
+            "url": "https://www.pinterest.com/{0}/board-{1}/".format(
+                self._username, board["index"]),
+            "description": board["description"],
+            "created_at": "2020-07-21T16:16:03",
+            "counts": {
+                "pins": board["num_pins"] - deleted,
+                "followers": board["index"],
+                "collaborators": 0,
+            },
+            "image": {},
+            "reason": None,
+            "privacy": "public",
+        }
+
+    def _pin_data(self, board, position, image_root):
+        """Generates response data describing a pin
+
+        Returns:
+            dict: the response data
+        """
+        pin_id = str(
+            _FIRST_PIN_ID + board["index"] * _MAX_PINS_PER_BOARD + position)
+        data = {
+            "id": pin_id,
+            "link": "https://www.example.com/articles/{0}".format(pin_id),
+            "url": "https://www.pinterest.com/pin/{0}/".format(pin_id),
+            "board": {
+                "id": board["id"],
+                "url": "https://www.pinterest.com/{0}/board-{1}/".format(
+                    self._username, board["index"]),
+                "name": board["name"],
+            },
+            "created_at": "2020-07-21T20:49:16",
+            "note": "Synthetic pin {0} on {1}".format(
+                position, board["name"]),
+            "color": "#{0:06x}".format(int(pin_id) % 0xFFFFFF),
+            "counts": {"saves": position % 97, "comments": 0},
+            "media": {"type": "image"},
+            "attribution": None,
+            "image": {
+                "original": {
+                    "url": "{0}/images/{1}.gif".format(image_root, pin_id),
+                    "width": 736,
+                    "height": 1104,
+                }
+            },
+            "metadata": {},
+            "original_link": "https://www.example.com/articles/{0}".format(
+                pin_id),
+        }
+        data.update(self._created_pins.get(pin_id, {}))
+        return data
+
+    def boards(self):
+        """list (dict): response data for every board owned by the user"""
+        with self._lock:
+            live = [cur for cur in self._boards if not cur["deleted"]]
+            return [self._board_data(cur) for cur in live]
+
+    def board(self, board_id):
+        """Gets response data describing a board
+
+        Returns:
+            dict: the response data, or None if there is no such board
+        """
+        with self._lock:
+            board = self._find_board(board_id)
+            return None if board is None else self._board_data(board)
+
+    def pins(self, board_id, start, count, image_root):
+        """Gets response data for consecutive pins on a board
+
+        Args:
+            board_id (str): ID of the board
+            start (int): position of the first pin to consider
+            count (int): maximum number of pins to return
+            image_root (str): root URL for thumbnail images
+
+        Returns:
+            tuple:
+                list of response data for the pins, and the position to
+                continue from for the next set of pins, or None if there are
+                no more pins. None if there is no such board.
+        """
+        with self._lock:
+            board = self._find_board(board_id)
+            if board is None:
+                return None
+            retval = list()
+            position = start
+            while position < board["num_pins"] and len(retval) < count:
+                data = self._pin_data(board, position, image_root)
+                if data["id"] not in self._deleted_pins:
+                    retval.append(data)
+                position += 1
+            if position >= board["num_pins"]:
+                position = None
+            return retval, position
+
+    def pin(self, pin_id, image_root):
+        """Gets response data describing a pin
+
+        Returns:
+            dict: the response data, or None if there is no such pin
+        """
+        with self._lock:
+            found = self._find_pin(pin_id)
+            if found is None:
+                return None
+            return self._pin_data(found[0], found[1], image_root)
+
+    def delete_board(self, board_id):
+        """Deletes a board and the pins on it
+
+        Returns:
+            bool: True if the board was found
+        """
+        with self._lock:
+            board = self._find_board(board_id)
+            if board is None:
+                return False
+            board["deleted"] = True
+            return True
+
+    def delete_pin(self, pin_id):
+        """Deletes a pin
+
+        Returns:
+            bool: True if the pin was found
+        """
+        with self._lock:
+            if self._find_pin(pin_id) is None:
+                return False
+            self._deleted_pins.add(str(pin_id))
+            return True
+
+
+def _encode_cursor(position):
+    """str: opaque cursor pointing to a position in paged results"""
+    return base64.urlsafe_b64encode(
+        str(position).encode("ascii")).decode("ascii")
+
+
+def _parse_url(url):
+    """Splits the path and query string of a request
+
+    Args:
+        url (str): path and query string of the request
+
+    Returns:
+        tuple: the parts of the path, and the query parameters
+    """
+    parsed = urlparse(url)
+    parts = [cur for cur in parsed.path.split("/") if cur]
+    return parts, dict(parse_qsl(parsed.query))
+
+
+def _decode_cursor(cursor):
+    """int: position in paged results a cursor points to"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError:
+        return None
+
+
+class ApiConditions(object):
+    """Rate limits, latency and failures of the emulated API"""
+
+    def __init__(self, rate_limit=1000, rate_window=3600, throttle_rate=0.0,
+                 latency=None, seed=None):
+        """
+        Args:
+            rate_limit (int):
+                number of API requests allowed in each rate limit window,
+                for each access token. Once exhausted, requests are
+                rejected with a 429 error until the window ends.
+            rate_window (int): length of the rate limit window, in seconds
+            throttle_rate (float):
+                fraction of API requests, between 0 and 1, to reject with
+                a 429 error at random, regardless of the rate limit
+            latency (callable):
+                optional function returning the number of seconds to delay
+                each API response by. Use functions from the
+                :mod:`random` module to emulate latency distributions.
+            seed (int): optional seed for the random number generator
+        """
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self.seed = seed
+
+
+class _RateLimiter(object):
+    """Applies the rate limits of an :class:`ApiConditions` object to the
+    requests received by an emulator"""
+
+    def __init__(self, conditions, clock):
+        """
+        Args:
+            conditions (ApiConditions): limits to apply
+            clock (callable): method used to get the current time
+        """
+        self.conditions = conditions
+        self._random = random.Random(conditions.seed)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # start time and number of requests of the current rate limit
+        # window, for each access token
+        self._windows = dict()
+        self.requests = 0
+        self.throttled = 0
+
+    def check(self, token):
+        """Counts an API request against the rate limit
+
+        Args:
+            token (str): access token the request was sent with
+
+        Returns:
+            tuple:
+                True if the request should be rejected, the number of
+                requests remaining, the number of seconds until the rate
+                limit window ends and the number of seconds to delay the
+                response by
+        """
+        conditions = self.conditions
+        with self._lock:
+            now = self._clock()
+            window = self._windows.get(token)
+            if window is None or now - window[0] >= conditions.rate_window:
+                window = [now, 0]
+                self._windows[token] = window
+            self.requests += 1
+            refresh = int(math.ceil(
+                conditions.rate_window - (now - window[0])))
+            rejected = window[1] >= conditions.rate_limit
+            if not rejected and conditions.throttle_rate > 0:
+                rejected = self._random.random() < conditions.throttle_rate
+            if rejected:
+                self.throttled += 1
+            else:
+                window[1] += 1
+            remaining = conditions.rate_limit - window[1]
+            if conditions.latency:
+                delay = max(conditions.latency(), 0)
+            else:
+                delay = 0
+        return rejected, remaining, refresh, delay
+
+
+class Emulator(object):
+    """Answers HTTP requests for the Pinterest v1 REST API from the data in
+    a :class:`SyntheticAccount`
+
+    Objects of this class are WSGI applications, and can also be served by
+    :class:`EmulatorServer`.
+    """
+
+    def __init__(self, account=None, page_size=25, conditions=None,
+                 clock=time.time, sleep=time.sleep):
+        """
+        Args:
+            account (SyntheticAccount):
+                data served by the emulator. Defaults to a small account
+                with 5 boards of 100 pins each.
+            page_size (int):
+                maximum number of items returned in each page of paged
+                results. Smaller values are used when clients request them
+                with the "limit" parameter.
+            conditions (ApiConditions):
+                rate limits, latency and failures of the emulated API.
+                Defaults to a rate limit of 1000 requests per hour, with no
+                added latency or failures.
+            clock (callable): method used to get the current time
+            sleep (callable): method used to wait for artificial latency
+        """
+        self._account = account or SyntheticAccount()
+        self._page_size = page_size
+        self._limiter = _RateLimiter(conditions or ApiConditions(), clock)
+        self._clock = clock
+        self._sleep = sleep
+
+    @property
+    def account(self):
+        """SyntheticAccount: data served by the emulator"""
+        return self._account
+
+    @property
+    def requests(self):
+        """int: number of API requests received, excluding images"""
+        return self._limiter.requests
+
+    @property
+    def throttled(self):
+        """int: number of API requests rejected with a 429 error"""
+        return self._limiter.throttled
+
+    def handle(self, method, url, form=None, host="localhost"):
+        """Generates the response for an HTTP request
+
+        Args:
+            method (str): name of the HTTP method (ie: GET, POST)
+            url (str): path and query string of the request
+            form (dict): optional form data posted with the request
+            host (str): host name and port the request was sent to
+
+        Returns:
+            tuple: HTTP status code, headers and body of the response
+        """
+        parts, params = _parse_url(url)
+        if parts[:1] == ["images"] and method == "GET":
+            return 200, {"Content-Type": "image/gif"}, _IMAGE_DATA
+
+        if parts[:1] == ["v1"]:
+            parts = parts[1:]
+        rejected, remaining, refresh, delay = self._limiter.check(
+            params.get("access_token"))
+        if delay:
+            self._sleep(delay)
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Date": formatdate(self._clock(), usegmt=True),
+            "X-Ratelimit-Limit": str(self._limiter.conditions.rate_limit),
+            "X-Ratelimit-Remaining": str(remaining),
+            "X-Ratelimit-Refresh": str(refresh),
+        }
+        if rejected:
+            status, data = 429, {
+                "message": "You have exceeded your rate limit. "
+                           "Try again later."}
+        elif not params.get("access_token"):
+            status, data = 401, {"message": "Authorization failed."}
+        else:
+            status, data = self._route(
+                method, parts, params, form or {}, "http://" + host)
+        return status, headers, json.dumps(data).encode("utf-8")
+
+    def _route(self, method, parts, params, form, image_root):
+        """Dispatches an API request to the appropriate handler
+
+        Returns:
+            tuple: HTTP status code and response data
+        """
+        if method == "GET":
+            return self._respond(self._get(parts, params, image_root), params)
+        if method == "POST" and parts == ["boards"]:
+            return self._create_board(params, form)
+        if method == "POST" and parts == ["pins"]:
+            return self._create_pin(params, form, image_root)
+        if method == "DELETE" and len(parts) == 2:
+            return self._delete(parts)
+        return self._respond(None, params)
+
+    def _respond(self, found, params):
+        """Packages the data found by a handler into a response
+
+        Returns:
+            tuple: HTTP status code and response data
+        """
+        if found is None:
+            return 404, {"message": "Not found.", "type": "api"}
+        if "data" in found:
+            return 200, found
+        return 200, {"data": self._filter(found, params)}
+
+    def _get(self, parts, params, image_root):
+        """Looks up the data requested by a GET request
+
+        Returns:
+            dict: the requested data, or None if it was not found
+        """
+        if parts == ["me"]:
+            return self._account.user_data()
+        if parts == ["me", "boards"]:
+            return self._page(self._account.boards(), params)
+        if len(parts) == 2 and parts[0] == "boards":
+            return self._account.board(parts[1])
+        if len(parts) == 3 and parts[0] == "boards" and parts[2] == "pins":
+            return self._pins_page(parts[1], params, image_root)
+        if len(parts) == 2 and parts[0] == "pins":
+            return self._account.pin(parts[1], image_root)
+        return None
+
+    def _create_board(self, params, form):
+        """Creates a board from the form data of a POST request
+
+        Returns:
+            tuple: HTTP status code and response data
+        """
+        if not form.get("name"):
+            return 400, {"message": "Board name is required."}
+        found = self._account.create_board(
+            form["name"], form.get("description", ""))
+        return 201, {"data": self._filter(found, params)}
+
+    def _create_pin(self, params, form, image_root):
+        """Creates a pin from the form data of a POST request
+
+        Returns:
+            tuple: HTTP status code and response data
+        """
+        if not form.get("board") or not form.get("note") or \
+                not form.get("image_url"):
+            return 400, {
+                "message": "Board, note and image_url are required."}
+        found = self._account.create_pin(
+            form["board"], form["note"], form["image_url"],
+            form.get("link"), image_root)
+        if found is None:
+            return self._respond(None, params)
+        return 201, {"data": self._filter(found, params)}
+
+    def _delete(self, parts):
+        """Removes the board or pin targeted by a DELETE request
+
+        Returns:
+            tuple: HTTP status code and response data
+        """
+        if parts[0] == "boards" and self._account.delete_board(parts[1]):
+            return 200, {"data": None}
+        if parts[0] == "pins" and self._account.delete_pin(parts[1]):
+            return 200, {"data": None}
+        return self._respond(None, {})
+
+    @staticmethod
+    def _filter(data, params):
+        """Limits response data to the fields requested by the client
+
+        Returns:
+            dict: the requested fields
+        """
+        fields = params.get("fields")
+        if not fields:
+            return data
+        wanted = set(fields.split(","))
+        wanted.add("id")
+        return {key: value for key, value in data.items() if key in wanted}
+
+    def _limit(self, params):
+        """int: number of items to return in a page of results"""
+        try:
+            return max(1, min(self._page_size, int(params.get("limit"))))
+        except (TypeError, ValueError):
+            return self._page_size
+
+    @staticmethod
+    def _make_page(items, position, params):
+        """Packages one page of results into response data
+
+        Returns:
+            dict: the response data
+        """
+        cursor = None if position is None else _encode_cursor(position)
+        return {
+            "data": [Emulator._filter(cur, params) for cur in items],
+            "page": {"cursor": cursor, "next": None},
+        }
+
+    def _page(self, items, params):
+        """Generates one page of results from a list of items
+
+        Returns:
+            dict: the response data
+        """
+        start = 0
+        if params.get("cursor"):
+            start = _decode_cursor(params["cursor"])
+            if start is None:
+                return None
+        end = start + self._limit(params)
+        position = end if end < len(items) else None
+        return self._make_page(items[start:end], position, params)
+
+    def _pins_page(self, board_id, params, image_root):
+        """Generates one page of the pins on a board
+
+        Returns:
+            dict: the response data, or None if there is no such board
+        """
+        start = 0
+        if params.get("cursor"):
+            start = _decode_cursor(params["cursor"])
+            if start is None:
+                return None
+        found = self._account.pins(
+            board_id, start, self._limit(params), image_root)
+        if found is None:
+            return None
+        return self._make_page(found[0], found[1], params)
+
+    def __call__(self, environ, start_response):
+        """Entry point for WSGI servers"""
+        method = environ["REQUEST_METHOD"]
+        url = environ.get("PATH_INFO", "/")
+        if environ.get("QUERY_STRING"):
+            url += "?" + environ["QUERY_STRING"]
+        form = None
+        if method == "POST":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            form = dict(parse_qsl(
+                environ["wsgi.input"].read(length).decode("utf-8")))
+        host = environ.get("HTTP_HOST") or "{0}:{1}".format(
+            environ.get("SERVER_NAME", "localhost"),
+            environ.get("SERVER_PORT", "80"))
+
+        status, headers, body = self.handle(method, url, form, host)
+        headers["Content-Length"] = str(len(body))
+        start_response(
+            "{0} {1}".format(status, _REASONS.get(status, "")),
+            list(headers.items()))
+        return [body]
+
+
+# descriptions for the HTTP status codes used by the emulator
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+}
+
+
+class _EmulatorHandler(BaseHTTPRequestHandler):
+    """Passes HTTP requests along to an :class:`Emulator`"""
+    protocol_version = "HTTP/1.1"
+    # buffer writes so headers and body go out in a single packet, otherwise
+    # Nagle's algorithm stalls every keep-alive response
+    wbufsize = 64 * 1024
+
+    def _reply(self):
+        form = None
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length", 0))
+            form = dict(parse_qsl(self.rfile.read(length).decode("utf-8")))
+        status, headers, body = self.server.emulator.handle(
+            self.command, self.path, form,
+            self.headers.get("Host", "localhost"))
+        # NOTE: the emulator provides its own Date header, so we skip the
+        #       one added by send_response
+        self.send_response_only(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handles HTTP GET requests"""
+        self._reply()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handles HTTP POST requests"""
+        self._reply()
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        """Handles HTTP DELETE requests"""
+        self._reply()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Suppresses per-request logging to keep test output clean"""
+
+
+class EmulatorServer(object):
+    """Serves an :class:`Emulator` over HTTP on a background thread
+
+    Connections are kept alive between requests, so clients that pool their
+    connections behave the same as they would against the real API.
+    """
+
+    def __init__(self, emulator=None, port=0):
+        """
+        Args:
+            emulator (Emulator):
+                emulator answering requests. Defaults to one serving a small
+                synthetic account.
+            port (int):
+                TCP port to listen on. Defaults to a random free port.
+        """
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", port), _EmulatorHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = emulator or Emulator()
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def emulator(self):
+        """Emulator: emulator answering requests"""
+        return self._server.emulator
+
+    @property
+    def url(self):
+        """str: root URL for the emulated REST API"""
+        return "http://127.0.0.1:{0}/v1".format(self._server.server_port)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
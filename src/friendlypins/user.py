@@ -3,11 +3,13 @@ import logging
 import json
 from datetime import datetime
 from dateutil import tz
-from friendlypins.board import Board
+from friendlypins.board import Board, AsyncBoard
+from friendlypins.utils.async_base_object import AsyncObjectMixin
 
 
-class User(object):
-    """Abstraction around a Pinterest user and their associated data"""
+class BaseUser(object):
+    """Properties shared by the blocking and asynchronous abstractions
+    around a Pinterest user"""
 
     def __init__(self, url, rest_io):
         """
@@ -43,6 +45,7 @@ class User(object):
         information will automatically be pulled on demand as additional
         queries are made through the API"""
         self._data_cache = None
+        self._io.invalidate(self._relative_url)
 
     @property
     def _data(self):
@@ -55,6 +58,9 @@ class User(object):
         if self._data_cache is not None:
             return self._data_cache
         self._log.debug("Getting authenticated user details...")
+        audit = self._io.options.observers.lazy_audit
+        if audit is not None:
+            audit.record(self, self._relative_url)
 
         fields = ",".join(self.default_fields())
         temp = self._io.get(self._relative_url, {"fields": fields})
@@ -137,17 +143,44 @@ class User(object):
         """str: description of who this user is"""
         return self._data["bio"]
 
+    @property
+    def _boards_url(self):
+        """str: URL for the boards owned by this user, relative to the API
+        root"""
+        return "{0}/boards".format(self._relative_url)
+
+    @staticmethod
+    def _board_properties():
+        """dict: query parameters used when loading or creating boards"""
+        return {"fields": ','.join(Board.default_fields())}
+
+    @staticmethod
+    def _board_form(name, description):
+        """Generates the form data used to create a board
+
+        Args:
+            name (str): name for the new board
+            description (str): optional descriptive text for the board
+
+        Returns:
+            dict: the form data
+        """
+        data = {"name": name}
+        if description:
+            data["description"] = description
+        return data
+
+
+class User(BaseUser):
+    """Abstraction around a Pinterest user and their associated data"""
+
     @property
     def boards(self):
         """Board: Generator for iterating over the boards owned by this user"""
         self._log.debug('Loading boards for user %s...', self._relative_url)
-
-        properties = {
-            "fields": ','.join(Board.default_fields())
-        }
-
-        board_url = "{0}/boards".format(self._relative_url)
-        for cur_page in self._io.get_pages(board_url, properties):
+        pages = self._io.get_pages(
+            self._boards_url, self._board_properties())
+        for cur_page in pages:
             assert 'data' in cur_page
 
             for cur_item in cur_page['data']:
@@ -163,16 +196,51 @@ class User(object):
         Returns:
             Board: reference to the newly created board
         """
-        properties = {
-            "fields": ','.join(Board.default_fields())
-        }
+        result = self._io.post(
+            "boards", self._board_form(name, description),
+            self._board_properties())
+        return Board.from_json(result['data'], self._io)
 
-        data = {"name": name}
-        if description:
-            data["description"] = description
 
-        result = self._io.post("boards", data, properties)
-        return Board.from_json(result['data'], self._io)
+class AsyncUser(AsyncObjectMixin, BaseUser):
+    """Asynchronous variant of :class:`User`
+
+    Await :meth:`load` before reading properties describing the user.
+    """
+
+    def __repr__(self):
+        if not self.is_loaded:
+            return "<{0} ({1})>".format(
+                self.__class__.__name__, self._relative_url)
+        return super().__repr__()
+
+    @property
+    async def boards(self):
+        """AsyncBoard: Asynchronous generator for iterating over the boards
+        owned by this user"""
+        self._log.debug('Loading boards for user %s...', self._relative_url)
+        pages = self._io.get_pages(
+            self._boards_url, self._board_properties())
+        async for cur_page in pages:
+            assert 'data' in cur_page
+
+            for cur_item in cur_page['data']:
+                yield AsyncBoard.from_json(cur_item, self._io)
+
+    async def create_board(self, name, description=None):
+        """Creates a new board for the currently authenticated user
+
+        Args:
+            name (str): name for the new board
+            description (str):  optional descriptive text for the board
+
+        Returns:
+            AsyncBoard: reference to the newly created board
+        """
+        result = await self._io.post(
+            "boards", self._board_form(name, description),
+            self._board_properties())
+        return AsyncBoard.from_json(result['data'], self._io)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,46 @@
+"""Shared functionality for the asynchronous variants of Pinterest
+primitives"""
+from friendlypins.exceptions import ObjectNotLoadedError
+
+
+class AsyncObjectMixin(object):
+    """Mixin that swaps the blocking lazy loading logic of a Pinterest
+    primitive for an awaitable one
+
+    Classes using this mixin must list it before the synchronous primitive
+    they extend, so all of the property accessors from the synchronous class
+    are re-used as-is. Those accessors raise an
+    :class:`~friendlypins.exceptions.ObjectNotLoadedError` until
+    :meth:`load` has been awaited, unless the object was created from
+    pre-loaded JSON data.
+    """
+
+    @property
+    def _data(self):
+        """dict: gets response data from the internal cache"""
+        if self._data_cache is None:
+            raise ObjectNotLoadedError(self._relative_url)
+        return self._data_cache
+
+    @property
+    def is_loaded(self):
+        """bool: True if the response data for this object is available"""
+        return self._data_cache is not None
+
+    async def load(self):
+        """Loads the response data describing this object from the REST API,
+        if it has not been loaded already
+
+        Returns:
+            this object, to make chaining calls convenient
+        """
+        if self._data_cache is not None:
+            return self
+        self._log.debug("Loading data for: %s", self._relative_url)
+        properties = {
+            "fields": ','.join(self.default_fields())
+        }
+        temp = await self._io.get(self._relative_url, properties)
+        assert "data" in temp
+        self._data_cache = temp["data"]
+        return self
@@ -0,0 +1,247 @@
+"""Asynchronous interface for raw Pinterest REST API calls"""
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from friendlypins.utils.rest_io import RestIO
+
+
+class AsyncRestIO(object):
+    """Awaitable interface for low level REST API interactions
+
+    Requests are sent by a wrapped :class:`RestIO` object on a pool of worker
+    threads, so the event loop is never blocked on network I/O and every
+    request shares the same connection pool, parsing and error handling logic
+    as the synchronous API.
+    """
+
+    def __init__(self, authentication_token, max_workers=10, **kwargs):
+        """
+        Args:
+            authentication_token (str):
+                Personal API token for authenticating to REST API, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool`
+            max_workers (int):
+                maximum number of requests that may be in flight at once
+            kwargs:
+                optional settings passed along to the wrapped
+                :class:`RestIO` object. Streamed pages are not supported.
+        """
+        if kwargs.get("stream_pages"):
+            raise TypeError(
+                "stream_pages is not supported by the asynchronous API")
+        self._log = logging.getLogger(__name__)
+        kwargs.setdefault("pool_maxsize", max_workers)
+        self._io = RestIO.from_kwargs(authentication_token, **kwargs)
+        self._prefetch_pages = kwargs.get("prefetch_pages", 0)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _run(self, func, *args):
+        """Runs a blocking method of the wrapped RestIO object on the worker
+        thread pool
+
+        Args:
+            func (callable): method to run
+            args: positional arguments passed to the method
+
+        Returns:
+            the return value of the method
+        """
+        loop = asyncio.get_running_loop()
+        # the call is made in our context, so context variables such as the
+        # operation labels of a quota ledger follow it to the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, partial(context.run, func, *args))
+
+    async def close(self):
+        """Closes all pooled connections and worker threads"""
+        await self._run(self._io.close)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def root_url(self):
+        """str: canonical url for the REST API"""
+        return self._io.root_url
+
+    @property
+    def token(self):
+        """str: authentication token"""
+        return self._io.token
+
+    @property
+    def sync_io(self):
+        """RestIO: the synchronous interface wrapped by this object"""
+        return self._io
+
+    def invalidate(self, path):
+        """Discards cached response data for an object, so it is reloaded
+        from the API the next time it is requested
+
+        Args:
+            path (str): sub-path with in the REST API for the object
+        """
+        self._io.invalidate(path)
+
+    @property
+    def rate_limit_state(self):
+        """RateLimitState: rate limit details reported by the most recent
+        API response"""
+        return self._io.rate_limit_state
+
+    def refresh_headers(self):
+        """Forces an update to the cached headers"""
+        self._io.refresh_headers()
+
+    async def get_headers(self):
+        """Gets the HTTP headers from the most recent API operation
+
+        Returns:
+            Headers: parsed response headers
+        """
+        return await self._run(lambda: self._io.headers)
+
+    async def probe_rate_limit(self):
+        """Sends a request to the API just to read the headers it returns
+
+        Returns:
+            Headers: the headers of the probe response
+        """
+        return await self._run(self._io.probe_rate_limit)
+
+    async def get(self, path, properties=None):
+        """Gets API data from a given sub-path
+
+        Args:
+            path (str): sub-path with in the REST API to query
+            properties (dict):
+                optional set of request properties to append to the API call
+
+        Returns:
+            dict: json data returned from the API endpoint
+        """
+        return await self._run(self._io.get, path, properties)
+
+    async def post(self, path, data, properties=None):
+        """Posts API data to a given sub-path
+
+        Args:
+            path (str): sub-path with in the REST API to send data to
+            data (str): form data to be posted to the API endpoint
+            properties (dict):
+                optional set of request properties to append to the API call
+
+        Returns:
+            dict: json data returned from the API endpoint
+        """
+        return await self._run(self._io.post, path, data, properties)
+
+    async def delete(self, path):
+        """Sends a delete request to a remote endpoint
+
+        Args:
+            path (str): API endpoint to send delete request to
+        """
+        await self._run(self._io.delete, path)
+
+    async def get_pages(self, path, properties=None, prefetch_pages=None):
+        """Asynchronous generator for iterating over paged results returned
+        from API
+
+        When prefetching is enabled, each page is requested as soon as the
+        previous one has been loaded, so the time spent waiting on the API
+        overlaps with the caller's processing of earlier pages.
+
+        Args:
+            path (str): sub-path with in the REST API to query
+            properties (dict):
+                optional set of request properties to append to the API call
+            prefetch_pages (int):
+                optional number of pages to load ahead of the caller.
+                Defaults to the value provided to our constructor.
+
+        Yields:
+            dict: json data returned from the API endpoint
+        """
+        if prefetch_pages is None:
+            prefetch_pages = self._prefetch_pages
+        if prefetch_pages <= 0:
+            async for result in self._load_pages(path, properties):
+                yield result
+            return
+
+        # a slot is claimed before each page is requested, and handed back
+        # once the caller has taken the page, so no more than the requested
+        # number of pages are ever loaded ahead of the caller
+        slots = asyncio.Semaphore(prefetch_pages)
+        pages = asyncio.Queue()
+
+        async def load():
+            source = self._load_pages(path, properties)
+            try:
+                while True:
+                    await slots.acquire()
+                    try:
+                        # the anext() builtin needs Python 3.10 or newer
+                        # pylint: disable=unnecessary-dunder-call
+                        result = await source.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    await pages.put((result, None))
+                await pages.put((None, None))
+            except Exception as err:  # pylint: disable=broad-except
+                await pages.put((None, err))
+            finally:
+                await source.aclose()
+
+        task = asyncio.ensure_future(load())
+        try:
+            while True:
+                result, error = await pages.get()
+                slots.release()
+                if error is not None:
+                    raise error
+                if result is None:
+                    break
+                yield result
+        finally:
+            task.cancel()
+            # let the loader close the source generator before returning
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _load_pages(self, path, properties):
+        """Asynchronous generator that loads paged results from the API one
+        at a time
+
+        Args:
+            path (str): sub-path with in the REST API to query
+            properties (dict):
+                optional set of request properties to append to the API call
+
+        Yields:
+            dict: json data returned from the API endpoint
+        """
+        page = 0
+        while True:
+            self._log.debug("Loading results page %s", page)
+            result = await self.get(path, properties)
+            yield result
+
+            cursor = RestIO.next_cursor(result)
+            if not cursor:
+                break
+
+            if properties is None:
+                properties = dict()
+            properties["cursor"] = cursor
+            page += 1
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -43,6 +43,7 @@ class BaseObject:
         information will automatically be pulled on demand as additional
         queries are made through the API"""
         self._data_cache = None
+        self._io.invalidate(self._relative_url)
 
     @property
     def _data(self):
@@ -51,6 +52,9 @@ class BaseObject:
         if self._data_cache is not None:
             return self._data_cache
         self._log.debug("Lazy loading data for: %s", self._relative_url)
+        audit = self._io.options.observers.lazy_audit
+        if audit is not None:
+            audit.record(self, self._relative_url)
         properties = {
             "fields": ','.join(self.default_fields())
         }
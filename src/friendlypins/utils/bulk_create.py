@@ -0,0 +1,321 @@
+"""Creation of many boards and pins from a manifest file"""
+import contextvars
+import csv
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# columns written to CSV result manifests
+_RESULT_FIELDS = ("line", "type", "name", "board", "id", "error")
+
+# prefix marking a board reference as an ID rather than a name
+_ID_PREFIX = "id:"
+
+
+class CreateResult(object):
+    """Outcome of creating the object described by one manifest row"""
+
+    def __init__(self, line, row, unique_id=None, error=None):
+        """
+        Args:
+            line (int): position of the row in the manifest, starting at 1
+            row (dict): the manifest row
+            unique_id (int): identifier of the created object, if any
+            error (Exception): error raised creating the object, if any
+        """
+        self.line = line
+        self.row = row
+        self.unique_id = unique_id
+        self.error = error
+
+    def __repr__(self):
+        return "<{0} (line {1}: {2})>".format(
+            self.__class__.__name__, self.line,
+            self.unique_id if self.succeeded else repr(self.error))
+
+    @property
+    def succeeded(self):
+        """bool: True if the object was created"""
+        return self.error is None
+
+    def to_dict(self):
+        """Describes the outcome, for writing to a result manifest
+
+        Returns:
+            dict: the outcome
+        """
+        return {
+            "line": self.line,
+            "type": row_type(self.row),
+            "name": self.row.get("name") or self.row.get("note"),
+            "board": self.row.get("board"),
+            "id": None if self.unique_id is None else str(self.unique_id),
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+def row_type(row):
+    """Determines the type of object a manifest row describes
+
+    Args:
+        row (dict): the manifest row
+
+    Returns:
+        str:
+            "board" or "pin". Rows without an explicit ``type`` describe a
+            pin when they provide an ``image_url``.
+    """
+    if row.get("type"):
+        return row["type"].strip().lower()
+    return "pin" if row.get("image_url") else "board"
+
+
+def board_id(reference):
+    """Gets the ID of the board a pin row refers to, if it refers to the
+    board by ID
+
+    Args:
+        reference (str): the ``board`` field of a pin row
+
+    Returns:
+        str:
+            the board ID, for references of the form ``id:<board ID>``, or
+            None for references to a board by name
+    """
+    if reference.startswith(_ID_PREFIX):
+        return reference[len(_ID_PREFIX):].strip()
+    return None
+
+
+def read_manifest(path):
+    """Loads the rows of a manifest file
+
+    Manifests are either JSON Lines files, with one object per line, or CSV
+    files with a header row. Files with a ``.csv`` extension are read as
+    CSV. Boards are described by a ``name`` and optional ``description``.
+    Pins are described by the ``board`` they are added to, a ``note``, an
+    ``image_url`` and an optional ``link``. Boards are given by name, or by
+    ID with an ``id:`` prefix, such as ``id:1234``.
+
+    Args:
+        path (str): path to the manifest file
+
+    Returns:
+        list (dict): the rows of the manifest
+    """
+    with open(path, "r", newline="", encoding="utf-8") as handle:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            return [
+                {key: value for key, value in cur.items() if value}
+                for cur in csv.DictReader(handle)]
+        return [json.loads(cur) for cur in handle if cur.strip()]
+
+
+def write_results(path, results):
+    """Writes a result manifest mapping manifest rows to created objects
+
+    Result manifests are written in the same formats as manifests: CSV for
+    files with a ``.csv`` extension, JSON Lines otherwise.
+
+    Args:
+        path (str): path to the file to write
+        results (list of CreateResult): outcomes to write
+    """
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            writer = csv.DictWriter(handle, _RESULT_FIELDS)
+            writer.writeheader()
+            for cur in results:
+                writer.writerow(cur.to_dict())
+            return
+        for cur in results:
+            handle.write(json.dumps(cur.to_dict(), sort_keys=True) + "\n")
+
+
+def _bounded_map(executor, func, items, window):
+    """Runs a function over a list of items, keeping a limited number of
+    calls queued at once
+
+    Args:
+        executor (ThreadPoolExecutor): pool to run the calls on
+        func (callable): function to call with each item
+        items (list): the items
+        window (int): maximum number of calls queued or running at once
+
+    Yields:
+        the return value of each call, in the same order as the items
+    """
+    pending = deque()
+    for cur in items:
+        pending.append(executor.submit(
+            contextvars.copy_context().run, func, cur))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _split_rows(rows):
+    """Sorts manifest rows by the type of object they describe
+
+    Args:
+        rows (list of dict): the manifest rows
+
+    Returns:
+        tuple:
+            lists of (line, row) pairs describing boards and pins, and the
+            results for rows of unsupported types
+    """
+    board_rows = list()
+    pin_rows = list()
+    unsupported = list()
+    for line, row in enumerate(rows, 1):
+        kind = row_type(row)
+        if kind == "board":
+            board_rows.append((line, row))
+        elif kind == "pin":
+            pin_rows.append((line, row))
+        else:
+            unsupported.append(CreateResult(line, row, error=ValueError(
+                "Unsupported type: {0}".format(row.get("type")))))
+    return board_rows, pin_rows, unsupported
+
+
+def _create_board(api, item):
+    """Creates the board described by a manifest row
+
+    Args:
+        api (API): reference to the Pinterest API
+        item (tuple): line number and manifest row
+
+    Returns:
+        tuple: the result for the row, and the new board if it was created
+    """
+    line, row = item
+    try:
+        if not row.get("name"):
+            raise ValueError("Boards need a name")
+        board = api.user.create_board(row["name"], row.get("description"))
+    except Exception as err:  # pylint: disable=broad-except
+        return CreateResult(line, row, error=err), None
+    return CreateResult(line, row, board.unique_id), board
+
+
+def _create_pin(boards, item):
+    """Creates the pin described by a manifest row
+
+    Args:
+        boards (dict): boards the pins may be added to, by reference
+        item (tuple): line number and manifest row
+
+    Returns:
+        CreateResult: the result for the row
+    """
+    line, row = item
+    try:
+        board = boards.get(str(row.get("board", "")))
+        if board is None:
+            raise ValueError(
+                "Board not found: {0}".format(row.get("board")))
+        pin = board.create_pin(
+            row.get("note"), row.get("image_url"), row.get("link"))
+    except Exception as err:  # pylint: disable=broad-except
+        return CreateResult(line, row, error=err)
+    return CreateResult(line, row, pin.unique_id)
+
+
+def _resolve_boards(api, boards, references):
+    """Finds the existing boards pin rows refer to that the manifest did
+    not create
+
+    Args:
+        api (API): reference to the Pinterest API
+        boards (dict):
+            boards by reference, updated with every referenced board found
+        references (set of str): the board references of the pin rows
+    """
+    log = logging.getLogger(__name__)
+    if any(board_id(cur) is None and cur not in boards
+           for cur in references):
+        for cur in api.user.boards:
+            boards.setdefault(cur.name, cur)
+    for cur in references:
+        unique_id = board_id(cur)
+        if unique_id is None or cur in boards:
+            continue
+        board = api.get_board_by_id(unique_id)
+        try:
+            board.unique_id  # pylint: disable=pointless-statement
+        except Exception as err:  # pylint: disable=broad-except
+            log.debug("Failed to load board %s: %s", cur, err)
+            continue
+        boards[cur] = board
+
+
+def bulk_create(api, rows, concurrency=4, progress=None):
+    """Creates the boards and pins described by manifest rows
+
+    Boards are created first, so pins may be added to boards created by
+    the same manifest. Pins refer to their board by name, or by ID with an
+    ``id:`` prefix. The list of existing boards is only loaded if a pin
+    refers to a board by a name that the manifest did not create, and boards
+    referred to by ID are loaded once each before any pins are created.
+
+    Requests are sent from a pool of worker threads, so each one is still
+    paced by the rate governor of the REST API interface, if one is in use.
+    Rows that could not be created are reported in the results without
+    stopping the rest of the operation.
+
+    Args:
+        api (API): reference to the Pinterest API
+        rows (list of dict): the manifest rows
+        concurrency (int): maximum number of requests sent at once
+        progress (callable):
+            optional function called with each result as it is produced
+
+    Returns:
+        list (CreateResult): outcome of each row, in manifest order
+    """
+    if concurrency < 1:
+        raise ValueError("Bulk creation needs at least 1 worker")
+    log = logging.getLogger(__name__)
+    results = [None] * len(rows)
+    boards = dict()
+
+    def finish(result):
+        results[result.line - 1] = result
+        if result.succeeded:
+            log.debug("Created %s from line %s", result.unique_id,
+                      result.line)
+        if progress:
+            progress(result)
+
+    board_rows, pin_rows, unsupported = _split_rows(rows)
+    for result in unsupported:
+        finish(result)
+
+    with ThreadPoolExecutor(
+            concurrency, thread_name_prefix="friendlypins-create") \
+            as executor:
+        window = concurrency * 2
+        for result, board in _bounded_map(
+                executor, partial(_create_board, api), board_rows, window):
+            if board is not None:
+                boards[board.name] = board
+            finish(result)
+
+        # resolve the boards pins are added to before the workers need them
+        _resolve_boards(
+            api, boards, {str(cur[1].get("board", "")) for cur in pin_rows})
+
+        for result in _bounded_map(
+                executor, partial(_create_pin, boards), pin_rows, window):
+            finish(result)
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
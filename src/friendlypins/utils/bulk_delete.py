@@ -0,0 +1,250 @@
+"""Concurrent deletion of the pins matching a set of criteria"""
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from dateutil import tz
+from six.moves import urllib
+
+
+class DeleteSummary(object):
+    """Outcome of deleting the pins matching a set of criteria"""
+
+    def __init__(self):
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = list()
+        self.failed = list()
+        # pins recorded as failures because they could not be checked
+        self._unchecked = 0
+
+    def __repr__(self):
+        return "<{0} ({1} scanned, {2} deleted, {3} failed)>".format(
+            self.__class__.__name__, self.scanned, len(self.deleted),
+            len(self.failed))
+
+    def check(self, pin, predicate):
+        """Counts a pin as scanned, and checks whether it should be deleted
+
+        Pins that can not be checked, because the predicate raised an error,
+        are recorded as failures without being counted as matches.
+
+        Args:
+            pin (Pin): the pin to check
+            predicate (callable):
+                function taking a pin and returning True if it should be
+                deleted, or None to delete every pin
+
+        Returns:
+            bool: True if the pin should be deleted
+        """
+        self.scanned += 1
+        try:
+            matched = predicate is None or predicate(pin)
+        except Exception as err:  # pylint: disable=broad-except
+            self._unchecked += 1
+            self.failed.append((pin.unique_id, err))
+            return False
+        if matched:
+            self.matched += 1
+        return bool(matched)
+
+    def record(self, pin_id, error=None):
+        """Records the outcome of deleting a matching pin
+
+        Args:
+            pin_id (int): unique identifier of the pin
+            error (Exception): the error raised by the delete, if it failed
+        """
+        if error is None:
+            self.deleted.append(pin_id)
+        else:
+            logging.getLogger(__name__).debug(
+                "Failed to delete pin %s: %s", pin_id, error)
+            self.failed.append((pin_id, error))
+
+    @property
+    def pending(self):
+        """int: number of matching pins still being deleted"""
+        return self.matched - len(self.deleted) - \
+            (len(self.failed) - self._unchecked)
+
+    def describe(self):
+        """Describes the outcome in human readable form
+
+        Returns:
+            list (str): one line of text for each detail of the outcome
+        """
+        lines = [
+            "Pins scanned: {0}".format(self.scanned),
+            "Pins matched: {0}".format(self.matched),
+            "Pins deleted: {0}".format(len(self.deleted)),
+        ]
+        if self.failed:
+            lines.append("Pins that could not be deleted: {0}".format(
+                len(self.failed)))
+            for pin_id, error in self.failed:
+                lines.append("    {0}: {1}".format(pin_id, error))
+        return lines
+
+
+def older_than(cutoff):
+    """Matches pins created before a given time
+
+    Args:
+        cutoff (datetime.datetime or datetime.timedelta):
+            time before which pins match, or the minimum age of a matching
+            pin
+
+    Returns:
+        callable: predicate taking a pin and returning True if it matches
+    """
+    if isinstance(cutoff, timedelta):
+        cutoff = datetime.now(tz=tz.tzutc()) - cutoff
+    return lambda pin: pin.creation_date < cutoff
+
+
+def media_type_in(*media_types):
+    """Matches pins with any of several types of media
+
+    Args:
+        media_types (str): types of media to match, such as "image"
+
+    Returns:
+        callable: predicate taking a pin and returning True if it matches
+    """
+    return lambda pin: pin.media_type in media_types
+
+
+def link_domain_in(*domains):
+    """Matches pins whose source link points to any of several domains
+
+    Sub-domains match too, so "example.com" matches links to
+    "www.example.com".
+
+    Args:
+        domains (str): domain names to match
+
+    Returns:
+        callable: predicate taking a pin and returning True if it matches
+    """
+    domains = [cur.lower().strip(".") for cur in domains]
+
+    def predicate(pin):
+        host = urllib.parse.urlparse(pin.link or "").hostname or ""
+        return any(host == cur or host.endswith("." + cur)
+                   for cur in domains)
+    return predicate
+
+
+def all_of(*predicates):
+    """Matches pins that match every one of several predicates
+
+    Args:
+        predicates (callable): the predicates to combine
+
+    Returns:
+        callable: predicate taking a pin and returning True if it matches
+    """
+    return lambda pin: all(cur(pin) for cur in predicates)
+
+
+def delete_pins(pins, predicate=None, concurrency=4, progress=None):
+    """Deletes every pin matching a predicate
+
+    Pins are checked as they are produced, so deletes begin while later
+    pins are still being loaded. Deletes are sent from a pool of worker
+    threads, so each one is still paced by the rate governor of the REST
+    API interface, if one is in use. Pins that could not be deleted, or
+    could not be checked against the predicate, are reported in the summary
+    without stopping the rest of the operation.
+
+    Args:
+        pins (iterable): pins to check, such as the pins on a board
+        predicate (callable):
+            function taking a pin and returning True if it should be deleted.
+            When not provided, every pin is deleted.
+        concurrency (int): maximum number of deletes sent at once
+        progress (callable):
+            optional function called with the summary every time a pin is
+            checked or deleted
+
+    Returns:
+        DeleteSummary: outcome of the operation
+    """
+    if concurrency < 1:
+        raise ValueError("Bulk deletes need at least 1 worker")
+    summary = DeleteSummary()
+    pending = dict()
+
+    def collect(futures):
+        for cur in futures:
+            summary.record(pending.pop(cur), cur.exception())
+            if progress:
+                progress(summary)
+
+    with ThreadPoolExecutor(
+            concurrency, thread_name_prefix="friendlypins-delete") \
+            as executor:
+        for pin in pins:
+            if summary.check(pin, predicate):
+                future = executor.submit(
+                    contextvars.copy_context().run, pin.delete)
+                pending[future] = pin.unique_id
+                if len(pending) >= concurrency * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            if progress:
+                progress(summary)
+        collect(wait(pending).done)
+    return summary
+
+
+async def delete_pins_async(pins, predicate=None, concurrency=4,
+                            progress=None):
+    """Asynchronous variant of :func:`delete_pins`
+
+    Args:
+        pins (async iterable): pins to check, such as the pins on a board
+        predicate (callable):
+            function taking a pin and returning True if it should be deleted.
+            When not provided, every pin is deleted.
+        concurrency (int): maximum number of deletes sent at once
+        progress (callable):
+            optional function called with the summary every time a pin is
+            checked or deleted
+
+    Returns:
+        DeleteSummary: outcome of the operation
+    """
+    if concurrency < 1:
+        raise ValueError("Bulk deletes need at least 1 worker")
+    summary = DeleteSummary()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def delete(pin):
+        try:
+            await pin.delete()
+        except Exception as err:  # pylint: disable=broad-except
+            summary.record(pin.unique_id, err)
+        else:
+            summary.record(pin.unique_id)
+        finally:
+            slots.release()
+        if progress:
+            progress(summary)
+
+    tasks = list()
+    async for pin in pins:
+        if summary.check(pin, predicate):
+            await slots.acquire()
+            tasks.append(asyncio.ensure_future(delete(pin)))
+        if progress:
+            progress(summary)
+    await asyncio.gather(*tasks)
+    return summary
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,114 @@
+"""Concurrent loading of many Pinterest objects with known identifiers"""
+import contextvars
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class FetchResult(object):
+    """Outcome of loading a single object as part of a bulk fetch"""
+
+    def __init__(self, unique_id, item=None, error=None):
+        """
+        Args:
+            unique_id: identifier of the object, as provided by the caller
+            item (BaseObject): the loaded object, or None if it failed
+            error (Exception): error raised while loading the object, if any
+        """
+        self.unique_id = unique_id
+        self.item = item
+        self.error = error
+
+    def __repr__(self):
+        return "<{0} ({1}: {2})>".format(
+            self.__class__.__name__, self.unique_id,
+            "ok" if self.succeeded else repr(self.error))
+
+    @property
+    def succeeded(self):
+        """bool: True if the object was loaded successfully"""
+        return self.error is None
+
+
+def _load(cls, unique_id, rest_io):
+    """Loads the data for a single object
+
+    Args:
+        cls (type): class of the object, such as Pin or Board
+        unique_id: identifier of the object
+        rest_io (RestIO): reference to the Pinterest REST API
+
+    Returns:
+        FetchResult: the loaded object, or the error raised loading it
+    """
+    url = cls.default_url(unique_id)
+    properties = {"fields": ','.join(cls.default_fields())}
+    try:
+        data = rest_io.get(url, properties)["data"]
+    except Exception as err:  # pylint: disable=broad-except
+        return FetchResult(unique_id, error=err)
+    return FetchResult(unique_id, cls(url, rest_io, data))
+
+
+def bulk_fetch(cls, unique_ids, rest_io, max_workers=8, ordered=True):
+    """Loads many objects of the same type concurrently
+
+    Each object is loaded by its own request, sent from a pool of worker
+    threads, so every request still passes through the rate governor, cache
+    and retry policy of the REST API interface. Identifiers are read from
+    the input lazily, so only a few more objects than there are workers are
+    ever in flight at once.
+
+    Objects that fail to load are reported as part of the results rather
+    than stopping the batch. If the caller stops iterating early, requests
+    not yet sent are cancelled.
+
+    Args:
+        cls (type): class of the objects to load, such as Pin or Board
+        unique_ids (iterable): identifiers of the objects to load
+        rest_io (RestIO): reference to the Pinterest REST API
+        max_workers (int): maximum number of requests sent at once
+        ordered (bool):
+            when True, results are produced in the same order as the
+            identifiers they were loaded for. When False, results are
+            produced as soon as each object has loaded.
+
+    Yields:
+        FetchResult: outcome of loading each object
+    """
+    if max_workers < 1:
+        raise ValueError("Bulk fetches need at least 1 worker")
+    log = logging.getLogger(__name__)
+    ids = iter(unique_ids)
+    window = max_workers * 2
+    pending = deque()
+    executor = ThreadPoolExecutor(
+        max_workers, thread_name_prefix="friendlypins-fetch")
+    try:
+        while True:
+            for cur in ids:
+                pending.append(executor.submit(
+                    contextvars.copy_context().run, _load, cls, cur, rest_io))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+
+            if ordered:
+                yield pending.popleft().result()
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for cur in [cur for cur in pending if cur in done]:
+                pending.remove(cur)
+                yield cur.result()
+    finally:
+        if pending:
+            log.debug("Cancelling %s unfinished fetches", len(pending))
+        for cur in pending:
+            cur.cancel()
+        executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
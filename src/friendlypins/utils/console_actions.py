@@ -1,22 +1,123 @@
 """Worker methods used to perform actions performed by fpins console app"""
 import logging
 import os
+from contextlib import closing, contextmanager
+from datetime import datetime
+from dateutil import tz
 from six.moves import urllib
 import requests
 from tqdm import tqdm
 from friendlypins.api import API
 from friendlypins.headers import Headers
+from friendlypins.utils.retry_policy import RetryPolicy
+from friendlypins.utils.cost_estimator import CostEstimate, Workload, \
+    Timings, QuotaWindow, pages_needed, DEFAULT_CALL_SECONDS, \
+    DEFAULT_PIN_BYTES, DEFAULT_THUMBNAIL_BYTES
+from friendlypins.utils.bulk_create import bulk_create, read_manifest, \
+    write_results, row_type, board_id
+from friendlypins.utils.bulk_delete import DeleteSummary, \
+    delete_pins as delete_matching_pins
+from friendlypins.utils.disk_cache import SqliteCache
+from friendlypins.utils.quota_ledger import QuotaLedger
+from friendlypins.utils.rate_governor import RateGovernor
 
 # Flag used to turn progress bars for downloads and such on and off
 DISABLE_PROGRESS_BARS = False
 
 
-def _download_pin(pin, folder):
+class StorageOptions(object):
+    """Files console operations keep their state in between runs"""
+
+    def __init__(self, cache_path=None, ledger_path=None):
+        """
+        Args:
+            cache_path (str):
+                optional path to a database file used to cache API responses
+                between runs
+            ledger_path (str):
+                optional path to a database file recording every API call
+                made, for tracking which operations consume the rate limit
+                quota
+        """
+        self.cache_path = cache_path
+        self.ledger_path = ledger_path
+
+
+def _log_retry(method, url, attempt, delay, error):
+    """Callback used to report retried API requests to the user
+
+    Args:
+        method (str): HTTP method of the failed request
+        url (str): URL the failed request was sent to
+        attempt (int): number of attempts made so far
+        delay (float): number of seconds until the request is retried
+        error (Exception): error that caused the request to fail
+    """
+    log = logging.getLogger(__name__)
+    log.warning("Request failed: %s", error)
+    log.warning(
+        "Retrying %s %s in %.0f seconds (attempt %s)",
+        method.upper(), url, delay, attempt + 1)
+
+
+@contextmanager
+def _open_api(api_token, storage=None, operation=None, **kwargs):
+    """Creates an API object configured for long running console operations
+
+    Transient failures and rate limit errors are retried, so operations that
+    take several hours are not aborted part way through.
+
+    Args:
+        api_token (str): Authentication token for accessing the Pinterest API
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+        operation (str):
+            name of the operation the API calls are recorded under in the
+            ledger
+        kwargs:
+            additional settings for the underlying
+            :class:`~friendlypins.utils.rest_io.RestIO` object
+
+    Yields:
+        API: reference to the Pinterest API
+    """
+    options = {"retry_policy": RetryPolicy(on_retry=_log_retry)}
+    options.update(kwargs)
+    storage = storage or StorageOptions()
+    cache = None
+    if storage.cache_path:
+        cache = SqliteCache(storage.cache_path)
+        options["cache"] = cache
+    ledger = None
+    if storage.ledger_path:
+        ledger = QuotaLedger(
+            storage.ledger_path, default_operation=operation or "fpins")
+        options["quota_ledger"] = ledger
+    try:
+        with API(api_token, **options) as obj:
+            yield obj
+    finally:
+        if cache:
+            cache.close()
+        if ledger:
+            ledger.close()
+
+
+def _download_pin(pin, folder, session, metrics=None, rate_limit_state=None):
     """Helper method for downloading a thumbnail from a single pin
 
     Args:
         pin (Pin): reference to the pin to download the thumbnail for
         folder (str): path where the pin is to be downloaded
+        session (requests.Session):
+            HTTP session used to download the image, so connections to the
+            image host can be re-used across pins
+        metrics (ClientMetrics):
+            optional collector the size of the download is reported to
+        rate_limit_state (RateLimitState):
+            optional record of the rate limit, updated if the image host
+            reports one
 
     Returns:
         int: status code. zero on success, non-zero on error
@@ -34,14 +135,20 @@ def _download_pin(pin, folder):
         return 0
 
     try:
-        response = requests.get(pin.thumbnail.url, stream=True)
+        response = session.get(pin.thumbnail.url, stream=True)
         response.raise_for_status()
         headers = Headers(response.headers)
         log.debug(headers)
+        if rate_limit_state is not None:
+            rate_limit_state.update(headers)
 
+        size = 0
         with open(output_file, "wb") as handle:
             for data in response.iter_content():
                 handle.write(data)
+                size += len(data)
+        if metrics is not None:
+            metrics.add_download(size)
     except:  # pylint: disable=bare-except
         log.error("Failed to download thumbnail %s", pin.thumbnail.url)
         log.error("See verbose output for details")
@@ -50,13 +157,20 @@ def _download_pin(pin, folder):
     return 0
 
 
-def download_thumbnails(api_token, board_name, output_folder,):
+def download_thumbnails(api_token, board_name, output_folder, storage=None,
+                        metrics=None):
     """Downloads thumbnails of all pins on a board
 
     Args:
         api_token (str): Authentication token for accessing the Pinterest API
         board_name (str): name of the board containing the pins to process
         output_folder (str): path where the thumbnails are to be downloaded
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+        metrics (ClientMetrics):
+            optional collector for metrics describing the API requests
+            made and the thumbnails downloaded
 
     Returns:
         int:
@@ -64,86 +178,184 @@ def download_thumbnails(api_token, board_name, output_folder,):
             zero on success, non-zero on failure
     """
     log = logging.getLogger(__name__)
-    obj = API(api_token)
-    user = obj.user
-
-    selected_board = None
-    for cur_board in user.boards:
-        if cur_board.name == board_name:
-            selected_board = cur_board
-            break
-    if not selected_board:
-        log.error("Could not find selected board: %s", board_name)
-        return 1
-
-    log.info('Downloading thumbnails...')
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    fmt = "{bar}| {n_fmt}/{total_fmt} [ETA {remaining}]"
-    parms = {
-        "total": selected_board.num_pins,
-        "ncols": 80,
-        "bar_format": fmt,
-        "disable": DISABLE_PROGRESS_BARS
-    }
-    retval = 0
-    with tqdm(**parms) as pbar:
-        for cur_pin in selected_board.pins:
-            temp = _download_pin(cur_pin, output_folder)
-            if temp:
-                retval = temp
-            pbar.update()
+    with _open_api(api_token, storage, "download_thumbnails",
+                   metrics=metrics) as obj:
+        selected_board, _ = _find_board(obj.user, board_name)
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        log.info('Downloading thumbnails...')
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+
+        parms = {
+            "total": selected_board.num_pins,
+            "ncols": 80,
+            "bar_format": "{bar}| {n_fmt}/{total_fmt} [ETA {remaining}]",
+            "disable": DISABLE_PROGRESS_BARS
+        }
+        retval = 0
+        with tqdm(**parms) as pbar, closing(requests.Session()) as session:
+            # load the next page of pins while we download the thumbnails
+            # for the current one
+            for cur_pin in selected_board.get_pins(prefetch_pages=1):
+                temp = _download_pin(
+                    cur_pin, output_folder, session, metrics,
+                    obj.rate_limit_state)
+                if temp:
+                    retval = temp
+                pbar.update()
 
     return retval
 
 
-def delete_board(api_token, board_name):
+def delete_board(api_token, board_name, storage=None):
     """Deletes a board owned by a specific user
 
     Args:
         api_token (str): Authentication token for the user who owns the board
         board_name (str): Name of the board to delete
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
 
     Returns:
         int:  0 if the board was deleted, otherwise an error code is returned
     """
     log = logging.getLogger(__name__)
-    obj = API(api_token)
-    user = obj.user
+    with _open_api(api_token, storage, "delete_board") as obj:
+        user = obj.user
+
+        selected_board = None
+        for cur_board in user.boards:
+            if cur_board.name == board_name:
+                selected_board = cur_board
+                break
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        log.info(
+            "Deleting board %s (%s)",
+            selected_board.name,
+            selected_board.unique_id)
+        selected_board.delete()
+    return 0
 
-    selected_board = None
-    for cur_board in user.boards:
-        if cur_board.name == board_name:
-            selected_board = cur_board
-            break
-    if not selected_board:
-        log.error("Could not find selected board: %s", board_name)
-        return 1
 
-    log.info(
-        "Deleting board %s (%s)",
-        selected_board.name,
-        selected_board.unique_id)
-    selected_board.delete()
-    return 0
+def delete_pins(api_token, board_name, predicate=None, concurrency=4,
+                storage=None):
+    """Deletes the pins on a board that match a predicate
+
+    Deletes are paced by a rate governor, so boards with many pins spread
+    their requests over the rate limit quota instead of exhausting it.
+
+    Args:
+        api_token (str): Authentication token for the user who owns the board
+        board_name (str): Name of the board containing the pins
+        predicate (callable):
+            function taking a pin and returning True if it should be deleted.
+            When not provided, every pin on the board is deleted.
+        concurrency (int): maximum number of deletes sent at once
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
 
+    Returns:
+        int:
+            0 if every matching pin was deleted, otherwise an error code is
+            returned
+    """
+    log = logging.getLogger(__name__)
+    with _open_api(api_token, storage, "delete_pins",
+                   governor=RateGovernor()) as obj:
+        selected_board, _ = _find_board(obj.user, board_name)
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        log.info("Deleting pins from board %s...", board_name)
+        fmt = "{bar}| {n_fmt}/{total_fmt} {postfix} [ETA {remaining}]"
+        parms = {
+            "total": selected_board.num_pins,
+            "ncols": 80,
+            "bar_format": fmt,
+            "disable": DISABLE_PROGRESS_BARS
+        }
+        with tqdm(**parms) as pbar:
+            def progress(summary):
+                pbar.set_postfix_str(
+                    "{0} deleted".format(len(summary.deleted)),
+                    refresh=False)
+                pbar.update(summary.scanned - pbar.n)
+            # load the next page of pins while the current one is deleted
+            summary = delete_matching_pins(
+                selected_board.get_pins(prefetch_pages=1), predicate,
+                concurrency, progress)
+
+    for line in summary.describe():
+        log.info(line)
+    return 2 if summary.failed else 0
+
+
+def estimate_delete_pins(api_token, board_name, predicate=None, storage=None):
+    """Estimates the cost of deleting the pins on a board that match a
+    predicate, without deleting anything
+
+    The pins on the board are loaded, to count the ones that match.
 
-def create_board(api_token, board_name):
+    Args:
+        api_token (str): Authentication token for the user who owns the board
+        board_name (str): Name of the board containing the pins
+        predicate (callable):
+            function taking a pin and returning True if it should be deleted
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    log = logging.getLogger(__name__)
+    with _open_api(api_token, storage, "estimate") as obj:
+        selected_board, board_pages = _find_board(obj.user, board_name)
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        summary = DeleteSummary()
+        for cur_pin in selected_board.get_pins(prefetch_pages=1):
+            summary.check(cur_pin, predicate)
+        estimate = CostEstimate(
+            "deleting {0} of {1} pins from {2}".format(
+                summary.matched, summary.scanned, board_name),
+            Workload(
+                board_pages + pages_needed(summary.scanned) +
+                summary.matched,
+                api_bytes=obj.stats.bytes),
+            **_estimate_options(obj))
+    return _report_estimate(estimate)
+
+
+def create_board(api_token, board_name, storage=None):
     """Creates a new board
 
     Args:
         api_token (str): Authentication token for the user who owns the board
         board_name (str): Name of the board to create
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
 
     Returns:
         int: 0 if the board was created, otherwise an error code is returned
     """
     log = logging.getLogger(__name__)
-    obj = API(api_token)
-    user = obj.user
+    with _open_api(api_token, storage, "create_board") as obj:
+        user = obj.user
 
-    result = user.create_board(board_name)
+        result = user.create_board(board_name)
 
     if result.name != board_name:
         log.error("Unable to create board %s", board_name)
@@ -151,22 +363,284 @@ def create_board(api_token, board_name):
     return 0
 
 
-def check_rate_limit(api_token):
+def check_rate_limit(api_token, storage=None):
     """Checks to see when the next rate limit renewal is to occur
 
+    When a ledger is provided, the calls made by each operation over the
+    past hour are reported as well, along with a projection of when the
+    quota will run out if calls keep being made at the current rate.
+
     Args:
         api_token (str): Authentication token for the user who owns the board
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
 
     Returns:
         int: 0 if the operation succeeded, otherwise an error code
     """
     log = logging.getLogger(__name__)
-    obj = API(api_token)
-    log.info("Transactions allowed: %s", obj.transaction_limit)
-    log.info("Transactions available: %s", obj.transaction_remaining)
-    log.info("Next rate limit renewal is at %s", obj.rate_limit_refresh)
+    with _open_api(api_token, storage, "check_rate_limit") as obj:
+        rate = obj.rate_limit
+        if rate.stale:
+            rate = obj.refresh_rate_limit()
+        log.info("Transactions allowed: %s", rate.rate_limit)
+        log.info("Transactions available: %s", rate.rate_remaining)
+        log.info("Next rate limit renewal is at %s", rate.time_to_refresh)
+        renewal = rate.time_to_refresh
+
+    if storage and storage.ledger_path:
+        with QuotaLedger(storage.ledger_path) as ledger:
+            usage = ledger.usage_by_operation()
+            projection = ledger.projection()
+        log.info("Transactions used in the past hour:")
+        for operation, count in sorted(
+                usage.items(), key=lambda cur: cur[1], reverse=True):
+            log.info("    %s: %s", operation, count)
+        log.info(
+            "Current burn rate: %.0f transactions per hour",
+            projection.calls_per_hour)
+        exhausted = projection.exhausted_at
+        if exhausted is not None and renewal is not None and \
+                exhausted < renewal:
+            log.warning(
+                "At this rate the quota will run out at %s", exhausted)
     return 0
 
 
+def _find_board(user, board_name):
+    """Helper method that locates a board by name
+
+    Args:
+        user (User): the user who owns the board
+        board_name (str): name of the board to find
+
+    Returns:
+        tuple:
+            the board, or None if it wasn't found, and the number of pages
+            of boards loaded from the API while looking for it
+    """
+    count = 0
+    for count, cur_board in enumerate(user.boards, 1):
+        if cur_board.name == board_name:
+            return cur_board, pages_needed(count)
+    return None, pages_needed(count)
+
+
+def _estimate_options(obj):
+    """Helper method that gathers the details needed to estimate the cost
+    of an operation, from the API calls made so far
+
+    Args:
+        obj (API): reference to the Pinterest API
+
+    Returns:
+        dict:
+            average latency of API calls and rate limit details, as
+            parameters for a :class:`CostEstimate`
+    """
+    stats = obj.stats.snapshot()
+    total = sum(cur["latency"]["mean"] * cur["calls"]
+                for cur in stats["endpoints"])
+    rate = obj.rate_limit
+    refresh = None
+    if rate.time_to_refresh is not None:
+        refresh = rate.time_to_refresh - datetime.now(tz=tz.tzutc())
+        refresh = max(0, int(refresh.total_seconds()))
+    return {
+        "timings": Timings(
+            total / stats["calls"] if stats["calls"]
+            else DEFAULT_CALL_SECONDS),
+        "quota": QuotaWindow(rate.rate_remaining, rate.rate_limit, refresh),
+    }
+
+
+def _report_estimate(estimate):
+    """Helper method that reports the cost of an operation to the user
+
+    Args:
+        estimate (CostEstimate): the estimate to report
+
+    Returns:
+        int: zero, as the status code for the estimate
+    """
+    log = logging.getLogger(__name__)
+    for line in estimate.describe():
+        log.info(line)
+    return 0
+
+
+def estimate_download_thumbnails(api_token, board_name, storage=None):
+    """Estimates the cost of downloading the thumbnails from a board,
+    without downloading anything
+
+    Only the list of boards is loaded from the API. The number of calls
+    needed to load the pins is derived from the pin count of the board.
+
+    Args:
+        api_token (str): Authentication token for accessing the Pinterest API
+        board_name (str): name of the board containing the pins to process
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    log = logging.getLogger(__name__)
+    with _open_api(api_token, storage, "estimate") as obj:
+        selected_board, board_pages = _find_board(obj.user, board_name)
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        num_pins = selected_board.num_pins
+        estimate = CostEstimate(
+            "downloading {0} thumbnails from {1}".format(
+                num_pins, board_name),
+            Workload(
+                board_pages + pages_needed(num_pins),
+                api_bytes=obj.stats.bytes + num_pins * DEFAULT_PIN_BYTES,
+                downloads=num_pins,
+                download_bytes=num_pins * DEFAULT_THUMBNAIL_BYTES),
+            **_estimate_options(obj))
+    return _report_estimate(estimate)
+
+
+def estimate_delete_board(api_token, board_name, storage=None):
+    """Estimates the cost of deleting a board, without deleting it
+
+    Args:
+        api_token (str): Authentication token for the user who owns the board
+        board_name (str): Name of the board to delete
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    log = logging.getLogger(__name__)
+    with _open_api(api_token, storage, "estimate") as obj:
+        selected_board, board_pages = _find_board(obj.user, board_name)
+        if not selected_board:
+            log.error("Could not find selected board: %s", board_name)
+            return 1
+
+        estimate = CostEstimate(
+            "deleting board {0}".format(board_name),
+            Workload(board_pages + 1, api_bytes=obj.stats.bytes),
+            **_estimate_options(obj))
+    return _report_estimate(estimate)
+
+
+def estimate_create_board(api_token, board_name, storage=None):
+    """Estimates the cost of creating a board, without creating it
+
+    Args:
+        api_token (str): Authentication token for the user who owns the board
+        board_name (str): Name of the board to create
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    with _open_api(api_token, storage, "estimate") as obj:
+        estimate = CostEstimate(
+            "creating board {0}".format(board_name), Workload(1),
+            **_estimate_options(obj))
+    return _report_estimate(estimate)
+
+
+def create_from_manifest(api_token, manifest_path, results_path=None,
+                         concurrency=4, storage=None):
+    """Creates the boards and pins described by a manifest file
+
+    Requests are paced by a rate governor, so large manifests spread their
+    requests over the rate limit quota instead of exhausting it.
+
+    Args:
+        api_token (str): Authentication token for the user who owns the boards
+        manifest_path (str):
+            path to a JSON Lines or CSV file describing the boards and pins
+            to create
+        results_path (str):
+            optional path to a file where the ID created for each row of the
+            manifest is written, in the same format as the manifest
+        concurrency (int): maximum number of requests sent at once
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int:
+            0 if every row of the manifest was created, otherwise an error
+            code is returned
+    """
+    log = logging.getLogger(__name__)
+    rows = read_manifest(manifest_path)
+    log.info("Creating %s objects from %s...", len(rows), manifest_path)
+    with _open_api(api_token, storage, "create_from_manifest",
+                   governor=RateGovernor()) as obj:
+        parms = {
+            "total": len(rows),
+            "ncols": 80,
+            "disable": DISABLE_PROGRESS_BARS
+        }
+        with tqdm(**parms) as pbar:
+            results = bulk_create(
+                obj, rows, concurrency, lambda _: pbar.update())
+
+    if results_path:
+        write_results(results_path, results)
+    failed = [cur for cur in results if not cur.succeeded]
+    log.info("Objects created: %s", len(results) - len(failed))
+    if failed:
+        log.error("Rows that could not be created: %s", len(failed))
+        for cur in failed:
+            log.error("    line %s: %s", cur.line, cur.error)
+        return 2
+    return 0
+
+
+def estimate_create_from_manifest(api_token, manifest_path, storage=None):
+    """Estimates the cost of creating the boards and pins described by a
+    manifest file, without creating anything
+
+    Args:
+        api_token (str): Authentication token for the user who owns the boards
+        manifest_path (str):
+            path to a JSON Lines or CSV file describing the boards and pins
+            to create
+        storage (StorageOptions):
+            optional files used to cache API responses and record the API
+            calls made
+
+    Returns:
+        int: zero on success, non-zero on failure
+    """
+    rows = read_manifest(manifest_path)
+    created = {cur.get("name") for cur in rows if row_type(cur) == "board"}
+    references = {str(cur.get("board", "")) for cur in rows
+                  if row_type(cur) == "pin"}
+    with _open_api(api_token, storage, "estimate") as obj:
+        # boards referred to by ID are loaded once each, and boards referred
+        # to by a name the manifest doesn't create are looked up in the list
+        # of existing boards
+        board_calls = len([cur for cur in references
+                           if board_id(cur) is not None])
+        if any(board_id(cur) is None and cur not in created
+               for cur in references):
+            board_calls += pages_needed(obj.user.num_boards)
+        estimate = CostEstimate(
+            "creating {0} objects from {1}".format(
+                len(rows), manifest_path),
+            Workload(len(rows) + board_calls, api_bytes=obj.stats.bytes),
+            **_estimate_options(obj))
+    return _report_estimate(estimate)
+
+
 if __name__ == "__main__":  # pragma: no cover
     pass
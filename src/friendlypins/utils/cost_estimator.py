@@ -0,0 +1,223 @@
+"""Estimates of the API calls, bandwidth and time needed for an operation"""
+import math
+
+# number of items returned in each page of paged results
+PAGE_SIZE = 100
+
+# length of each rate limit window, in seconds
+RATE_LIMIT_WINDOW = 3600
+
+# rough size of the response data for a single pin, with the default fields
+DEFAULT_PIN_BYTES = 1500
+
+# rough size of a pin thumbnail image
+DEFAULT_THUMBNAIL_BYTES = 40 * 1024
+
+# time taken to complete an API call, when it has not been measured
+DEFAULT_CALL_SECONDS = 0.5
+
+# time taken to download a thumbnail image
+DEFAULT_DOWNLOAD_SECONDS = 0.25
+
+
+def pages_needed(num_items, page_size=PAGE_SIZE):
+    """Calculates the number of requests needed to load paged results
+
+    Args:
+        num_items (int): number of items in the results
+        page_size (int): number of items returned in each page
+
+    Returns:
+        int: number of pages. Empty results still take one request.
+    """
+    return max(1, int(math.ceil(num_items / float(page_size))))
+
+
+class Workload(object):
+    """Amount of work an operation does"""
+
+    def __init__(self, calls, api_bytes=0, downloads=0, download_bytes=0):
+        """
+        Args:
+            calls (int): number of API calls the operation makes
+            api_bytes (int): amount of response data returned by the API
+            downloads (int):
+                number of files downloaded outside of the API, such as
+                thumbnail images
+            download_bytes (int): total size of those files
+        """
+        self.calls = calls
+        self.api_bytes = api_bytes
+        self.downloads = downloads
+        self.download_bytes = download_bytes
+
+
+class Timings(object):
+    """Time taken by each request an operation makes"""
+
+    def __init__(self, seconds_per_call=DEFAULT_CALL_SECONDS,
+                 seconds_per_download=DEFAULT_DOWNLOAD_SECONDS):
+        """
+        Args:
+            seconds_per_call (float): time taken to complete an API call
+            seconds_per_download (float): time taken to download a file
+        """
+        self.seconds_per_call = seconds_per_call
+        self.seconds_per_download = seconds_per_download
+
+
+class QuotaWindow(object):
+    """State of the rate limit window an operation starts in"""
+
+    def __init__(self, rate_remaining=None, rate_limit=None,
+                 seconds_to_refresh=None):
+        """
+        Args:
+            rate_remaining (int):
+                number of API calls left in the current rate limit window,
+                or None if unknown
+            rate_limit (int): number of API calls allowed in each window
+            seconds_to_refresh (int):
+                number of seconds until the current window ends
+        """
+        self.rate_remaining = rate_remaining
+        self.rate_limit = rate_limit
+        self.seconds_to_refresh = seconds_to_refresh
+
+
+class CostEstimate(object):
+    """Projected cost of an operation, and how it fits in the rate limit"""
+
+    def __init__(self, operation, workload, timings=None, quota=None):
+        """
+        Args:
+            operation (str): description of the operation
+            workload (Workload): amount of work the operation does
+            timings (Timings):
+                time taken by each request. Defaults to typical timings.
+            quota (QuotaWindow):
+                state of the current rate limit window. Defaults to an
+                unknown quota.
+        """
+        self.operation = operation
+        self.workload = workload
+        self.timings = timings or Timings()
+        self.quota = quota or QuotaWindow()
+
+    @property
+    def total_bytes(self):
+        """int: total amount of data received by the operation"""
+        return self.workload.api_bytes + self.workload.download_bytes
+
+    @property
+    def work_seconds(self):
+        """float: time spent making requests, excluding any time spent
+        waiting on the rate limit"""
+        return self.workload.calls * self.timings.seconds_per_call + \
+            self.workload.downloads * self.timings.seconds_per_download
+
+    @property
+    def fits_quota(self):
+        """bool: True if the operation can complete in the current rate
+        limit window"""
+        if self.quota.rate_remaining is None:
+            return True
+        return self.workload.calls <= self.quota.rate_remaining
+
+    @property
+    def pauses(self):
+        """int: number of times the operation needs to wait for the rate
+        limit to refresh"""
+        if self.fits_quota:
+            return 0
+        if not self.quota.rate_limit:
+            return 1
+        over = self.workload.calls - self.quota.rate_remaining
+        return int(math.ceil(over / float(self.quota.rate_limit)))
+
+    @property
+    def total_seconds(self):
+        """float: time needed to complete the operation, including time
+        spent waiting on the rate limit"""
+        pauses = self.pauses
+        if not pauses:
+            return self.work_seconds
+        # the calls made after the final refresh can't start any sooner
+        # than the refresh itself
+        calls = self.workload.calls
+        last_batch = calls - self.quota.rate_remaining
+        if self.quota.rate_limit:
+            last_batch -= (pauses - 1) * self.quota.rate_limit
+        waiting = (self.quota.seconds_to_refresh or 0) + \
+            (pauses - 1) * RATE_LIMIT_WINDOW
+        return max(
+            self.work_seconds,
+            waiting + self.work_seconds * last_batch / float(calls))
+
+    def describe(self):
+        """Describes the estimate in human readable form
+
+        Returns:
+            list (str): one line of text for each detail of the estimate
+        """
+        lines = [
+            "Estimated cost of {0}:".format(self.operation),
+            "    API calls: {0}".format(self.workload.calls),
+        ]
+        if self.workload.downloads:
+            lines.append(
+                "    File downloads: {0}".format(self.workload.downloads))
+        lines.append("    Data transferred: {0}".format(
+            _format_bytes(self.total_bytes)))
+        lines.append("    Time needed: {0}".format(
+            _format_seconds(self.total_seconds)))
+        if self.quota.rate_remaining is None:
+            lines.append("    Remaining quota unknown")
+        elif self.fits_quota:
+            lines.append(
+                "    Fits in the remaining quota of {0} calls".format(
+                    self.quota.rate_remaining))
+        else:
+            lines.append(
+                "    Exceeds the remaining quota of {0} calls: the operation "
+                "will pause {1} time(s) for the rate limit to refresh".format(
+                    self.quota.rate_remaining, self.pauses))
+        return lines
+
+
+def _format_bytes(size):
+    """Converts a number of bytes to human readable form
+
+    Args:
+        size (int): number of bytes
+
+    Returns:
+        str: size in the largest suitable unit
+    """
+    for unit in ("bytes", "KB", "MB"):
+        if size < 1024:
+            return "{0:.0f} {1}".format(size, unit)
+        size /= 1024.0
+    return "{0:.1f} GB".format(size)
+
+
+def _format_seconds(seconds):
+    """Converts a duration to human readable form
+
+    Args:
+        seconds (float): duration in seconds
+
+    Returns:
+        str: the duration in hours, minutes and seconds
+    """
+    minutes, seconds = divmod(int(math.ceil(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return "{0}h {1:02}m {2:02}s".format(hours, minutes, seconds)
+    if minutes:
+        return "{0}m {1:02}s".format(minutes, seconds)
+    return "{0}s".format(seconds)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
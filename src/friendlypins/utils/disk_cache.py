@@ -0,0 +1,190 @@
+"""Persistent response cache stored in a local SQLite database"""
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from friendlypins.utils.response_cache import ResponseCache, CacheEntry
+
+
+class SqliteCache(ResponseCache):
+    """Response cache that persists across processes in a SQLite database
+
+    Response bodies are stored as zlib compressed JSON, along with any
+    validators the API provided for revalidating them once they expire. When
+    the total size of the stored bodies exceeds the configured limit, the
+    least recently used entries are evicted first.
+
+    Example:
+
+        >>> with SqliteCache("~/.friendlypins/cache.db") as cache:
+        >>>     api = API(token, cache=cache)
+    """
+
+    # Name of the environment variable that may be used to enable the cache
+    # for the fpins console application
+    ENV_VAR = "FRIENDLYPINS_CACHE"
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            path TEXT NOT NULL,
+            params TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires REAL NOT NULL,
+            accessed REAL NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            source_size INTEGER NOT NULL DEFAULT 0,
+            scope TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (path, params, scope)
+        )
+    """
+
+    def __init__(self, filename, max_bytes=50 * 1024 * 1024, **kwargs):
+        """
+        Args:
+            filename (str):
+                path to the database file. The file, and the folder it is in,
+                will be created if necessary.
+            max_bytes (int):
+                maximum total size of the compressed response bodies stored
+                in the cache
+            kwargs:
+                expiry settings supported by :class:`ResponseCache`
+        """
+        super().__init__(**kwargs)
+        self._filename = os.path.expanduser(filename)
+        self._max_bytes = max_bytes
+        folder = os.path.dirname(self._filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self._filename, check_same_thread=False)
+        with self._db:
+            columns = [row[1] for row in self._db.execute(
+                "PRAGMA table_info(responses)")]
+            if columns and ("etag" not in columns or
+                            "scope" not in columns):
+                # cache files created by older versions can't hold the
+                # validators we need, or don't record which token the data
+                # was loaded with, so we just start over with a new one
+                self._db.execute("DROP TABLE responses")
+            self._db.execute(self._schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def filename(self):
+        """str: path to the database file"""
+        return self._filename
+
+    @property
+    def size(self):
+        """int: total size, in bytes, of the compressed response bodies"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Closes the connection to the database"""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _encode_params(key):
+        """str: serialized form of the query parameters from a cache key"""
+        return json.dumps(key[1])
+
+    def _load(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, expires, etag, last_modified, source_size "
+                "FROM responses WHERE path = ? AND params = ? AND scope = ?",
+                (key[0], self._encode_params(key), key[2])).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE responses SET accessed = ? "
+                    "WHERE path = ? AND params = ? AND scope = ?",
+                    (self._clock(), key[0], self._encode_params(key),
+                     key[2]))
+        data = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        return CacheEntry(data, row[1], row[2], row[3], row[4])
+
+    def _store(self, key, entry):
+        body = zlib.compress(json.dumps(entry.data).encode("utf-8"))
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(path, params, body, size, expires, accessed, etag, "
+                "last_modified, source_size, scope) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key[0], self._encode_params(key), body, len(body),
+                 entry.expires, self._clock(), entry.etag,
+                 entry.last_modified, entry.size, key[2]))
+            evicted = self._enforce_size_limit()
+        if evicted:
+            self._evicted(evicted)
+
+    def _enforce_size_limit(self):
+        """Evicts expired and least recently used entries until the total
+        size of the cache is with in our size limit
+
+        Expired entries that can be revalidated with the API are kept, until
+        they are evicted to make room for other data.
+
+        Must be called with the lock held, inside a transaction.
+
+        Returns:
+            int: number of entries evicted
+        """
+        evicted = self._db.execute(
+            "DELETE FROM responses WHERE expires <= ? "
+            "AND etag IS NULL AND last_modified IS NULL",
+            (self._clock(),)).rowcount
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return evicted
+
+        rows = self._db.execute(
+            "SELECT path, params, scope, size FROM responses "
+            "ORDER BY accessed ASC").fetchall()
+        for path, params, scope, size in rows:
+            if total <= self._max_bytes:
+                break
+            self._db.execute(
+                "DELETE FROM responses "
+                "WHERE path = ? AND params = ? AND scope = ?",
+                (path, params, scope))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def _paths(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT path FROM responses").fetchall()
+        return [cur[0] for cur in rows]
+
+    def _discard(self, paths):
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM responses WHERE path = ?",
+                [(cur,) for cur in paths])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,73 @@
+"""Helpers for describing REST API endpoints and the requests sent to them"""
+import hashlib
+
+# Query parameters that do not affect the data returned by the API
+_IGNORED_PROPERTIES = ("access_token",)
+
+
+def request_key(path, properties=None, scope=None):
+    """Generates a key uniquely identifying the data returned by an API query
+
+    Two queries with the same key are guaranteed to return the same data,
+    regardless of the order their query parameters were specified in. The
+    authentication token is not part of the key, so queries sent with
+    different tokens only share a key when they are given the same scope.
+
+    Args:
+        path (str): sub-path with in the REST API being queried
+        properties (dict): optional set of query parameters for the request
+        scope (str):
+            optional identifier for the credentials the query is sent with,
+            as generated by :func:`token_scope`. Data cached across several
+            tokens must be scoped, so one account never sees another's data.
+
+    Returns:
+        tuple: hashable key for the query
+    """
+    params = tuple(sorted(
+        (str(key), str(value))
+        for key, value in (properties or dict()).items()
+        if key not in _IGNORED_PROPERTIES
+    ))
+    return path.strip("/"), params, scope or ""
+
+
+def token_scope(token):
+    """Generates an identifier for the credentials a query is sent with,
+    without revealing them
+
+    Args:
+        token (str or TokenPool):
+            authentication token, or a pool of tokens with access to the same
+            data
+
+    Returns:
+        str: hash of the token, or of every token in the pool
+    """
+    tokens = getattr(token, "tokens", None)
+    if tokens is not None:
+        token = "\n".join(sorted(tokens))
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def path_template(path):
+    """Converts the path for a specific API object into a generic template
+    describing the endpoint
+
+    Example:
+
+        >>> path_template("boards/1234/pins")
+        'boards/{id}/pins'
+
+    Args:
+        path (str): sub-path with in the REST API
+
+    Returns:
+        str: path with all numeric identifiers replaced by ``{id}``
+    """
+    parts = path.strip("/").split("/")
+    return "/".join("{id}" if cur.isdigit() else cur for cur in parts)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
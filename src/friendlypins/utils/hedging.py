@@ -0,0 +1,392 @@
+"""Hedged requests, used to cut the tail latency of idempotent reads"""
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from friendlypins.utils import instrumentation
+
+
+class HedgeDelay(object):
+    """How long a request is given to answer before it is hedged"""
+
+    def __init__(self, percentile=0.95, initial_delay=0.5, min_delay=0.01,
+                 max_delay=5.0):
+        """
+        Args:
+            percentile (float):
+                fraction of requests, between 0 and 1, expected to complete
+                before the hedge delay. Only the slowest remaining requests
+                are hedged.
+            initial_delay (float):
+                hedge delay, in seconds, used until enough requests have
+                been timed
+            min_delay (float): shortest hedge delay, in seconds
+            max_delay (float): longest hedge delay, in seconds
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+
+class HedgeSamples(object):
+    """Number of request latencies the hedge delay is derived from"""
+
+    def __init__(self, min_samples=20, max_samples=200):
+        """
+        Args:
+            min_samples (int):
+                number of requests that must be timed before the delay is
+                derived from their latency
+            max_samples (int):
+                number of recent request latencies the delay is derived from
+        """
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+
+
+class HedgeBudget(object):
+    """Limits on the number of hedges sent"""
+
+    def __init__(self, budget_ratio=0.05, burst=5, reserve=100):
+        """
+        Args:
+            budget_ratio (float):
+                number of hedges each request adds to the budget. For
+                example, 0.05 allows at most one hedge per 20 requests.
+            burst (int):
+                maximum number of hedges held in the budget, and of hedges
+                in flight at once
+            reserve (int):
+                no hedges are sent once the remaining rate limit quota falls
+                below this number of requests
+        """
+        self.budget_ratio = budget_ratio
+        self.burst = burst
+        self.reserve = reserve
+
+
+class _Latencies(object):
+    """Recent latencies of the first attempts of requests"""
+
+    def __init__(self, samples):
+        """
+        Args:
+            samples (HedgeSamples): number of latencies to keep
+        """
+        self._min_samples = samples.min_samples
+        self._values = deque(maxlen=samples.max_samples)
+
+    def add(self, seconds):
+        """Records the latency of a first attempt
+
+        Args:
+            seconds (float): time from sending the request to its completion
+        """
+        self._values.append(seconds)
+
+    def percentile(self, fraction):
+        """Gets a percentile of the recent latencies
+
+        Args:
+            fraction (float): the percentile, between 0 and 1
+
+        Returns:
+            float:
+                the latency, in seconds, or None if too few requests have
+                been timed
+        """
+        if len(self._values) < self._min_samples:
+            return None
+        return instrumentation.percentile(sorted(self._values), fraction)
+
+
+class _BudgetState(object):
+    """Hedges available to send, and hedges in flight"""
+
+    def __init__(self, settings):
+        """
+        Args:
+            settings (HedgeBudget): limits on the number of hedges sent
+        """
+        self.settings = settings
+        self.available = float(settings.burst)
+        self.in_flight = 0
+
+    def earn(self):
+        """Adds the share of a hedge earned by a request to the budget"""
+        self.available = min(
+            float(self.settings.burst),
+            self.available + self.settings.budget_ratio)
+
+    def take(self, remaining):
+        """Charges a hedge to the budget, if one may be sent
+
+        Args:
+            remaining (int):
+                remaining rate limit quota, or None if unknown
+
+        Returns:
+            bool: True if the hedge may be sent
+        """
+        allowed = self.available >= 1 and \
+            self.in_flight < self.settings.burst and (
+                remaining is None or remaining >= self.settings.reserve)
+        if allowed:
+            self.available -= 1
+            self.in_flight += 1
+        return allowed
+
+
+class _HedgeCounts(object):
+    """Counts of the requests sent through a hedge policy"""
+
+    def __init__(self):
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self.denied = 0
+
+
+class _Workers(object):
+    """Worker threads the attempts of hedged requests run on, created when
+    first needed"""
+
+    def __init__(self, max_workers, hedge_workers):
+        """
+        Args:
+            max_workers (int):
+                maximum number of first attempts that may be in flight at
+                once
+            hedge_workers (int):
+                maximum number of hedges that may be in flight at once
+        """
+        self._sizes = {"request": max_workers, "hedge": hedge_workers}
+        self._executors = dict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func):
+        """Runs a function on one of our worker threads, in the context of
+        the caller
+
+        Args:
+            kind (str):
+                "request" to run the first attempt of a request, or "hedge"
+                to run a hedge
+            func (callable): the function to run
+
+        Returns:
+            concurrent.futures.Future: result of the function
+        """
+        with self._lock:
+            executor = self._executors.get(kind)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    self._sizes[kind],
+                    thread_name_prefix="friendlypins-" + kind)
+                self._executors[kind] = executor
+        return executor.submit(contextvars.copy_context().run, func)
+
+    def close(self):
+        """Releases the worker threads"""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors = dict()
+        for executor in executors:
+            executor.shutdown(wait=False)
+
+
+class HedgePolicy(object):
+    """Sends a second copy of a slow read request, and uses whichever
+    response arrives first
+
+    Provide a policy as the ``hedge_policy`` option of an
+    :class:`~friendlypins.api.API` object to hedge its GET requests. When
+    the first attempt has not answered within the hedge delay, a second
+    attempt is sent. The delay adapts to the latency of recent requests, so
+    only the slowest few percent of requests are hedged.
+
+    Every hedge costs an extra API call, so hedges are limited by a budget:
+    each request earns a fraction of a hedge, up to a small burst, and no
+    hedges are sent while the remaining rate limit quota is below a reserve.
+    Requests that are not hedged simply wait for the first attempt.
+
+    Hedges run on their own pool of at most ``burst`` worker threads, as
+    set by the :class:`HedgeBudget`, so they never hold up the first attempt
+    of another request. A slow request is not hedged while every hedge
+    worker is busy.
+
+    Both attempts of a hedged request are real API calls: each one is paced
+    by the rate governor, counted against the rate limit quota and reported
+    to the request hooks, so a quota ledger charges the operation for both.
+
+    Instances are thread safe, and may be shared by several API objects.
+    Call :meth:`close` to release the worker threads once the policy is no
+    longer needed.
+    """
+
+    def __init__(self, delay=None, samples=None, budget=None,
+                 max_workers=8):
+        """
+        Args:
+            delay (HedgeDelay):
+                how long requests are given to answer before they are hedged
+            samples (HedgeSamples):
+                number of request latencies the delay is derived from
+            budget (HedgeBudget): limits on the number of hedges sent
+            max_workers (int):
+                maximum number of first attempts that may be in flight at
+                once
+        """
+        budget = budget or HedgeBudget()
+        self._log = logging.getLogger(__name__)
+        self._delay = delay or HedgeDelay()
+        self._lock = threading.Lock()
+        self._latencies = _Latencies(samples or HedgeSamples())
+        self._budget = _BudgetState(budget)
+        self._counts = _HedgeCounts()
+        self._workers = _Workers(max_workers, budget.burst)
+
+    def close(self):
+        """Releases the worker threads used to send requests"""
+        self._workers.close()
+
+    @property
+    def requests(self):
+        """int: number of requests sent through this policy"""
+        return self._counts.requests
+
+    @property
+    def hedges(self):
+        """int: number of requests a hedge was sent for"""
+        return self._counts.hedges
+
+    @property
+    def wins(self):
+        """int: number of hedges that answered before the first attempt"""
+        return self._counts.wins
+
+    @property
+    def denied(self):
+        """int: number of slow requests that were not hedged because the
+        budget was spent or the rate limit quota was low"""
+        return self._counts.denied
+
+    def reset_stats(self):
+        """Resets the request counters back to zero"""
+        with self._lock:
+            self._counts = _HedgeCounts()
+
+    @property
+    def delay(self):
+        """float: number of seconds to wait for the first attempt before
+        sending a hedge"""
+        with self._lock:
+            value = self._latencies.percentile(self._delay.percentile)
+        if value is None:
+            return self._delay.initial_delay
+        return min(self._delay.max_delay, max(self._delay.min_delay, value))
+
+    def _record(self, seconds):
+        """Records the time taken by a first attempt
+
+        Args:
+            seconds (float): time from sending the request to its completion
+        """
+        with self._lock:
+            self._latencies.add(seconds)
+
+    def _take_budget(self, rate_limit):
+        """Checks whether a hedge may be sent, and charges it to the budget
+
+        Args:
+            rate_limit (RateLimitSnapshot):
+                latest rate limit details reported by the API, or None if
+                unknown
+
+        Returns:
+            bool:
+                True if the hedge may be sent. A hedge worker has then been
+                claimed, and must be handed back once the hedge completes.
+        """
+        remaining = getattr(rate_limit, "rate_remaining", None)
+        with self._lock:
+            allowed = self._budget.take(remaining)
+            if allowed:
+                self._counts.hedges += 1
+            else:
+                self._counts.denied += 1
+        return allowed
+
+    def _submit_hedge(self, func):
+        """Runs a hedge on one of our dedicated hedge worker threads. The
+        caller must have claimed a hedge worker with :meth:`_take_budget`.
+
+        Args:
+            func (callable): the function to run
+
+        Returns:
+            concurrent.futures.Future: result of the function
+        """
+        retval = self._workers.submit("hedge", func)
+        retval.add_done_callback(self._hedge_done)
+        return retval
+
+    def _hedge_done(self, _):
+        """Hands back the hedge worker claimed for a hedge once it
+        completes"""
+        with self._lock:
+            self._budget.in_flight -= 1
+
+    def run(self, send, rate_limit=None):
+        """Sends a request, hedging it if it is slow to answer
+
+        Args:
+            send (callable):
+                function sending one attempt of the request, and returning
+                its response. Must be safe to call twice at once.
+            rate_limit (RateLimitSnapshot):
+                latest rate limit details reported by the API, used to avoid
+                hedging when the quota is low
+
+        Returns:
+            the response from whichever attempt answered first. When an
+            attempt fails without receiving any response, the other attempt
+            is used instead.
+        """
+        with self._lock:
+            self._counts.requests += 1
+            self._budget.earn()
+
+        start = time.perf_counter()
+        first = self._workers.submit("request", send)
+        first.add_done_callback(
+            lambda _: self._record(time.perf_counter() - start))
+        done, _ = wait([first], timeout=self.delay)
+        if done or not self._take_budget(rate_limit):
+            return first.result()
+
+        self._log.debug("Request is slow to answer. Sending a hedge.")
+        hedge = self._submit_hedge(send)
+        pending = [first, hedge]
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for cur in done:
+                err = cur.exception()
+                if err is not None and \
+                        getattr(err, "response", None) is None:
+                    # no answer was received, so wait for the other attempt
+                    error = error or err
+                    continue
+                if cur is hedge:
+                    with self._lock:
+                        self._counts.wins += 1
+                return cur.result()
+        raise error
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,264 @@
+"""Hooks for observing the requests sent to the REST API"""
+import math
+import threading
+from collections import deque
+
+
+class ResponseSummary(object):
+    """Details of the response received for a request"""
+
+    def __init__(self, status):
+        """
+        Args:
+            status (int): HTTP status code of the response
+        """
+        self.status = status
+        self.bytes = None
+        self.rate_limit = None
+        self.rate_remaining = None
+
+
+class RequestEvent(object):
+    """Describes a single HTTP request sent to the REST API
+
+    The same event object is passed to every hook called for a request, and
+    more details are filled in as the request progresses. Fields that are
+    not yet known, or that the API did not report, are None. Once a
+    response is received, its details are held in a :class:`ResponseSummary`
+    and can be read through the properties of the event.
+    """
+
+    def __init__(self, method, path, template):
+        """
+        Args:
+            method (str): name of the HTTP method used (ie: GET, POST)
+            path (str): sub-path with in the REST API the request was sent to
+            template (str):
+                generic form of the path, with object identifiers replaced
+                by placeholders (ie: ``boards/{id}/pins``)
+        """
+        self.method = method
+        self.path = path
+        self.template = template
+        self.latency = None
+        self.error = None
+        self.response = None
+
+    @property
+    def status(self):
+        """int: HTTP status code of the response, or None if no response
+        was received"""
+        return getattr(self.response, "status", None)
+
+    @property
+    def bytes(self):
+        """int: size of the response body"""
+        return getattr(self.response, "bytes", None)
+
+    @property
+    def rate_limit(self):
+        """int: number of requests allowed in each rate limit window, as
+        reported by the response"""
+        return getattr(self.response, "rate_limit", None)
+
+    @property
+    def rate_remaining(self):
+        """int: number of requests left in the current rate limit window,
+        as reported by the response"""
+        return getattr(self.response, "rate_remaining", None)
+
+    def __repr__(self):
+        return "<{0} ({1} {2} {3})>".format(
+            self.__class__.__name__, self.method, self.path, self.status)
+
+
+class _EndpointStats(object):
+    """Running totals for requests sent to a single endpoint"""
+
+    def __init__(self, max_samples):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.statuses = dict()
+        self.samples = deque(maxlen=max_samples)
+
+
+class CallStats(object):
+    """Aggregates statistics about the requests sent to each API endpoint
+
+    Register :meth:`on_response` and :meth:`on_error` as hooks on a
+    :class:`~friendlypins.utils.rest_io.RestIO` object to collect statistics
+    for every request it sends. Requests are grouped by HTTP method and path
+    template, so requests for different objects of the same type are counted
+    together.
+
+    Latency percentiles are calculated from the most recent requests to each
+    endpoint only, so the memory used by this object does not grow with the
+    number of requests sent.
+    """
+
+    def __init__(self, max_samples=1000):
+        """
+        Args:
+            max_samples (int):
+                number of recent request latencies to keep for each endpoint
+        """
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._endpoints = dict()
+        self._rate_remaining = None
+
+    @property
+    def calls(self):
+        """int: total number of requests sent"""
+        with self._lock:
+            return sum(cur.calls for cur in self._endpoints.values())
+
+    @property
+    def errors(self):
+        """int: number of requests that failed"""
+        with self._lock:
+            return sum(cur.errors for cur in self._endpoints.values())
+
+    @property
+    def bytes(self):
+        """int: total number of response bytes received"""
+        with self._lock:
+            return sum(cur.bytes for cur in self._endpoints.values())
+
+    @property
+    def rate_remaining(self):
+        """int: number of requests remaining in the current rate limit
+        window, as reported by the most recent response"""
+        return self._rate_remaining
+
+    def reset_stats(self):
+        """Discards all statistics gathered so far"""
+        with self._lock:
+            self._endpoints = dict()
+            self._rate_remaining = None
+
+    def on_response(self, event):
+        """Hook that records a response received from the API
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        self._record(event)
+
+    def on_error(self, event):
+        """Hook that records a request that failed
+
+        Requests that received a response with an error status were already
+        recorded by :meth:`on_response`, so only requests that failed before
+        a response was received are recorded here.
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        if event.status is None:
+            self._record(event)
+
+    def _record(self, event):
+        """Adds the details of a request to our running totals
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        key = (event.method, event.template)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = _EndpointStats(self._max_samples)
+                self._endpoints[key] = stats
+            stats.calls += 1
+            if event.status is None or event.status >= 400:
+                stats.errors += 1
+            stats.statuses[event.status] = \
+                stats.statuses.get(event.status, 0) + 1
+            if event.bytes:
+                stats.bytes += event.bytes
+            if event.latency is not None:
+                stats.total_latency += event.latency
+                stats.samples.append(event.latency)
+            if event.rate_remaining is not None:
+                self._rate_remaining = event.rate_remaining
+
+    def snapshot(self):
+        """Gets a copy of the statistics gathered so far
+
+        Returns:
+            dict:
+                overall totals, along with a list describing each endpoint.
+                Latencies are reported in seconds.
+        """
+        with self._lock:
+            copies = [
+                (method, template, stats.calls, stats.errors, stats.bytes,
+                 stats.total_latency, dict(stats.statuses),
+                 list(stats.samples))
+                for (method, template), stats in self._endpoints.items()]
+            rate_remaining = self._rate_remaining
+
+        endpoints = list()
+        for method, template, calls, errors, size, total, statuses, samples \
+                in sorted(copies, key=lambda cur: (cur[1], cur[0])):
+            endpoints.append({
+                "method": method,
+                "endpoint": template,
+                "calls": calls,
+                "errors": errors,
+                "bytes": size,
+                "statuses": statuses,
+                "latency": _summarize(samples, total, calls),
+            })
+
+        return {
+            "calls": sum(cur["calls"] for cur in endpoints),
+            "errors": sum(cur["errors"] for cur in endpoints),
+            "bytes": sum(cur["bytes"] for cur in endpoints),
+            "rate_remaining": rate_remaining,
+            "endpoints": endpoints,
+        }
+
+
+def percentile(samples, fraction):
+    """Calculates a percentile of a set of samples, using the nearest rank
+
+    Args:
+        samples (list): sample values, sorted in ascending order
+        fraction (float): percentile to calculate, between 0 and 1
+
+    Returns:
+        the sample at the given percentile, or None if there are no samples
+    """
+    if not samples:
+        return None
+    rank = math.ceil(fraction * len(samples)) - 1
+    return samples[min(max(rank, 0), len(samples) - 1)]
+
+
+def _summarize(samples, total, calls):
+    """Summarizes the latencies of requests sent to an endpoint
+
+    Args:
+        samples (list): latencies of the most recent requests
+        total (float): sum of the latencies of all requests
+        calls (int): total number of requests
+
+    Returns:
+        dict: average, percentile and maximum latencies
+    """
+    samples.sort()
+    return {
+        "mean": total / calls if calls else None,
+        "p50": percentile(samples, 0.5),
+        "p90": percentile(samples, 0.9),
+        "p99": percentile(samples, 0.99),
+        "max": samples[-1] if samples else None,
+    }
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
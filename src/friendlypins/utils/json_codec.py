@@ -0,0 +1,45 @@
+"""Decoding of JSON data returned from the Pinterest REST API
+
+When the optional `orjson <https://github.com/ijl/orjson>`_ package is
+installed it is used to parse response data, which is considerably faster
+than the JSON parser in the standard library for large pages of results.
+Otherwise the standard library parser is used.
+"""
+import json
+
+try:
+    import orjson  # pylint: disable=import-error
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def backend():
+    """Gets the name of the library used to parse JSON data
+
+    Returns:
+        str: either "orjson" or "json"
+    """
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """Parses JSON data
+
+    Args:
+        data (bytes):
+            raw UTF-8 encoded JSON data, as returned in the body of an HTTP
+            response
+
+    Returns:
+        dict: the decoded data
+
+    Raises:
+        ValueError: if the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,209 @@
+"""Detection of hidden per-object round trips to the REST API
+
+Pinterest primitives that were not created from pre-loaded response data
+fetch their data from the API the first time any of their properties are
+read. Reading a property of many such objects in a loop therefore sends one
+request per object, which is easy to miss and quickly exhausts the rate
+limit. An audit records each of these lazy fetches, so code that triggers
+them repeatedly can be found and changed to use pre-loaded data instead.
+
+Example:
+
+    >>> audit = LazyLoadAudit()
+    >>> with API(token, lazy_audit=audit) as api:
+    >>>     for pin_id in pin_ids:
+    >>>         print(api.get_pin_by_id(pin_id).note)
+    >>> print(audit.format_report())
+"""
+import logging
+import os
+import sys
+import threading
+from friendlypins.exceptions import LazyLoadError
+from friendlypins.utils.endpoints import path_template
+
+# folder containing the source code for this library. Frames from files in
+# this folder are skipped when locating the code that triggered a fetch.
+_PACKAGE_FOLDER = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+class CallSite(object):
+    """Location of the code that triggered a lazy fetch"""
+
+    def __init__(self, filename, line, function):
+        """
+        Args:
+            filename (str): source file containing the triggering code
+            line (int): line number of the triggering code
+            function (str): name of the function containing the code
+        """
+        self.filename = filename
+        self.line = line
+        self.function = function
+
+    def __str__(self):
+        return "{0}:{1} ({2})".format(self.filename, self.line, self.function)
+
+
+class LazyFetch(object):
+    """Describes a group of lazy fetches triggered from the same place"""
+
+    def __init__(self, object_type, attribute, template, source):
+        """
+        Args:
+            object_type (str):
+                name of the class of the objects that were loaded
+            attribute (str): name of the property that triggered the fetch
+            template (str): path template of the API endpoint queried
+            source (CallSite): location of the triggering code
+        """
+        self.object_type = object_type
+        self.attribute = attribute
+        self.template = template
+        self.source = source
+        self.count = 0
+        self.paths = list()
+
+    @property
+    def call_site(self):
+        """str: location of the code that triggered the fetches"""
+        return str(self.source)
+
+    def __str__(self):
+        return "{0} x {1}.{2} from {3} (GET {4})".format(
+            self.count, self.object_type, self.attribute, self.call_site,
+            self.template)
+
+    def __repr__(self):
+        return "<{0} ({1})>".format(self.__class__.__name__, self)
+
+
+class LazyLoadAudit(object):
+    """Records the lazy fetches made by Pinterest primitives
+
+    Fetches are grouped by the type of object loaded, the property that
+    triggered the fetch and the code that read the property. Groups with at
+    least ``threshold`` fetches are reported as repeated patterns, and a
+    warning is logged the first time each group reaches the threshold. In
+    strict mode, a :class:`~friendlypins.exceptions.LazyLoadError` is raised
+    instead, before the fetch that reaches the threshold is sent.
+    """
+
+    def __init__(self, threshold=2, strict=False, max_paths=10):
+        """
+        Args:
+            threshold (int):
+                number of fetches from the same place that is considered a
+                repeated pattern
+            strict (bool):
+                True to raise an error when a repeated pattern is detected
+            max_paths (int):
+                number of example object paths to keep for each group
+        """
+        self._log = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._threshold = threshold
+        self._strict = strict
+        self._max_paths = max_paths
+        self._groups = dict()
+        self._fetches = 0
+
+    @property
+    def threshold(self):
+        """int: number of fetches considered a repeated pattern"""
+        return self._threshold
+
+    @property
+    def strict(self):
+        """bool: True if repeated patterns raise an error"""
+        return self._strict
+
+    @property
+    def fetches(self):
+        """int: total number of lazy fetches recorded"""
+        return self._fetches
+
+    def clear(self):
+        """Discards all fetches recorded so far"""
+        with self._lock:
+            self._groups = dict()
+            self._fetches = 0
+
+    def record(self, obj, path):
+        """Records a lazy fetch that is about to be made
+
+        Must be called directly from the property that loads the object
+        data, so the property that triggered the fetch can be identified.
+
+        Args:
+            obj (BaseObject): the object being loaded
+            path (str): sub-path with in the REST API for the object
+        """
+        # pylint: disable=protected-access
+        frame = sys._getframe(2)
+        attribute = frame.f_code.co_name
+        while frame is not None and \
+                frame.f_code.co_filename.startswith(_PACKAGE_FOLDER):
+            frame = frame.f_back
+        if frame is None:
+            source = CallSite("<unknown>", 0, "<unknown>")
+        else:
+            source = CallSite(
+                frame.f_code.co_filename, frame.f_lineno,
+                frame.f_code.co_name)
+
+        object_type = type(obj).__name__
+        key = (object_type, attribute, source.filename, source.line)
+        with self._lock:
+            self._fetches += 1
+            group = self._groups.get(key)
+            if group is None:
+                group = LazyFetch(
+                    object_type, attribute, path_template(path), source)
+                self._groups[key] = group
+            group.count += 1
+            if len(group.paths) < self._max_paths:
+                group.paths.append(path)
+            repeated = group.count >= self._threshold
+            first = group.count == self._threshold
+
+        if repeated and self._strict:
+            raise LazyLoadError(group)
+        if first:
+            self._log.warning(
+                "Repeated lazy loading detected: %s.%s is loaded one "
+                "object at a time from %s",
+                object_type, attribute, group.call_site)
+
+    def report(self):
+        """Gets the repeated lazy fetch patterns detected so far
+
+        Returns:
+            list (LazyFetch):
+                groups with at least :attr:`threshold` fetches, largest
+                first
+        """
+        with self._lock:
+            groups = [cur for cur in self._groups.values()
+                      if cur.count >= self._threshold]
+        return sorted(groups, key=lambda cur: cur.count, reverse=True)
+
+    def format_report(self):
+        """Describes the repeated lazy fetch patterns detected so far
+
+        Returns:
+            str: human readable report, one line per pattern
+        """
+        groups = self.report()
+        if not groups:
+            return "No repeated lazy loading detected ({0} fetches)".format(
+                self._fetches)
+        lines = ["Repeated lazy loading detected ({0} fetches):".format(
+            self._fetches)]
+        lines.extend("  {0}".format(cur) for cur in groups)
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,452 @@
+"""Metrics describing the activity of the library, in OpenMetrics format
+
+Example:
+
+    >>> metrics = ClientMetrics()
+    >>> with MetricsServer(metrics, port=9100):
+    >>>     with API(token, metrics=metrics) as api:
+    >>>         for board in api.user.boards:
+    >>>             ...
+
+The metrics can then be scraped from ``http://127.0.0.1:9100/metrics``, or
+written to a file periodically with :meth:`ClientMetrics.write` for a
+collector to pick up. No external services or libraries are required.
+"""
+import bisect
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# MIME type for the OpenMetrics text format
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# upper bounds, in seconds, of the default request latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    """Escapes a label value for use in the OpenMetrics text format
+
+    Args:
+        value: label value
+
+    Returns:
+        str: escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace(
+        "\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    """Converts a set of metric labels to text
+
+    Args:
+        labels (tuple): pairs of label names and values
+
+    Returns:
+        str: labels in OpenMetrics format, or an empty string if there are
+        none
+    """
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        "{0}=\"{1}\"".format(name, _escape(value))
+        for name, value in labels) + "}"
+
+
+def _format_value(value):
+    """Converts a sample value to text
+
+    Args:
+        value (int or float): value of the sample
+
+    Returns:
+        str: value in OpenMetrics format
+    """
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return "{0:.1f}".format(value)
+    return repr(value)
+
+
+def _endpoint_labels(key):
+    """Generates the labels identifying an API endpoint
+
+    Args:
+        key (tuple): HTTP method and path template of the endpoint
+
+    Returns:
+        tuple: name and value of each label
+    """
+    return (("method", key[0]), ("endpoint", key[1]))
+
+
+class _Histogram(object):
+    """Counts of observed values that fall in each of a set of buckets"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        """Adds a value to the bucket it falls in"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class _EndpointMetrics(object):
+    """Metrics tracked separately for each API endpoint, keyed by HTTP
+    method and path template"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # also keyed by the status code of the response
+        self.requests = dict()
+        self.latency = dict()
+        self.response_bytes = dict()
+        self.failures = dict()
+        self.retries = dict()
+
+    @staticmethod
+    def increment(counts, key, amount=1):
+        """Adds to one of the counters in a metric
+
+        Args:
+            counts (dict): counters of the metric
+            key (tuple): counter to add to
+            amount (int): value to add
+        """
+        counts[key] = counts.get(key, 0) + amount
+
+
+class _TotalMetrics(object):
+    """Metrics tracked for all requests combined"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.rate_limit = None
+        self.rate_remaining = None
+        self.downloads = 0
+        self.download_bytes = 0
+
+
+class ClientMetrics(object):
+    """Collects metrics describing the requests sent to the REST API
+
+    Provide an instance of this class as the ``metrics`` option of an
+    :class:`~friendlypins.api.API` or
+    :class:`~friendlypins.utils.rest_io.RestIO` object to track all requests
+    it sends. One instance may be shared by several API objects, in which
+    case their metrics are combined.
+
+    Counters for cache hits and misses are read from the response caches of
+    the tracked objects, and are reset along with the statistics of those
+    caches.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="friendlypins"):
+        """
+        Args:
+            buckets (tuple):
+                upper bounds of the request latency histogram buckets, in
+                seconds
+            prefix (str): prefix added to the name of every metric
+        """
+        self._lock = threading.Lock()
+        self._prefix = prefix
+        self._sources = list()
+        self._endpoints = _EndpointMetrics(tuple(sorted(buckets)))
+        self._totals = _TotalMetrics()
+
+    def attach(self, rest_io):
+        """Starts tracking the requests sent by a REST API interface
+
+        Args:
+            rest_io (RestIO): interface to track
+        """
+        rest_io.add_hooks(
+            on_request=self.on_request,
+            on_response=self.on_response,
+            on_error=self.on_error,
+            on_retry=self.on_retry)
+        with self._lock:
+            self._sources.append(rest_io)
+
+    @property
+    def in_flight(self):
+        """int: number of requests currently waiting on a response"""
+        return self._totals.in_flight
+
+    def on_request(self, event):  # pylint: disable=unused-argument
+        """Hook called before a request is sent
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        with self._lock:
+            self._totals.in_flight += 1
+
+    def on_response(self, event):
+        """Hook called when a response is received
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        endpoint = (event.method, event.template)
+        with self._lock:
+            self._totals.in_flight -= 1
+            key = endpoint + (event.status,)
+            metrics = self._endpoints
+            metrics.increment(metrics.requests, key)
+            histogram = metrics.latency.get(endpoint)
+            if histogram is None:
+                histogram = _Histogram(metrics.buckets)
+                metrics.latency[endpoint] = histogram
+            histogram.observe(event.latency)
+            if event.bytes:
+                metrics.increment(
+                    metrics.response_bytes, endpoint, event.bytes)
+            if event.status == 429:
+                self._totals.rate_limited += 1
+            if event.rate_limit is not None:
+                self._totals.rate_limit = event.rate_limit
+            if event.rate_remaining is not None:
+                self._totals.rate_remaining = event.rate_remaining
+
+    def on_error(self, event):
+        """Hook called when a request fails
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        if event.status is not None:
+            # already counted when the response was received
+            return
+        endpoint = (event.method, event.template)
+        with self._lock:
+            self._totals.in_flight -= 1
+            self._endpoints.increment(self._endpoints.failures, endpoint)
+
+    def on_retry(self, event):
+        """Hook called when a failed request is about to be retried
+
+        Args:
+            event (RequestEvent): details of the failed request
+        """
+        endpoint = (event.method, event.template)
+        with self._lock:
+            self._endpoints.increment(self._endpoints.retries, endpoint)
+
+    def add_download(self, size):
+        """Records a file downloaded outside of the REST API, such as a
+        thumbnail image
+
+        Args:
+            size (int): number of bytes downloaded
+        """
+        with self._lock:
+            self._totals.downloads += 1
+            self._totals.download_bytes += size
+
+    def _histogram_samples(self, latency):
+        """Generates the samples of the request latency histogram
+
+        Args:
+            latency (list of tuple):
+                endpoint, bucket counts and total latency of each endpoint
+
+        Returns:
+            list (tuple): sample name suffix, labels and value of each sample
+        """
+        samples = list()
+        bounds = self._endpoints.buckets + (float("inf"),)
+        for key, counts, total in latency:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                samples.append((
+                    "_bucket",
+                    _endpoint_labels(key) + (("le", _format_value(bound)),),
+                    cumulative))
+            samples.append(("_count", _endpoint_labels(key), cumulative))
+            samples.append(("_sum", _endpoint_labels(key), total))
+        return samples
+
+    def _families(self):
+        """Gathers the current value of every metric
+
+        Returns:
+            list (tuple):
+                name, type, help text and samples of each metric family.
+                Each sample is a tuple of the sample name suffix, labels
+                and value.
+        """
+        with self._lock:
+            requests = sorted(self._endpoints.requests.items())
+            latency = sorted(
+                (key, list(value.counts), value.total)
+                for key, value in self._endpoints.latency.items())
+            response_bytes = sorted(self._endpoints.response_bytes.items())
+            failures = sorted(self._endpoints.failures.items())
+            retries = sorted(self._endpoints.retries.items())
+            gauges = (self._totals.in_flight, self._totals.rate_limit,
+                      self._totals.rate_remaining)
+            counters = (self._totals.rate_limited, self._totals.downloads,
+                        self._totals.download_bytes)
+            caches = [cur.options.cache for cur in self._sources
+                      if cur.options.cache is not None]
+
+        histogram = self._histogram_samples(latency)
+
+        families = [
+            ("requests", "counter", "HTTP requests that received a response",
+             [("_total", _endpoint_labels(key) + (("status", key[2]),), value)
+              for key, value in requests]),
+            ("request_duration_seconds", "histogram",
+             "Time taken to receive a response from the API", histogram),
+            ("requests_in_flight", "gauge",
+             "HTTP requests waiting on a response", [("", (), gauges[0])]),
+            ("request_failures", "counter",
+             "HTTP requests that failed without receiving a response",
+             [("_total", _endpoint_labels(key), value)
+              for key, value in failures]),
+            ("retries", "counter", "Failed HTTP requests that were retried",
+             [("_total", _endpoint_labels(key), value)
+              for key, value in retries]),
+            ("rate_limited", "counter",
+             "HTTP requests rejected by the API rate limiter",
+             [("_total", (), counters[0])]),
+            ("response_bytes", "counter",
+             "Bytes of response data received from the API",
+             [("_total", _endpoint_labels(key), value)
+              for key, value in response_bytes]),
+            ("cache_hits", "counter",
+             "API queries answered from the response cache",
+             [("_total", (), sum(cur.hits for cur in caches))]),
+            ("cache_misses", "counter",
+             "API queries not found in the response cache",
+             [("_total", (), sum(cur.misses for cur in caches))]),
+            ("downloads", "counter",
+             "Files, such as thumbnails, downloaded outside of the API",
+             [("_total", (), counters[1])]),
+            ("download_bytes", "counter",
+             "Bytes of file data downloaded outside of the API",
+             [("_total", (), counters[2])]),
+        ]
+        if gauges[1] is not None:
+            families.append((
+                "rate_limit", "gauge",
+                "Requests allowed by the API in each rate limit window",
+                [("", (), gauges[1])]))
+        if gauges[2] is not None:
+            families.append((
+                "rate_limit_remaining", "gauge",
+                "Requests remaining in the current rate limit window",
+                [("", (), gauges[2])]))
+        return families
+
+    def exposition(self):
+        """Renders the current value of every metric
+
+        Returns:
+            str: metrics in the OpenMetrics text format
+        """
+        lines = list()
+        for name, kind, description, samples in self._families():
+            name = "{0}_{1}".format(self._prefix, name)
+            lines.append("# TYPE {0} {1}".format(name, kind))
+            lines.append("# HELP {0} {1}".format(name, description))
+            for suffix, labels, value in samples:
+                lines.append("{0}{1}{2} {3}".format(
+                    name, suffix, _format_labels(labels),
+                    _format_value(value)))
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes the current value of every metric to a text file
+
+        The file is replaced atomically, so a collector reading the file
+        never sees partially written data.
+
+        Args:
+            path (str): path of the file to write
+        """
+        folder = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as output:
+                output.write(self.exposition())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the metrics gathered by a :class:`ClientMetrics` object"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handles HTTP GET requests"""
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Suppresses per-request logging"""
+
+
+class MetricsServer(object):
+    """Serves metrics over HTTP on a background thread, for scraping by a
+    monitoring system"""
+
+    def __init__(self, metrics, port=0, host="127.0.0.1"):
+        """
+        Args:
+            metrics (ClientMetrics): metrics to serve
+            port (int):
+                TCP port to listen on. Defaults to a random free port.
+            host (str): network interface to listen on
+        """
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = metrics
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        """str: URL the metrics are served from"""
+        host, port = self._server.server_address[:2]
+        return "http://{0}:{1}/metrics".format(host, port)
+
+    def start(self):
+        """Starts serving metrics"""
+        self._thread.start()
+
+    def stop(self):
+        """Stops serving metrics and releases the listening socket"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
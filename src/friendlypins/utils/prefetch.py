@@ -0,0 +1,115 @@
+"""Background loading of paged results from the REST API"""
+import contextvars
+import logging
+import queue
+import threading
+
+# how often, in seconds, a blocked background thread checks whether the
+# consumer has stopped iterating
+_POLL_INTERVAL = 0.1
+
+
+class _Failure(object):
+    """Wraps an error raised while loading results, so it can be re-raised
+    on the consumer's thread"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+# marker placed in the queue once the source has no more results
+_DONE = object()
+
+
+def prefetch(source, depth):
+    """Consumes an iterator on a background thread, keeping up to a fixed
+    number of results ready ahead of the caller
+
+    This is used to hide the latency of loading paged results behind the
+    work the caller does with each page. As soon as one page has been
+    loaded the next one is requested, while the caller is still busy with
+    the first. At most ``depth`` results are ever loaded ahead of the
+    caller, counting any result still being loaded.
+
+    If the source raises an error it is re-raised to the caller once all
+    results loaded before the error have been consumed. When the caller
+    stops iterating early, the background thread stops loading results too.
+
+    Example:
+
+        >>> for page in prefetch(rest_io.get_pages("me/pins"), 2):
+        >>>     process(page)
+
+    Args:
+        source (iterator): iterator producing the results
+        depth (int):
+            maximum number of results to load ahead of the caller. Must be
+            at least 1.
+
+    Yields:
+        results produced by the source iterator, in order
+    """
+    if depth < 1:
+        raise ValueError("Prefetch depth must be at least 1")
+    source = iter(source)
+
+    log = logging.getLogger(__name__)
+    results = queue.Queue()
+    # one slot for every result that may be loaded ahead of the caller. A
+    # slot is claimed before each result is requested from the source, and
+    # handed back once the caller has taken the result.
+    slots = threading.Semaphore(depth)
+    stopped = threading.Event()
+
+    def claim_slot():
+        """Waits for room to load another result, giving up if the consumer
+        has stopped
+
+        Returns:
+            bool: True if a slot was claimed
+        """
+        while not stopped.is_set():
+            # the slot is released by the consumer, not by this thread
+            # pylint: disable=consider-using-with
+            if slots.acquire(timeout=_POLL_INTERVAL):
+                return True
+        return False
+
+    def worker():
+        try:
+            while claim_slot():
+                try:
+                    item = next(source)
+                except StopIteration:
+                    results.put(_DONE)
+                    return
+                results.put(item)
+            log.debug("Prefetching stopped by the consumer")
+        except Exception as err:  # pylint: disable=broad-except
+            results.put(_Failure(err))
+        finally:
+            close = getattr(source, "close", None)
+            if close:
+                close()
+
+    # results are loaded on behalf of the caller, in the caller's context
+    thread = threading.Thread(
+        target=contextvars.copy_context().run, args=(worker,),
+        name="friendlypins-prefetch")
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            slots.release()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,306 @@
+"""Persistent record of the API calls that consumed the rate limit quota"""
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from dateutil import tz
+
+
+class QuotaProjection(object):
+    """Estimate of when the rate limit quota will run out"""
+
+    def __init__(self, remaining, calls_per_hour, seconds_left, now):
+        """
+        Args:
+            remaining (int):
+                number of requests left in the current rate limit window, as
+                last reported by the API, or None if unknown
+            calls_per_hour (float): current burn rate
+            seconds_left (float):
+                seconds until the quota runs out at the current burn rate,
+                or None if it is not being consumed
+            now (float): time the projection was made, in seconds since
+                the epoch
+        """
+        self.remaining = remaining
+        self.calls_per_hour = calls_per_hour
+        self.seconds_left = seconds_left
+        self._now = now
+
+    @property
+    def exhausted_at(self):
+        """datetime.datetime: time, in the current locale, when the quota
+        is projected to run out, or None if it is not being consumed"""
+        if self.seconds_left is None:
+            return None
+        start = datetime.fromtimestamp(self._now, tz=tz.tzlocal())
+        return start + timedelta(seconds=self.seconds_left)
+
+    def __repr__(self):
+        return "<{0} ({1} remaining, {2:.0f} calls/hour)>".format(
+            self.__class__.__name__, self.remaining, self.calls_per_hour)
+
+
+class _OperationLabels(object):
+    """Labels of the operations in progress in the current context"""
+
+    def __init__(self, default, name):
+        """
+        Args:
+            default (str): label used outside of any labelled operation
+            name (str): name of the context variable holding the labels
+        """
+        self.default = default
+        self._labels = contextvars.ContextVar(name, default=())
+
+    @property
+    def current(self):
+        """str: innermost label of the current context"""
+        labels = self._labels.get()
+        if labels:
+            return labels[-1]
+        return self.default
+
+    @contextmanager
+    def push(self, label):
+        """Context manager that makes a label the current one until the
+        block exits
+
+        Args:
+            label (str): name of the operation
+        """
+        token = self._labels.set(self._labels.get() + (label,))
+        try:
+            yield
+        finally:
+            self._labels.reset(token)
+
+
+class QuotaLedger(object):
+    """Records every API call, tagged with the operation that made it, in a
+    local SQLite database
+
+    Provide a ledger as the ``quota_ledger`` option of an
+    :class:`~friendlypins.api.API` object to record the calls it makes. Every
+    request that received a response is recorded, since those are the ones
+    counted against the rate limit. The ledger may be shared by several
+    processes, to see which of them is consuming the quota.
+
+    Calls are tagged with the innermost label passed to :meth:`operation` in
+    the context that sent the request, or the default operation of the
+    ledger for requests made outside of any labelled block. Labels follow
+    requests sent on behalf of the caller from background threads, such as
+    prefetched pages, bulk operations and the asyncio client.
+
+    Example:
+
+        >>> with QuotaLedger("~/.friendlypins/ledger.db") as ledger:
+        >>>     with API(token, quota_ledger=ledger) as api:
+        >>>         with ledger.operation("nightly-crawl"):
+        >>>             crawl(api)
+        >>>     print(ledger.hourly_usage())
+    """
+
+    # Name of the environment variable that may be used to enable the ledger
+    # for the fpins console application
+    ENV_VAR = "FRIENDLYPINS_LEDGER"
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS calls (
+            time REAL NOT NULL,
+            operation TEXT NOT NULL,
+            method TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            status INTEGER,
+            rate_remaining INTEGER
+        )
+    """
+
+    def __init__(self, filename=":memory:", default_operation="default",
+                 flush_size=50, clock=time.time):
+        """
+        Args:
+            filename (str):
+                path to the database file. The file, and the folder it is in,
+                will be created if necessary. Defaults to a database held
+                in memory.
+            default_operation (str):
+                label for calls made outside of any labelled operation
+            flush_size (int):
+                number of calls buffered in memory before they are written
+                to the database
+            clock (callable):
+                function returning the current time, in seconds since the
+                epoch. Overridable for testing.
+        """
+        self._filename = filename
+        if filename != ":memory:":
+            self._filename = os.path.expanduser(filename)
+            folder = os.path.dirname(self._filename)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+        self._flush_size = flush_size
+        self._clock = clock
+        self._operations = _OperationLabels(
+            default_operation, "friendlypins_ledger_{0:x}".format(id(self)))
+        self._pending = list()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self._filename, check_same_thread=False)
+        with self._db:
+            self._db.execute(self._schema)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS calls_time ON calls (time)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def filename(self):
+        """str: path to the database file"""
+        return self._filename
+
+    def close(self):
+        """Writes any buffered calls and closes the database"""
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+    def attach(self, rest_io):
+        """Starts recording the calls made by a REST API interface
+
+        Args:
+            rest_io (RestIO): interface to track
+        """
+        rest_io.add_hooks(on_response=self.on_response)
+
+    @property
+    def current_operation(self):
+        """str: label applied to calls made from the current context"""
+        return self._operations.current
+
+    @contextmanager
+    def operation(self, label):
+        """Context manager that tags every call made from the current context
+        with a label, until the block exits
+
+        Args:
+            label (str): name of the operation
+        """
+        with self._operations.push(label):
+            yield self
+
+    def on_response(self, event):
+        """Hook that records a call to the API
+
+        Args:
+            event (RequestEvent): details of the request
+        """
+        row = (self._clock(), self.current_operation, event.method,
+               event.template, event.status, event.rate_remaining)
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) < self._flush_size:
+                return
+            self._write()
+
+    def flush(self):
+        """Writes all buffered calls to the database"""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        """Writes buffered calls to the database. Must be called with our
+        lock held."""
+        if not self._pending:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+        self._pending = list()
+
+    def _query(self, sql, params=()):
+        """Runs a query against the ledger, including all buffered calls
+
+        Args:
+            sql (str): query to run
+            params (tuple): parameters for the query
+
+        Returns:
+            list (tuple): rows returned from the query
+        """
+        with self._lock:
+            self._write()
+            return self._db.execute(sql, params).fetchall()
+
+    def hourly_usage(self, hours=24):
+        """Counts the calls made by each operation in each hour
+
+        Args:
+            hours (int): number of most recent hours to report on
+
+        Returns:
+            list (tuple):
+                start of the hour, as a datetime in the current locale, the
+                operation name and the number of calls made, ordered by time
+                and then by operation
+        """
+        since = (int(self._clock() // 3600) - hours + 1) * 3600
+        rows = self._query(
+            "SELECT CAST(time / 3600 AS INTEGER) * 3600 AS hour, "
+            "operation, COUNT(*) FROM calls WHERE time >= ? "
+            "GROUP BY hour, operation ORDER BY hour, operation", (since,))
+        return [
+            (datetime.fromtimestamp(hour, tz=tz.tzlocal()), operation, count)
+            for hour, operation, count in rows]
+
+    def usage_by_operation(self, seconds=3600):
+        """Counts the calls made by each operation recently
+
+        Args:
+            seconds (float): length of the period to report on
+
+        Returns:
+            dict: number of calls made by each operation
+        """
+        rows = self._query(
+            "SELECT operation, COUNT(*) FROM calls WHERE time > ? "
+            "GROUP BY operation", (self._clock() - seconds,))
+        return dict(rows)
+
+    def projection(self, window=900):
+        """Projects when the rate limit quota will run out, if calls keep
+        being made at the rate they were made recently
+
+        Args:
+            window (float):
+                number of seconds of recent calls used to measure the burn
+                rate
+
+        Returns:
+            QuotaProjection: the projection
+        """
+        now = self._clock()
+        count = self._query(
+            "SELECT COUNT(*) FROM calls WHERE time > ?",
+            (now - window,))[0][0]
+        latest = self._query(
+            "SELECT rate_remaining FROM calls "
+            "WHERE rate_remaining IS NOT NULL "
+            "ORDER BY time DESC, rowid DESC LIMIT 1")
+        remaining = latest[0][0] if latest else None
+
+        calls_per_hour = count * 3600.0 / window
+        seconds_left = None
+        if count and remaining is not None:
+            seconds_left = remaining * window / float(count)
+        return QuotaProjection(remaining, calls_per_hour, seconds_left, now)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
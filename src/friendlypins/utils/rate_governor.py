@@ -0,0 +1,199 @@
+"""Request pacing based on the rate limit details reported by the REST API"""
+import logging
+import threading
+import time
+from datetime import datetime
+from dateutil import tz
+
+
+class _TokenBucket(object):
+    """Request tokens available to a :class:`RateGovernor`
+
+    Not thread safe: the governor guards the bucket with its own lock.
+    """
+
+    def __init__(self, capacity, now):
+        """
+        Args:
+            capacity (int): maximum number of tokens held in the bucket
+            now (float): current time, from the clock of the governor
+        """
+        self.capacity = capacity
+        # Rate is unknown until we see our first response, in which case
+        # requests are allowed through unchecked
+        self.rate = None
+        self.tokens = float(capacity)
+        self.last_refill = now
+        self.blocked_until = None
+        self.total_delay = 0.0
+
+    def refill(self, now):
+        """Adds the tokens accumulated since the last refill to the bucket
+
+        Args:
+            now (float): current time, from the clock of the governor
+        """
+        if self.rate:
+            elapsed = now - self.last_refill
+            self.tokens = min(
+                float(self.capacity), self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def take(self, now):
+        """Takes a token for the next request
+
+        Args:
+            now (float): current time, from the clock of the governor
+
+        Returns:
+            float: number of seconds the request must be delayed by
+        """
+        if self.blocked_until is not None:
+            # Quota is spent: hold everyone until the refresh time, then
+            # let requests through until new rate limits are reported
+            delay = max(0.0, self.blocked_until - now)
+            if delay == 0.0:
+                self.blocked_until = None
+                self.rate = None
+        elif self.rate is None:
+            delay = 0.0
+        else:
+            self.refill(now)
+            self.tokens -= 1.0
+            delay = max(0.0, -self.tokens / self.rate)
+        self.total_delay += delay
+        return delay
+
+
+class RateGovernor(object):
+    """Token bucket that spaces out API requests so the hourly quota lasts
+    until the next rate limit refresh
+
+    After every response the governor reads the ``X-Ratelimit-*`` headers and
+    recomputes the rate at which new tokens are added to the bucket: the
+    remaining quota, less a reserve floor, spread evenly over the time left
+    until the quota refreshes (or until the target finish time, if that comes
+    first). Every request consumes one token. Requests made while the bucket
+    is empty block until the next token becomes available, so a long crawl
+    runs at an even pace instead of stopping dead half way through.
+
+    Instances are thread safe, and may be shared by several
+    :class:`~friendlypins.utils.rest_io.RestIO` objects that use the same
+    authentication token.
+    """
+
+    def __init__(self, burst=10, reserve=0, target_finish=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            burst (int):
+                maximum number of requests that may be sent back to back
+                without any delay, after a period of inactivity
+            reserve (int):
+                number of requests from the hourly quota that the governor
+                will never spend, leaving them for other, interactive, uses
+                of the same token
+            target_finish (datetime.datetime):
+                optional time by which the remaining quota should be spent.
+                When not provided, or when it comes after the next rate limit
+                refresh, requests are spread out until the refresh time.
+            clock (callable):
+                monotonic time source, in seconds. Overridable for testing.
+            sleep (callable):
+                method used to wait between requests. Overridable for testing.
+        """
+        self._log = logging.getLogger(__name__)
+        self._reserve = reserve
+        self._target_finish = target_finish
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._bucket = _TokenBucket(burst, clock())
+
+    @property
+    def burst(self):
+        """int: maximum number of requests sent back to back without delay"""
+        return self._bucket.capacity
+
+    @property
+    def reserve(self):
+        """int: number of requests from the quota held back by the governor"""
+        return self._reserve
+
+    @property
+    def target_finish(self):
+        """datetime.datetime: time by which the remaining quota should be
+        spent, or None to pace requests until the next rate limit refresh"""
+        return self._target_finish
+
+    @property
+    def rate(self):
+        """float: number of requests per second currently permitted, or None
+        if no rate limit details have been received yet"""
+        return self._bucket.rate
+
+    @property
+    def total_delay(self):
+        """float: total number of seconds requests have been delayed"""
+        return self._bucket.total_delay
+
+    def acquire(self):
+        """Blocks until the next API request is allowed to be sent
+
+        Returns:
+            float: number of seconds the caller was delayed
+        """
+        with self._lock:
+            delay = self._bucket.take(self._clock())
+
+        if delay:
+            self._log.debug("Delaying API request by %.2f seconds", delay)
+            self._sleep(delay)
+        return delay
+
+    def update(self, headers):
+        """Recomputes the request rate from the headers of an API response
+
+        Args:
+            headers (Headers): parsed headers from the most recent response
+        """
+        try:
+            remaining = headers.rate_remaining
+            seconds_left = headers.seconds_to_refresh
+        except (KeyError, ValueError):
+            # response did not carry rate limit details, so we keep pacing
+            # based on the last details we received
+            return
+        if seconds_left is None:
+            return
+
+        if self._target_finish is not None:
+            now = datetime.now(tz=tz.tzutc())
+            target = (self._target_finish - now).total_seconds()
+            seconds_left = min(seconds_left, max(target, 0))
+
+        budget = remaining - self._reserve
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket
+            bucket.refill(now)
+            if budget <= 0:
+                bucket.blocked_until = now + headers.seconds_to_refresh
+                bucket.tokens = 0.0
+                self._log.debug(
+                    "Request quota exhausted. Pausing for %s seconds",
+                    headers.seconds_to_refresh)
+                return
+
+            bucket.blocked_until = None
+            if seconds_left <= 0:
+                # nothing to pace against: spend the remaining budget freely
+                bucket.rate = None
+                return
+            bucket.rate = budget / float(seconds_left)
+            # never allow a burst larger than what is left in our budget
+            bucket.tokens = min(bucket.tokens, float(budget))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
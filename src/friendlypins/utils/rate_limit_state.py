@@ -0,0 +1,218 @@
+"""Shared record of the rate limit details reported by the REST API"""
+import threading
+import time
+from datetime import datetime, timedelta
+from dateutil import tz
+
+
+class Observation(object):
+    """When a set of rate limit details was received, and how long they
+    stay current"""
+
+    def __init__(self, observed_at=None, max_age=60.0, clock=time.monotonic):
+        """
+        Args:
+            observed_at (float):
+                time the response was received, according to our clock, or
+                None if no response has been received yet
+            max_age (float):
+                number of seconds after which the details are considered
+                stale
+            clock (callable):
+                monotonic time source, in seconds. Overridable for testing.
+        """
+        self.observed_at = observed_at
+        self.max_age = max_age
+        self.clock = clock
+
+    @property
+    def age(self):
+        """float: number of seconds since the details were received, or None
+        if no response has been received yet"""
+        if self.observed_at is None:
+            return None
+        return self.clock() - self.observed_at
+
+
+class RateLimitSnapshot(object):
+    """Rate limit details reported by a single API response
+
+    Snapshots are immutable, so they may be safely passed between threads.
+    """
+
+    def __init__(self, rate_limit=None, rate_remaining=None,
+                 time_to_refresh=None, observation=None):
+        """
+        Args:
+            rate_limit (int):
+                number of requests allowed in each rate limit window, or
+                None if unknown
+            rate_remaining (int):
+                number of requests left in the current window, or None if
+                unknown
+            time_to_refresh (datetime.datetime):
+                time when the current window ends, or None if unknown
+            observation (Observation):
+                when the details were received. Defaults to details that
+                have not been received yet.
+        """
+        self._rate_limit = rate_limit
+        self._rate_remaining = rate_remaining
+        self._time_to_refresh = time_to_refresh
+        self._observation = observation or Observation()
+
+    def __repr__(self):
+        return "<{0} ({1}/{2} remaining)>".format(
+            self.__class__.__name__, self._rate_remaining, self._rate_limit)
+
+    @property
+    def known(self):
+        """bool: True if any rate limit details have been received"""
+        return self._observation.observed_at is not None
+
+    @property
+    def rate_limit(self):
+        """int: number of requests allowed in each rate limit window, or None
+        if unknown"""
+        return self._rate_limit
+
+    @property
+    def rate_remaining(self):
+        """int: number of requests left in the current window when the
+        response was received, or None if unknown"""
+        return self._rate_remaining
+
+    @property
+    def time_to_refresh(self):
+        """datetime.datetime: time, in the current locale, when the current
+        window ends, or None if unknown"""
+        return self._time_to_refresh
+
+    @property
+    def age(self):
+        """float: number of seconds since the details were received, or None
+        if no response has been received yet"""
+        return self._observation.age
+
+    @property
+    def stale(self):
+        """bool: True if the details are missing, older than our maximum age,
+        or describe a rate limit window that has since ended"""
+        if not self.known or self.age > self._observation.max_age:
+            return True
+        return self.expired
+
+    @property
+    def expired(self):
+        """bool: True if the rate limit window the details describe has
+        ended, so the full quota is available again"""
+        if self._time_to_refresh is None:
+            return False
+        return datetime.now(tz=tz.tzlocal()) >= self._time_to_refresh
+
+
+class RateLimitState(object):
+    """Thread safe record of the most recent rate limit details reported by
+    the API
+
+    Every :class:`~friendlypins.utils.rest_io.RestIO` object updates its
+    state from the headers of each response it receives, so the remaining
+    quota can be checked at any time without sending a request. Readers
+    never block: :meth:`snapshot` returns the details from the latest
+    response, which are replaced as a whole when a new response arrives.
+    """
+
+    def __init__(self, max_age=60.0, clock=time.monotonic):
+        """
+        Args:
+            max_age (float):
+                number of seconds after which rate limit details are
+                reported as stale
+            clock (callable):
+                monotonic time source, in seconds. Overridable for testing.
+        """
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._updates = 0
+        self._snapshot = RateLimitSnapshot(
+            observation=Observation(max_age=max_age, clock=clock))
+
+    @property
+    def updates(self):
+        """int: number of responses the state has been updated from"""
+        return self._updates
+
+    def snapshot(self):
+        """Gets the most recent rate limit details
+
+        Returns:
+            RateLimitSnapshot: the details, without waiting for any updates
+            in progress
+        """
+        return self._snapshot
+
+    def update(self, headers):
+        """Records the rate limit details from a response
+
+        Responses that carry no rate limit headers, such as those for
+        thumbnail images served outside of the API, are ignored.
+
+        Args:
+            headers (Headers): parsed headers of the response
+
+        Returns:
+            bool: True if the state was updated
+        """
+        if not headers.has_rate_limit:
+            return False
+
+        snapshot = RateLimitSnapshot(
+            rate_limit=_optional(lambda: headers.rate_limit),
+            rate_remaining=_optional(lambda: headers.rate_remaining),
+            time_to_refresh=_refresh_time(headers),
+            observation=Observation(
+                self._clock(), self._max_age, self._clock))
+        with self._lock:
+            self._snapshot = snapshot
+            self._updates += 1
+        return True
+
+
+def _optional(getter):
+    """Reads a header value that may be missing or malformed
+
+    Args:
+        getter (callable): function returning the value
+
+    Returns:
+        the value, or None if it could not be read
+    """
+    try:
+        return getter()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _refresh_time(headers):
+    """Works out when the rate limit window described by a response ends
+
+    Args:
+        headers (Headers): parsed headers of the response
+
+    Returns:
+        datetime.datetime:
+            end of the window, or None if the response did not say
+    """
+    seconds = _optional(lambda: headers.seconds_to_refresh)
+    if seconds is None:
+        return None
+    date = _optional(lambda: headers.date)
+    if date is None:
+        # fall back to our own clock when the server did not send the time
+        date = datetime.now(tz=tz.tzlocal())
+    return date + timedelta(seconds=seconds)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
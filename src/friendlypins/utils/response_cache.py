@@ -0,0 +1,314 @@
+"""Caches for response data returned by the Pinterest REST API"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from friendlypins.utils.endpoints import path_template
+
+
+class CacheEntry(object):
+    """Response data held in a cache, along with the details needed to
+    revalidate it with the REST API once it expires"""
+
+    def __init__(self, data, expires, etag=None, last_modified=None, size=0):
+        """
+        Args:
+            data (dict): response data returned by the API
+            expires (float): time at which the data becomes stale
+            etag (str): optional entity tag reported by the API
+            last_modified (str):
+                optional modification time stamp reported by the API
+            size (int): size of the original response body, in bytes
+        """
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    @property
+    def validators(self):
+        """dict: HTTP request headers that ask the API to only return data
+        if it has changed since this entry was stored. Empty if the API did
+        not provide any validators for the data."""
+        retval = dict()
+        if self.etag:
+            retval["If-None-Match"] = self.etag
+        if self.last_modified:
+            retval["If-Modified-Since"] = self.last_modified
+        return retval
+
+
+class ResponseCache(object):
+    """Base class with the expiry and bookkeeping logic shared by all
+    response caches
+
+    Cache keys are generated by
+    :func:`~friendlypins.utils.endpoints.request_key`, so the first element
+    of each key is the path of the endpoint the data was loaded from.
+
+    Derived classes must implement :meth:`_load`, :meth:`_store`,
+    :meth:`_paths` and :meth:`_discard`, and must call :meth:`_evicted` for
+    every entry they remove to make room for new ones. Stale entries that
+    can be revalidated with the API should be kept until they are evicted.
+    """
+
+    def __init__(self, default_ttl=300, endpoint_ttls=None, clock=time.time):
+        """
+        Args:
+            default_ttl (float):
+                number of seconds response data remains valid for
+            endpoint_ttls (dict):
+                optional overrides for the TTL of specific endpoints, keyed
+                by path template (ie: ``boards/{id}/pins``). A TTL of zero
+                disables caching for the endpoint.
+            clock (callable):
+                source for the current time, in seconds. Overridable for
+                testing.
+        """
+        self._log = logging.getLogger(__name__)
+        self._default_ttl = default_ttl
+        self._endpoint_ttls = dict(endpoint_ttls or dict())
+        self._clock = clock
+        self._stats_lock = threading.Lock()
+        # hits, misses, evictions and revalidations counted so far
+        self._stats = Counter()
+
+    @property
+    def hits(self):
+        """int: number of lookups answered from the cache"""
+        return self._stats["hits"]
+
+    @property
+    def misses(self):
+        """int: number of lookups that had to go to the REST API"""
+        return self._stats["misses"]
+
+    @property
+    def evictions(self):
+        """int: number of entries removed to make room for new ones"""
+        return self._stats["evictions"]
+
+    @property
+    def revalidations(self):
+        """int: number of stale entries the API confirmed were unchanged"""
+        return self._stats["revalidations"]
+
+    def reset_stats(self):
+        """Resets all of the cache statistics back to zero"""
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _evicted(self, count=1):
+        """Records entries being evicted from the cache
+
+        Args:
+            count (int): number of entries that were evicted
+        """
+        with self._stats_lock:
+            self._stats["evictions"] += count
+
+    def ttl_for(self, path):
+        """Gets the number of seconds data loaded from an endpoint is cached
+
+        Args:
+            path (str): sub-path with in the REST API
+
+        Returns:
+            float: time to live for the data, in seconds
+        """
+        return self._endpoint_ttls.get(path_template(path), self._default_ttl)
+
+    def get(self, key):
+        """Looks up response data in the cache
+
+        Args:
+            key (tuple): key identifying the API query
+
+        Returns:
+            dict: cached response data, or None if there is no valid entry
+        """
+        entry = self._load(key)
+        hit = entry is not None and entry.expires > self._clock()
+        with self._stats_lock:
+            if hit:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        return entry.data if hit else None
+
+    def lookup(self, key):
+        """Looks up a cache entry, whether it is stale or not
+
+        Unlike :meth:`get`, this method does not affect the cache statistics.
+
+        Args:
+            key (tuple): key identifying the API query
+
+        Returns:
+            CacheEntry: the cached entry, or None if there is none
+        """
+        return self._load(key)
+
+    def set(self, key, data, etag=None, last_modified=None, size=0):
+        """Stores response data in the cache
+
+        Args:
+            key (tuple): key identifying the API query
+            data (dict): response data returned by the query
+            etag (str): optional entity tag reported by the API
+            last_modified (str):
+                optional modification time stamp reported by the API
+            size (int): size of the original response body, in bytes
+        """
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        self._store(key, CacheEntry(
+            data, self._clock() + ttl, etag, last_modified, size))
+
+    def revalidated(self, key, entry):
+        """Renews a stale entry after the API confirmed it is unchanged
+
+        Args:
+            key (tuple): key identifying the API query
+            entry (CacheEntry): the stale entry
+        """
+        with self._stats_lock:
+            self._stats["revalidations"] += 1
+        self.set(key, entry.data, entry.etag, entry.last_modified, entry.size)
+
+    @staticmethod
+    def _is_affected(cached_path, path, related):
+        """Checks whether cached data is made stale by changes to an object
+
+        Args:
+            cached_path (str): path for the cached data
+            path (str): path for the object that changed
+            related (bool):
+                True to also match collections the object may appear in
+
+        Returns:
+            bool: True if the cached data should be invalidated
+        """
+        if cached_path == path or cached_path.startswith(path + "/"):
+            return True
+        if not related:
+            return False
+        # collections listing objects of the same type as the one that
+        # changed, ie: me/boards when boards/1234 gets deleted
+        collection = path.split("/")[0]
+        return cached_path.endswith("/" + collection)
+
+    def invalidate(self, path, related=False):
+        """Removes cached data for an object
+
+        Args:
+            path (str): sub-path with in the REST API for the object
+            related (bool):
+                True to also remove data for any collection the object may
+                be listed in. Used when objects are created or deleted.
+        """
+        path = path.strip("/")
+        stale = [
+            cur for cur in self._paths()
+            if self._is_affected(cur, path, related)
+        ]
+        if stale:
+            self._log.debug("Invalidating cached data for %s", stale)
+            self._discard(stale)
+
+    def clear(self):
+        """Removes all entries from the cache"""
+        self._discard(self._paths())
+
+    def _load(self, key):
+        """Loads an entry from the underlying storage
+
+        Args:
+            key (tuple): key identifying the API query
+
+        Returns:
+            CacheEntry: the cached entry, or None if not found
+        """
+        raise NotImplementedError()
+
+    def _store(self, key, entry):
+        """Saves an entry to the underlying storage
+
+        Args:
+            key (tuple): key identifying the API query
+            entry (CacheEntry): the entry to save
+        """
+        raise NotImplementedError()
+
+    def _paths(self):
+        """list (str): paths for all entries in the underlying storage"""
+        raise NotImplementedError()
+
+    def _discard(self, paths):
+        """Removes all entries for a set of paths from the underlying storage
+
+        Args:
+            paths (list of str): paths for the entries to remove
+        """
+        raise NotImplementedError()
+
+
+class MemoryCache(ResponseCache):
+    """Response cache held in memory, with least recently used eviction
+
+    Example:
+
+        >>> cache = MemoryCache(max_entries=500, endpoint_ttls={"me": 60})
+        >>> api = API(token, cache=cache)
+    """
+
+    def __init__(self, max_entries=1000, **kwargs):
+        """
+        Args:
+            max_entries (int):
+                maximum number of responses held in the cache
+            kwargs:
+                expiry settings supported by :class:`ResponseCache`
+        """
+        super().__init__(**kwargs)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._evicted(evicted)
+
+    def _paths(self):
+        with self._lock:
+            return list(set(cur[0] for cur in self._entries))
+
+    def _discard(self, paths):
+        paths = set(paths)
+        with self._lock:
+            for cur_key in list(self._entries):
+                if cur_key[0] in paths:
+                    del self._entries[cur_key]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -1,53 +1,470 @@
 """Abstraction around the raw Pinterest REST API calls"""
 import logging
+import threading
+import time
 import requests
+from requests.exceptions import RequestException
 from friendlypins.headers import Headers
 from friendlypins.exceptions import RateLimitException
+from friendlypins.utils.endpoints import request_key, path_template, \
+    token_scope
+from friendlypins.utils.instrumentation import RequestEvent, \
+    ResponseSummary
+from friendlypins.utils.json_codec import loads
+from friendlypins.utils.prefetch import prefetch
+from friendlypins.utils.rate_limit_state import RateLimitState
+from friendlypins.utils.rest_options import RestOptions
+from friendlypins.utils.stream_decoder import StreamedPage
+from friendlypins.utils.transport import RequestsTransport
+from friendlypins.utils.single_flight import SingleFlight
+from friendlypins.utils.token_pool import TokenPool
+
+# connection pooling settings accepted by RestIO.from_kwargs
+_POOLING_SETTINGS = (
+    "pool_connections", "pool_maxsize", "max_retries", "keep_alive")
+
+# hooks accepted by RestIO.from_kwargs
+_HOOKS = ("on_request", "on_response", "on_error", "on_retry")
+
+
+class _Credentials(object):
+    """Authentication details requests are sent with"""
+
+    def __init__(self, authentication_token):
+        """
+        Args:
+            authentication_token (str):
+                Personal API token, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool`
+        """
+        self.pool = None
+        if isinstance(authentication_token, TokenPool):
+            self.pool = authentication_token
+            authentication_token = self.pool.tokens[0]
+        self.token = authentication_token
+        # cached data is scoped to our token, so caches shared with other
+        # tokens never return data loaded for another account
+        self.cache_scope = token_scope(self.pool or authentication_token)
+
+
+class _RequestState(object):
+    """Details gathered from the requests sent through a :class:`RestIO`
+    object"""
+
+    def __init__(self, rate_state, coalesce_requests):
+        """
+        Args:
+            rate_state (RateLimitState):
+                record of the rate limit details reported by the API
+            coalesce_requests (bool):
+                True to share the response of GET requests that are already
+                in flight
+        """
+        self.latest_header = None
+        self.rate_state = rate_state
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """Records the headers of a response
+
+        Args:
+            headers (Headers): headers of the response
+        """
+        self.latest_header = headers
+        self.rate_state.update(headers)
+
+    def add_bytes_saved(self, size):
+        """Records the size of a response the API did not need to send
+
+        Args:
+            size (int): number of bytes saved
+        """
+        with self._lock:
+            self.bytes_saved += size
 
 
 class RestIO(object):
-    """Interface for low level REST API interactions"""
+    """Interface for low level REST API interactions
+
+    All requests made through an instance of this class share a single
+    transport, which pools and re-uses the underlying TCP / TLS connections
+    to the API for the lifetime of the object. Call :meth:`close` or use the
+    object as a context manager to release those connections when they are
+    no longer needed.
+    """
 
     # URL of the root namespace for the Pinterest API
     _root_url = 'https://api.pinterest.com/v1'
 
-    def __init__(self, authentication_token):
+    # number of bytes read from the network at a time when streaming results
+    _stream_chunk_size = 16 * 1024
+
+    def __init__(self, authentication_token, root_url=None, transport=None,
+                 options=None):
         """
         Args:
             authentication_token (str):
-                Personal API token for authenticating to REST API
+                Personal API token for authenticating to REST API, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool` to spread
+                requests across several tokens
+            root_url (str):
+                optional alternative root URL for the REST API. Mostly
+                useful for directing traffic to a local test server.
+            transport (Transport):
+                optional transport used to send HTTP requests. Defaults to
+                a :class:`~friendlypins.utils.transport.RequestsTransport`
+                with its default connection pooling settings.
+            options (RestOptions):
+                optional features, such as caching and retry policies. See
+                :class:`~friendlypins.utils.rest_options.RestOptions`.
         """
         self._log = logging.getLogger(__name__)
-        self._token = authentication_token
-        self._latest_header = None
+        self._credentials = _Credentials(authentication_token)
+        self._options = options or RestOptions()
+        self._state = _RequestState(
+            self._options.observers.rate_limit_state or RateLimitState(),
+            self._options.policies.coalesce_requests)
+        self._hooks = {
+            "request": [], "response": [], "error": [], "retry": []}
+        if root_url:
+            self._root_url = root_url.rstrip("/")
+        for cur in (self._options.observers.metrics,
+                    self._options.observers.quota_ledger):
+            if cur is not None:
+                cur.attach(self)
+        self._transport = transport or RequestsTransport()
+
+    @classmethod
+    def from_kwargs(cls, authentication_token, **kwargs):
+        """Creates an instance from a flat set of settings
+
+        Args:
+            authentication_token (str):
+                Personal API token for authenticating to REST API, or a
+                :class:`~friendlypins.utils.token_pool.TokenPool` to spread
+                requests across several tokens
+            kwargs:
+                ``root_url`` and ``transport``, as accepted by our
+                constructor, the connection pooling settings of
+                :class:`~friendlypins.utils.transport.RequestsTransport`,
+                which are ignored when a transport is provided, the hooks
+                accepted by :meth:`add_hooks` and any of the settings
+                grouped by
+                :class:`~friendlypins.utils.rest_options.RestOptions`
+
+        Returns:
+            RestIO: the new instance
+        """
+        root_url = kwargs.pop("root_url", None)
+        transport = kwargs.pop("transport", None)
+        pooling = {
+            cur: kwargs.pop(cur) for cur in _POOLING_SETTINGS if cur in kwargs}
+        hooks = {cur: kwargs.pop(cur) for cur in _HOOKS if cur in kwargs}
+        if transport is None:
+            transport = RequestsTransport(**pooling)
+        retval = cls(authentication_token, root_url, transport,
+                     RestOptions.from_kwargs(**kwargs))
+        retval.add_hooks(**hooks)
+        return retval
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes all pooled connections held by this object"""
+        self._transport.close()
 
     @property
     def root_url(self):
         """str: canonical url for the REST API"""
         return self._root_url
 
+    @property
+    def transport(self):
+        """Transport: transport used to send HTTP requests"""
+        return self._transport
+
+    @property
+    def options(self):
+        """RestOptions: optional features in use, such as caching and retry
+        policies"""
+        return self._options
+
+    @property
+    def single_flight(self):
+        """SingleFlight: tracks coalesced GET requests, or None if request
+        coalescing is disabled"""
+        return self._state.single_flight
+
+    @property
+    def bytes_saved(self):
+        """int: number of response bytes the API did not need to send
+        because cached data was confirmed to be up to date"""
+        return self._state.bytes_saved
+
+    def invalidate(self, path):
+        """Discards cached response data for an object, so it is reloaded
+        from the API the next time it is requested
+
+        Args:
+            path (str): sub-path with in the REST API for the object
+        """
+        if self._options.cache is not None:
+            self._options.cache.invalidate(path)
+
+    def add_hooks(self, on_request=None, on_response=None, on_error=None,
+                  on_retry=None):
+        """Registers hooks that are called for every HTTP request we send
+
+        Hooks are called on the thread that sends the request, and should
+        return quickly. Errors raised by hooks are logged and otherwise
+        ignored. See the constructor for details of each hook.
+
+        Args:
+            on_request (callable): hook called before a request is sent
+            on_response (callable): hook called when a response is received
+            on_error (callable): hook called when a request fails
+            on_retry (callable): hook called when a request is retried
+        """
+        for name, hook in (("request", on_request),
+                           ("response", on_response),
+                           ("error", on_error),
+                           ("retry", on_retry)):
+            if hook is not None:
+                self._hooks[name].append(hook)
+
+    def _call_hooks(self, name, event):
+        """Passes the details of a request to all hooks of a given type
+
+        Args:
+            name (str): type of hook to call (ie: request, response, error)
+            event (RequestEvent): details of the request
+        """
+        for hook in self._hooks[name]:
+            try:
+                hook(event)
+            except Exception:  # pylint: disable=broad-except
+                self._log.exception("Error in %s hook for %s", name, event)
+
+    def _new_event(self, method, url):
+        """Creates an object describing a request about to be sent, for
+        our hooks to consume
+
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL the request is sent to
+
+        Returns:
+            RequestEvent: description of the request
+        """
+        path = url
+        if url.startswith(self._root_url):
+            path = url[len(self._root_url):]
+        path = path.strip("/")
+        return RequestEvent(method.upper(), path, path_template(path))
+
     @property
     def token(self):
-        """str: authentication token"""
-        return self._token
+        """str: authentication token. When a token pool is in use, this is
+        the first token in the pool, and requests may be sent with any of
+        the others."""
+        return self._credentials.token
+
+    @property
+    def token_pool(self):
+        """TokenPool: pool of tokens requests are spread across, if any"""
+        return self._credentials.pool
+
+    def _can_switch_token(self, error, switches):
+        """Checks whether a failed request should be sent again straight
+        away, using a different token from our pool
+
+        Args:
+            error (Exception): error raised by the failed request
+            switches (int): number of times the token was already switched
+
+        Returns:
+            bool: True if the request should be sent again
+        """
+        pool = self._credentials.pool
+        if pool is None or switches >= len(pool):
+            return False
+        response = getattr(error, "response", None)
+        if response is None:
+            return False
+        if response.status_code != requests.codes.too_many_requests and \
+                response.status_code not in TokenPool.AUTH_FAILURE_STATUSES:
+            return False
+        return pool.available()
+
+    @property
+    def rate_limit_state(self):
+        """RateLimitState: rate limit details reported by the most recent
+        API response. Reading them never sends a request."""
+        return self._state.rate_state
 
     def refresh_headers(self):
         """Forces an update to the cached headers"""
-        self._latest_header = None
+        self._state.latest_header = None
 
     @property
     def headers(self):
-        """Headers: the HTTP headers from the most recent API operation"""
-        if self._latest_header:
-            return self._latest_header
+        """Headers: the HTTP headers from the most recent API operation, or
+        None if no request has been sent yet. Reading them never sends a
+        request; use :meth:`probe_rate_limit` to fetch fresh ones."""
+        return self._state.latest_header
+
+    def probe_rate_limit(self):
+        """Sends a request to the API just to read the headers it returns
 
+        Returns:
+            Headers: the headers of the probe response
+        """
         temp_url = "{0}/me".format(self._root_url)
-        properties = {"access_token": self._token}
+        properties = {"access_token": self._credentials.token}
+
+        # NOTE: we only care about the headers here, which are provided
+        #       even when the request is rejected by the rate limiter
+        self._send_once("get", temp_url, False, params=properties)
+        return self._state.latest_header
+
+    def _send(self, method, url, **kwargs):
+        """Sends an HTTP request through our transport, retrying failures
+        as allowed by our retry policy
 
-        response = requests.get(temp_url, params=properties)
-        self._latest_header = Headers(response.headers)
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL to send the request to
+            kwargs: additional parameters passed along to the transport
+
+        Returns:
+            requests.Response: successful response returned from the API
+        """
+        attempt = 0
+        switches = 0
+        waited = 0.0
+        hedge_policy = self._options.policies.hedge_policy
+        hedged = hedge_policy is not None and method == "get" and \
+            not kwargs.get("stream")
+        while True:
+            attempt += 1
+            try:
+                if hedged:
+                    return hedge_policy.run(
+                        lambda: self._send_once(method, url, True, **kwargs),
+                        self._state.rate_state.snapshot())
+                return self._send_once(method, url, True, **kwargs)
+            except RequestException as err:
+                if self._can_switch_token(err, switches):
+                    # NOTE: failures caused by the token, rather than the
+                    #       request, don't count against the retry policy
+                    switches += 1
+                    attempt -= 1
+                else:
+                    delay = None
+                    if self._options.policies.retry_policy:
+                        delay = self._options.policies.retry_policy.wait(
+                            method, url, attempt, err, waited)
+                    if delay is None:
+                        raise
+                    waited += delay
+                if self._hooks["retry"]:
+                    event = self._new_event(method, url)
+                    event.error = err
+                    self._call_hooks("retry", event)
+
+    def _send_once(self, method, url, check_status, **kwargs):
+        """Sends a single HTTP request through our transport
+
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL to send the request to
+            check_status (bool):
+                True to raise an error when the API reports a failure
+            kwargs:
+                additional parameters passed along to the transport. Set
+                "stream" to True to return before the response body has
+                been received.
+
+        Returns:
+            requests.Response: response returned from the API
+        """
+        governor = self._options.policies.governor
+        if governor:
+            governor.acquire()
+        stream = kwargs.pop("stream", False)
+        pool = self._credentials.pool
+        token = None
+        if pool is not None and kwargs.get("params"):
+            token = pool.acquire()
+            kwargs["params"] = dict(kwargs["params"], access_token=token)
+        event = self._new_event(method, url)
+        self._call_hooks("request", event)
+        start = time.perf_counter()
+        try:
+            if stream:
+                response = self._transport.stream(method, url, **kwargs)
+            else:
+                response = self._transport.send(method, url, **kwargs)
+        except Exception as err:
+            # transports may raise errors other than those from requests, and
+            # our hooks must still see every request that did not complete
+            if token is not None:
+                pool.release(token)
+            event.latency = time.perf_counter() - start
+            event.error = err
+            self._call_hooks("error", event)
+            raise
+        event.latency = time.perf_counter() - start
+
+        headers = Headers(response.headers)
+        self._state.update(headers)
+        if governor:
+            governor.update(headers)
+        if token is not None:
+            pool.release(token, headers, response.status_code)
+
+        self._describe_response(event, response, headers, stream)
+        self._call_hooks("response", event)
+
+        if check_status:
+            try:
+                self._raise_for_status(response)
+            except RequestException as err:
+                event.error = err
+                self._call_hooks("error", event)
+                raise
+        return response
+
+    @staticmethod
+    def _describe_response(event, response, headers, stream):
+        """Fills in the details of a response, for our hooks to consume
 
-        return self._latest_header
+        Args:
+            event (RequestEvent): details of the request
+            response (requests.Response): response returned from the API
+            headers (Headers): headers of the response
+            stream (bool): True if the response body has not been received
+        """
+        summary = ResponseSummary(response.status_code)
+        try:
+            summary.bytes = headers.bytes
+        except (KeyError, ValueError):
+            # NOTE: streamed responses have not been received yet, so their
+            #       size is only known when the API reports it
+            if not stream:
+                summary.bytes = len(response.content)
+        try:
+            summary.rate_limit = headers.rate_limit
+            summary.rate_remaining = headers.rate_remaining
+        except (KeyError, ValueError):
+            pass
+        event.response = summary
 
     @staticmethod
     def _raise_for_status(response):
@@ -84,16 +501,89 @@ class RestIO(object):
         if properties is None:
             properties = dict()
         properties["limit"] = "100"
-        properties["access_token"] = self._token
+        properties["access_token"] = self._credentials.token
+
+        key = request_key(path, properties, self._credentials.cache_scope)
+        if self._options.cache is not None:
+            result = self._options.cache.get(key)
+            if result is not None:
+                self._log.debug("Loaded %s from the response cache", path)
+                return result
+
+        single_flight = self._state.single_flight
+        if single_flight is None:
+            return self._get_json(path, temp_url, properties, key)
+
+        return single_flight.run(
+            request_key(path, properties),
+            lambda: self._get_json(path, temp_url, properties, key))
+
+    def _get_json(self, path, url, properties, key):
+        """Sends a GET request to the API and decodes the response
 
-        response = requests.get(temp_url, params=properties)
+        When a stale copy of the response data is held in our cache, the
+        request is made conditional on the data having changed so the API
+        can skip sending the data again if it hasn't.
 
-        self._log.debug("Get response text is %s", response.text)
-        self._latest_header = Headers(response.headers)
-        self._log.debug("%s query header: %s", path, self._latest_header)
-        self._raise_for_status(response)
+        Args:
+            path (str): sub-path with in the REST API being queried
+            url (str): fully qualified URL for the query
+            properties (dict): query parameters for the request
+            key (tuple): cache key for the query
 
-        return response.json()
+        Returns:
+            dict: json data returned from the API endpoint
+        """
+        stale = None
+        request_headers = None
+        if self._options.cache is not None:
+            stale = self._options.cache.lookup(key)
+            if stale is not None and stale.validators:
+                request_headers = stale.validators
+
+        response = self._send(
+            "get", url, params=properties, headers=request_headers)
+        self._log.debug(
+            "%s query header: %s", path, self._state.latest_header)
+
+        if request_headers and \
+                response.status_code == requests.codes.not_modified:
+            self._log.debug("Cached data for %s is still current", path)
+            self._state.add_bytes_saved(stale.size)
+            self._options.cache.revalidated(key, stale)
+            return stale.data
+
+        result = self._decode(response, "Get")
+        if self._options.cache is not None:
+            # NOTE: other threads may have updated our latest headers already
+            response_headers = Headers(response.headers)
+            try:
+                size = response_headers.bytes
+            except KeyError:
+                size = len(response.content)
+            self._options.cache.set(
+                key, result, response_headers.etag,
+                response_headers.last_modified, size)
+        return result
+
+    def _decode(self, response, method):
+        """Decodes the JSON data returned in an API response
+
+        The raw response body is parsed directly so it is only decoded once.
+        The body is converted to text for logging purposes only when debug
+        output is enabled.
+
+        Args:
+            response (requests.Response): response returned from the API
+            method (str): name of the HTTP method, used in log messages
+
+        Returns:
+            dict: json data returned from the API endpoint
+        """
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug(
+                "%s response text is %s", method, response.text)
+        return loads(response.content)
 
     def post(self, path, data, properties=None):
         """Posts API data to a given sub-path
@@ -116,20 +606,47 @@ class RestIO(object):
 
         if properties is None:
             properties = dict()
-        properties["access_token"] = self._token
-
-        response = requests.post(temp_url, data=data, params=properties)
-        self._latest_header = Headers(response.headers)
-        self._log.debug("%s query header: %s", path, self._latest_header)
-        self._log.debug("Post response text is %s", response.text)
+        properties["access_token"] = self._credentials.token
 
-        self._raise_for_status(response)
+        response = self._send(
+            "post", temp_url, data=data, params=properties)
+        self._log.debug(
+            "%s query header: %s", path, self._state.latest_header)
+        result = self._decode(response, "Post")
 
-        return response.json()
+        if self._options.cache is not None:
+            self._options.cache.invalidate(path, related=True)
+        return result
 
-    def get_pages(self, path, properties=None):
+    def get_pages(self, path, properties=None, prefetch_pages=None):
         """Generator for iterating over paged results returned from API
 
+        When prefetching is enabled, each page is requested as soon as the
+        previous one has been loaded, on a background thread, so the time
+        spent waiting on the API overlaps with the caller's processing of
+        earlier pages.
+
+        Args:
+            path (str): sub-path with in the REST API to query
+            properties (dict):
+                optional set of request properties to append to the API call
+            prefetch_pages (int):
+                optional number of pages to load ahead of the caller.
+                Defaults to the value provided to our constructor.
+
+        Returns:
+            dict: json data returned from the API endpoint
+        """
+        if prefetch_pages is None:
+            prefetch_pages = self._options.paging.prefetch_pages
+        pages = self._load_pages(path, properties)
+        if prefetch_pages > 0 and not self._options.paging.stream_pages:
+            pages = prefetch(pages, prefetch_pages)
+        yield from pages
+
+    def _load_pages(self, path, properties):
+        """Generator that loads paged results from the API one at a time
+
         Args:
             path (str): sub-path with in the REST API to query
             properties (dict):
@@ -141,21 +658,67 @@ class RestIO(object):
         page = 0
         while True:
             self._log.debug("Loading results page %s", page)
-            result = self.get(path, properties)
-            yield result
-
-            if "page" not in result:
-                break
-            if "cursor" not in result["page"]:
-                break
-            if not result["page"]["cursor"]:
+            if self._options.paging.stream_pages:
+                with self._get_streamed(path, properties) as result:
+                    yield result
+                    cursor = self.next_cursor(result)
+            else:
+                result = self.get(path, properties)
+                yield result
+                cursor = self.next_cursor(result)
+
+            if not cursor:
                 break
 
             if properties is None:
                 properties = dict()
-            properties["cursor"] = result["page"]["cursor"]
+            properties["cursor"] = cursor
             page += 1
 
+    def _get_streamed(self, path, properties):
+        """Sends a GET request to the API, without waiting for the response
+        data to be received
+
+        Args:
+            path (str): sub-path with in the REST API to query
+            properties (dict):
+                optional set of request properties to append to the API call
+
+        Returns:
+            StreamedPage: decodes the response data as it is received
+        """
+        self._log.debug(
+            "Streaming data from %s with options %s", path, properties)
+        temp_url = "{0}/{1}".format(self._root_url, path)
+
+        if properties is None:
+            properties = dict()
+        properties["limit"] = "100"
+        properties["access_token"] = self._credentials.token
+
+        response = self._send(
+            "get", temp_url, params=properties, stream=True)
+        self._log.debug(
+            "%s query header: %s", path, self._state.latest_header)
+        return StreamedPage(
+            response.iter_content(self._stream_chunk_size), response.close)
+
+    @staticmethod
+    def next_cursor(page):
+        """Extracts the cursor pointing to the next page of paged results
+
+        Args:
+            page (dict): json data for one page of results returned from API
+
+        Returns:
+            str:
+                cursor for the next page of results, or None if this is
+                the last page
+        """
+        if "page" not in page:
+            return None
+        return page["page"].get("cursor") or None
+
     def delete(self, path):
         """Sends a delete request to a remote endpoint
 
@@ -167,14 +730,18 @@ class RestIO(object):
             path)
 
         properties = {
-            "access_token": self._token
+            "access_token": self._credentials.token
         }
 
-        response = requests.delete(temp_url, params=properties)
-        header = Headers(response.headers)
-        self._log.debug("Headers for delete on %s are: %s", path, header)
-        self._log.debug("Response from delete was %s", response.text)
-        self._raise_for_status(response)
+        response = self._send("delete", temp_url, params=properties)
+        self._log.debug(
+            "Headers for delete on %s are: %s", path,
+            self._state.latest_header)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Response from delete was %s", response.text)
+
+        if self._options.cache is not None:
+            self._options.cache.invalidate(path, related=True)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,151 @@
+"""Optional features of the low level REST API interface, grouped by concern"""
+
+
+class RequestPolicies(object):
+    """Policies controlling how requests are sent to the REST API"""
+
+    def __init__(self, governor=None, retry_policy=None, hedge_policy=None,
+                 coalesce_requests=False):
+        """
+        Args:
+            governor (RateGovernor):
+                optional pacing policy used to space out requests so the
+                hourly rate limit is not exhausted before it refreshes
+            retry_policy (RetryPolicy):
+                optional policy describing how failed requests are retried.
+                When not provided, errors are raised to the caller
+                immediately.
+            hedge_policy (HedgePolicy):
+                optional policy used to cut the latency of GET requests
+                that are slow to answer, by sending a second copy of the
+                request and using whichever response arrives first.
+                Streamed requests are never hedged.
+            coalesce_requests (bool):
+                when True, identical GET requests made concurrently from
+                several threads are sent to the API only once, and every
+                caller receives the same response data
+        """
+        self.governor = governor
+        self.retry_policy = retry_policy
+        self.hedge_policy = hedge_policy
+        self.coalesce_requests = coalesce_requests
+
+
+class PagingOptions(object):
+    """Settings controlling how paged results are loaded"""
+
+    def __init__(self, prefetch_pages=0, stream_pages=False):
+        """
+        Args:
+            prefetch_pages (int):
+                number of pages of results to load in the background while
+                the caller is working through the current one, when
+                iterating over paged results. Set to 0 to only load each
+                page when it is needed.
+            stream_pages (bool):
+                when True, the items in each page of paged results are
+                decoded one at a time as they are received, rather than
+                waiting for the entire page to be loaded. Streamed pages
+                are not cached, and are never prefetched.
+        """
+        self.prefetch_pages = prefetch_pages
+        self.stream_pages = stream_pages
+
+
+class Observers(object):
+    """Collectors that keep track of the requests sent to the REST API"""
+
+    def __init__(self, metrics=None, lazy_audit=None, quota_ledger=None,
+                 rate_limit_state=None):
+        """
+        Args:
+            metrics (ClientMetrics):
+                optional collector of metrics describing the requests we
+                send, for export to a monitoring system
+            lazy_audit (LazyLoadAudit):
+                optional audit that records every time a Pinterest object
+                loads its data on demand, to find code that loads objects
+                one at a time
+            quota_ledger (QuotaLedger):
+                optional ledger that records every call we make against the
+                rate limit quota, along with the operation that made it
+            rate_limit_state (RateLimitState):
+                optional record of the rate limit details reported by the
+                API, updated from every response we receive. May be shared
+                with other objects that use the same authentication token.
+                A new record is created when not provided.
+        """
+        self.metrics = metrics
+        self.lazy_audit = lazy_audit
+        self.quota_ledger = quota_ledger
+        self.rate_limit_state = rate_limit_state
+
+
+class RestOptions(object):
+    """Optional features of a :class:`~friendlypins.utils.rest_io.RestIO`
+    object
+
+    Example:
+
+        >>> options = RestOptions(
+        >>>     policies=RequestPolicies(retry_policy=RetryPolicy()),
+        >>>     paging=PagingOptions(prefetch_pages=1))
+        >>> with RestIO(token, options=options) as rest_io:
+        >>>     ...
+    """
+
+    # settings accepted by from_kwargs, for each group of options
+    _GROUPS = {
+        "policies": (RequestPolicies, (
+            "governor", "retry_policy", "hedge_policy", "coalesce_requests")),
+        "paging": (PagingOptions, ("prefetch_pages", "stream_pages")),
+        "observers": (Observers, (
+            "metrics", "lazy_audit", "quota_ledger", "rate_limit_state")),
+    }
+
+    def __init__(self, policies=None, paging=None, observers=None,
+                 cache=None):
+        """
+        Args:
+            policies (RequestPolicies):
+                policies controlling how requests are sent
+            paging (PagingOptions):
+                settings controlling how paged results are loaded
+            observers (Observers):
+                collectors that keep track of the requests we send
+            cache (ResponseCache):
+                optional cache for data returned from GET requests. Data
+                returned from the cache is shared with other callers, and
+                must be treated as read only.
+        """
+        self.policies = policies or RequestPolicies()
+        self.paging = paging or PagingOptions()
+        self.observers = observers or Observers()
+        self.cache = cache
+
+    @classmethod
+    def from_kwargs(cls, **kwargs):
+        """Groups a flat set of settings, as accepted by the constructors of
+        each group of options
+
+        Args:
+            kwargs:
+                any of the settings accepted by :class:`RequestPolicies`,
+                :class:`PagingOptions` and :class:`Observers`, along with an
+                optional ``cache``
+
+        Returns:
+            RestOptions: the grouped settings
+        """
+        groups = {"cache": kwargs.pop("cache", None)}
+        for name, (group, settings) in cls._GROUPS.items():
+            groups[name] = group(**{
+                cur: kwargs.pop(cur) for cur in settings if cur in kwargs})
+        if kwargs:
+            raise TypeError("Unsupported options: {0}".format(
+                ", ".join(sorted(kwargs))))
+        return cls(**groups)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,221 @@
+"""Policies controlling how failed REST API requests are retried"""
+import logging
+import random
+import time
+from datetime import datetime
+import requests
+from dateutil import tz
+from friendlypins.exceptions import RateLimitException
+
+
+class Backoff(object):
+    """Exponential back off delays, with random jitter, used between
+    retries of transient errors"""
+
+    def __init__(self, factor=1.0, max_delay=60.0, jitter=0.5):
+        """
+        Args:
+            factor (float):
+                delay, in seconds, before the first retry. Each subsequent
+                retry doubles the delay.
+            max_delay (float):
+                upper bound, in seconds, for the exponential back off delay
+            jitter (float):
+                fraction of the back off delay that is randomized, to keep
+                concurrent clients from retrying in lock step
+        """
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        """Calculates the back off delay for a retry
+
+        Args:
+            attempt (int): number of attempts made so far, starting at 1
+
+        Returns:
+            float: number of seconds to wait
+        """
+        delay = min(self.max_delay, self.factor * (2 ** (attempt - 1)))
+        spread = delay * self.jitter
+        return delay - spread + random.random() * spread * 2
+
+
+class RetryLimits(object):
+    """Limits on how many times, and for how long, a request is retried"""
+
+    def __init__(self, max_attempts=5, max_total_wait=3600.0):
+        """
+        Args:
+            max_attempts (int):
+                maximum number of times a request is sent, including the
+                first attempt
+            max_total_wait (float):
+                maximum number of seconds spent waiting between retries of
+                a single request, including waits for rate limit renewals
+        """
+        self.max_attempts = max_attempts
+        self.max_total_wait = max_total_wait
+
+
+class RetryableRequests(object):
+    """Failed requests that may be retried"""
+
+    # HTTP status codes for server errors that are typically transient
+    DEFAULT_STATUSES = (500, 502, 503, 504)
+
+    # HTTP methods that are safe to send more than once
+    DEFAULT_METHODS = ("get", "delete")
+
+    def __init__(self, statuses=None, methods=None):
+        """
+        Args:
+            statuses (list of int):
+                HTTP status codes that are considered transient. Defaults
+                to :attr:`DEFAULT_STATUSES`
+            methods (list of str):
+                HTTP methods that may be retried. Defaults to
+                :attr:`DEFAULT_METHODS`
+        """
+        self.statuses = tuple(statuses or self.DEFAULT_STATUSES)
+        self.methods = tuple(methods or self.DEFAULT_METHODS)
+
+    def matches(self, method, error):
+        """Checks whether a failed request may be retried
+
+        Args:
+            method (str): HTTP method of the failed request
+            error (Exception): error raised by the failed request
+
+        Returns:
+            bool: True if the request may be retried
+        """
+        if method.lower() not in self.methods:
+            return False
+        if isinstance(error, RateLimitException):
+            return True
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, requests.HTTPError) and \
+                error.response is not None:
+            return error.response.status_code in self.statuses
+        return False
+
+
+class RetryPolicy(object):
+    """Decides if, and for how long to wait before, a failed API request
+    is retried
+
+    Transient errors (connection failures, time outs and 5xx responses) are
+    retried with exponential back off plus random jitter. Requests rejected
+    because the rate limit has been reached wait until the rate limit
+    renewal time reported by the API. Retries stop once the maximum number
+    of attempts is reached, or once the total time spent waiting would
+    exceed the configured cap, at which point the last error is raised to
+    the caller.
+
+    Example:
+
+        >>> policy = RetryPolicy(
+        >>>     RetryLimits(max_attempts=3), Backoff(factor=2.0))
+    """
+
+    def __init__(self, limits=None, backoff=None, retryable=None,
+                 on_retry=None, sleep=time.sleep):
+        """
+        Args:
+            limits (RetryLimits):
+                maximum number of attempts and total wait for a request.
+                Defaults to :class:`RetryLimits` with its default settings.
+            backoff (Backoff):
+                delays used between retries of transient errors. Defaults
+                to :class:`Backoff` with its default settings.
+            retryable (RetryableRequests):
+                failed requests that may be retried. Defaults to
+                :class:`RetryableRequests` with its default settings.
+            on_retry (callable):
+                optional callback invoked before every retry, with the
+                HTTP method, URL, attempt number, delay in seconds and the
+                error that caused the retry as parameters
+            sleep (callable):
+                method used to wait between retries. Overridable for testing.
+        """
+        self._log = logging.getLogger(__name__)
+        self.limits = limits or RetryLimits()
+        self.backoff = backoff or Backoff()
+        self.retryable = retryable or RetryableRequests()
+        self.on_retry = on_retry
+        self._sleep = sleep
+
+    def is_retryable(self, method, error):
+        """Checks whether a failed request may be retried at all
+
+        Args:
+            method (str): HTTP method of the failed request
+            error (Exception): error raised by the failed request
+
+        Returns:
+            bool: True if the request may be retried
+        """
+        return self.retryable.matches(method, error)
+
+    def get_delay(self, attempt, error):
+        """Calculates how long to wait before retrying a failed request
+
+        Args:
+            attempt (int): number of attempts made so far, starting at 1
+            error (Exception): error raised by the failed request
+
+        Returns:
+            float: number of seconds to wait
+        """
+        if isinstance(error, RateLimitException):
+            try:
+                renewal = error.rate_renewal - datetime.now(tz=tz.tzutc())
+                delay = renewal.total_seconds()
+            except (KeyError, ValueError):
+                delay = 0
+            if delay > 0:
+                return delay
+        return self.backoff.delay(attempt)
+
+    def wait(self, method, url, attempt, error, waited):
+        """Waits before retrying a failed request, if the policy allows it
+
+        Args:
+            method (str): HTTP method of the failed request
+            url (str): URL the failed request was sent to
+            attempt (int): number of attempts made so far, starting at 1
+            error (Exception): error raised by the failed request
+            waited (float):
+                number of seconds already spent waiting on retries of this
+                request
+
+        Returns:
+            float:
+                number of seconds waited, or None if the request must not
+                be retried
+        """
+        if attempt >= self.limits.max_attempts:
+            return None
+        if not self.is_retryable(method, error):
+            return None
+        delay = self.get_delay(attempt, error)
+        if waited + delay > self.limits.max_total_wait:
+            self._log.debug(
+                "Not retrying %s: %.1f second delay exceeds the wait limit",
+                url, delay)
+            return None
+
+        self._log.debug(
+            "Retrying %s %s in %.1f seconds (attempt %s): %s",
+            method, url, delay, attempt + 1, error)
+        if self.on_retry:
+            self.on_retry(method, url, attempt, delay, error)
+        self._sleep(delay)
+        return delay
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
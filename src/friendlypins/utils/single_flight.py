@@ -0,0 +1,80 @@
+"""Coalescing of identical API requests that are in flight at the same time"""
+import logging
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight(object):
+    """Runs at most one call at a time for any given key
+
+    When a call is made with a key that matches a call already in progress
+    on another thread, the second caller waits for the first call to
+    complete and receives its result, or its error, instead of repeating
+    the work. Callers waiting on the same call all receive the same result
+    object, so it must be treated as read only.
+    """
+
+    def __init__(self):
+        self._log = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._in_flight = dict()
+        self._calls = 0
+        self._coalesced = 0
+
+    @property
+    def calls(self):
+        """int: total number of calls made through this object"""
+        return self._calls
+
+    @property
+    def coalesced(self):
+        """int: number of calls that were answered by a call already in
+        flight, rather than doing the work themselves"""
+        return self._coalesced
+
+    def reset_stats(self):
+        """Resets the call counters back to zero"""
+        with self._lock:
+            self._calls = 0
+            self._coalesced = 0
+
+    def run(self, key, func):
+        """Runs a function, unless a call with the same key is in progress
+
+        Args:
+            key: hashable identifier describing the work done by the function
+            func (callable):
+                function that does the work, called with no parameters
+
+        Returns:
+            the return value of the function
+        """
+        with self._lock:
+            self._calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            self._log.debug("Waiting on in-flight request for %s", key)
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return result
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
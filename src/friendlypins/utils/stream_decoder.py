@@ -0,0 +1,277 @@
+"""Incremental decoding of paged results streamed from the REST API"""
+import codecs
+import json
+
+# characters JSON allows between tokens
+_WHITESPACE = " \t\n\r"
+
+# characters that may appear in a JSON number
+_NUMBER_CHARACTERS = "0123456789+-.eE"
+
+# once this many characters of our buffer have been parsed, they are
+# discarded to keep memory use low
+_TRIM_SIZE = 64 * 1024
+
+
+class _JsonReader(object):
+    """Reads JSON tokens and values from a response received in chunks"""
+
+    def __init__(self, chunks):
+        """
+        Args:
+            chunks (iterator):
+                produces the raw, UTF-8 encoded response body in chunks of
+                bytes
+        """
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        # decoded text not yet discarded, and our position within it
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Reads the next chunk of the response into our buffer
+
+        Returns:
+            bool: False if there is no more data to read
+        """
+        if self.eof:
+            return False
+        if self.pos > _TRIM_SIZE:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.eof = True
+            self.buffer += self._text_decoder.decode(b"", final=True)
+            return False
+        self.buffer += self._text_decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Skips over whitespace and gets the next character in the response
+
+        Returns:
+            str: the next character, or an empty string at the end of the
+            response
+        """
+        while True:
+            while self.pos < len(self.buffer):
+                if self.buffer[self.pos] not in _WHITESPACE:
+                    return self.buffer[self.pos]
+                self.pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, characters):
+        """Consumes the next character in the response
+
+        Args:
+            characters (str): characters which are valid at this point
+
+        Returns:
+            str: the character that was consumed
+        """
+        current = self.peek()
+        if not current or current not in characters:
+            raise ValueError(
+                "Invalid JSON response: expected one of '{0}' at position "
+                "{1} but found '{2}'".format(characters, self.pos, current))
+        self.pos += 1
+        return current
+
+    def _number_at_end(self):
+        """Checks whether the next value is a number that runs up to the end
+        of our buffer, and so may continue in the next chunk
+
+        Returns:
+            bool: True if the number may be incomplete
+        """
+        if self.eof or self.buffer[self.pos] not in "-0123456789":
+            return False
+        end = self.pos
+        while end < len(self.buffer) and \
+                self.buffer[end] in _NUMBER_CHARACTERS:
+            end += 1
+        return end == len(self.buffer)
+
+    def read_value(self):
+        """Decodes the next complete JSON value in the response
+
+        Returns:
+            the decoded value
+        """
+        self.peek()
+        # a number split across chunks, such as "0." followed by "5", would
+        # otherwise decode as just the digits in our buffer
+        while self._number_at_end():
+            self._fill()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(
+                    self.buffer, self.pos)
+            except ValueError:
+                # the value may continue in the next chunk
+                if self._fill():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+
+class StreamedPage(object):
+    """One page of paged results, decoded as it is read from the network
+
+    Objects of this type behave like the read only dictionary returned by
+    :meth:`~friendlypins.utils.rest_io.RestIO.get`, except that the "data"
+    field is an iterator that decodes one item from the response at a time.
+    The caller can start working with the first item as soon as it has been
+    received, and decoded items are not held in memory by this object.
+
+    Items can only be iterated over once. Looking up a field that comes after
+    the "data" field in the response, such as the "page" field that holds
+    the cursor for the next page, skips over any items not yet read.
+
+    Example:
+
+        >>> page = StreamedPage(response.iter_content(16 * 1024))
+        >>> for item in page["data"]:
+        >>>     print(item["id"])
+        >>> cursor = page["page"]["cursor"]
+    """
+
+    def __init__(self, chunks, close=None):
+        """
+        Args:
+            chunks (iterator):
+                produces the raw, UTF-8 encoded response body in chunks of
+                bytes
+            close (callable):
+                optional function called to release the underlying response
+                once the page is closed
+        """
+        self._reader = _JsonReader(chunks)
+        self._close = close
+        self._fields = dict()
+        self._seen = set()
+        self._events = self._parse()
+        self._done = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, key):
+        self._advance(key)
+        return key in self._seen
+
+    def __getitem__(self, key):
+        self._advance(key)
+        if key not in self._seen:
+            raise KeyError(key)
+        if key == "data" and key not in self._fields:
+            return self._items()
+        return self._fields[key]
+
+    def get(self, key, default=None):
+        """Gets a field from the response, with a fallback if not found
+
+        Args:
+            key (str): name of the field
+            default: value returned when the field is not in the response
+
+        Returns:
+            value of the field, or the default if not found
+        """
+        if key in self:
+            return self[key]
+        return default
+
+    def close(self):
+        """Releases the underlying response, without reading the rest of
+        the data"""
+        self._done = True
+        if self._close:
+            self._close()
+            self._close = None
+
+    def _advance(self, key):
+        """Parses the response until a given field is found, or until we
+        reach the end of the response
+
+        Args:
+            key (str): name of the field to look for
+        """
+        while key not in self._seen and self._next_event() is not None:
+            pass
+
+    def _next_event(self):
+        """Parses the next token of interest from the response
+
+        Returns:
+            tuple:
+                type of token and the associated value, or None if there
+                is nothing left to parse
+        """
+        if self._done:
+            return None
+        try:
+            return next(self._events)
+        except StopIteration:
+            self.close()
+            return None
+
+    def _items(self):
+        """Generator that decodes the items in the "data" field
+
+        Yields:
+            dict: response data for each item
+        """
+        while True:
+            event = self._next_event()
+            if event is None or event[0] != "item":
+                return
+            yield event[1]
+
+    def _parse(self):
+        """Generator that walks through the top level object in the response
+
+        Yields:
+            tuple:
+                ("field", name) once each field other than "data" has been
+                decoded, ("data", None) when the "data" field begins and
+                ("item", value) for each item in the "data" field
+        """
+        self._reader.expect("{")
+        if self._reader.peek() == "}":
+            self._reader.pos += 1
+            return
+        while True:
+            key = self._reader.read_value()
+            self._reader.expect(":")
+            if key == "data" and self._reader.peek() == "[":
+                self._reader.pos += 1
+                self._seen.add(key)
+                yield "data", None
+                if self._reader.peek() == "]":
+                    self._reader.pos += 1
+                else:
+                    while True:
+                        yield "item", self._reader.read_value()
+                        if self._reader.expect(",]") == "]":
+                            break
+            else:
+                self._fields[key] = self._reader.read_value()
+                self._seen.add(key)
+                yield "field", key
+            if self._reader.expect(",}") == "}":
+                return
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
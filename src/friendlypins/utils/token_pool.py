@@ -0,0 +1,280 @@
+"""Spreading of API requests across several authentication tokens"""
+import logging
+import threading
+import time
+
+
+class _TokenQuota(object):
+    """Rate limit window of a single token"""
+
+    def __init__(self):
+        self.rate_limit = None
+        self.rate_remaining = None
+        self.refresh_at = None
+
+    def update(self, limit, remaining, refresh_at):
+        """Replaces the details of the current window
+
+        Args:
+            limit (int): number of requests allowed in each window
+            remaining (int): number of requests left in the window
+            refresh_at (float): time the window ends
+        """
+        self.rate_limit = limit
+        self.rate_remaining = remaining
+        self.refresh_at = refresh_at
+
+    def renew(self, now):
+        """Restores the full quota once the current window has ended
+
+        Args:
+            now (float): the current time
+        """
+        if self.refresh_at is not None and now >= self.refresh_at:
+            self.rate_remaining = self.rate_limit
+            self.refresh_at = None
+
+
+class _TokenUsage(object):
+    """Counts of the requests made with a single token"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+
+
+class _TokenState(object):
+    """Rate limit and health details tracked for a single token"""
+
+    def __init__(self, token):
+        self.token = token
+        self.quota = _TokenQuota()
+        self.usage = _TokenUsage()
+        self.blocked_until = None
+
+
+class TokenPool(object):
+    """Set of authentication tokens with access to the same Pinterest data
+
+    Provide a pool in place of the authentication token for an
+    :class:`~friendlypins.api.API` object to spread its requests across all
+    of the tokens in the pool. Every request is sent with the token that has
+    the most quota remaining in its current rate limit window, based on the
+    ``X-Ratelimit-*`` headers of the responses to earlier requests made
+    with it. Requests that are rejected by the rate limiter, or because the
+    token is no longer valid, are retried straight away with another token
+    when one is available.
+
+    Tokens that were rate limited are not used again until their rate limit
+    refreshes. Tokens that were rejected as invalid are put aside for a
+    cool down period, in case the failure was temporary.
+
+    Instances are thread safe.
+
+    Example:
+
+        >>> pool = TokenPool([token1, token2, token3])
+        >>> with API(pool) as api:
+        >>>     for board in api.user.boards:
+        >>>         ...
+        >>> print(pool.utilization())
+    """
+
+    # HTTP status codes indicating that a token is no longer usable
+    AUTH_FAILURE_STATUSES = (401, 403)
+
+    def __init__(self, tokens, failure_cooldown=300.0, clock=time.monotonic):
+        """
+        Args:
+            tokens (list of str):
+                personal API tokens. All of them must have access to the
+                same data.
+            failure_cooldown (float):
+                number of seconds a token that was rejected as invalid is
+                put aside for
+            clock (callable):
+                monotonic time source, in seconds. Overridable for testing.
+        """
+        if not tokens:
+            raise ValueError("A token pool needs at least one token")
+        self._log = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._failure_cooldown = failure_cooldown
+        self._clock = clock
+        self._states = [_TokenState(cur) for cur in tokens]
+        self._by_token = {cur.token: cur for cur in self._states}
+        self._next = 0
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def tokens(self):
+        """list (str): all of the tokens in the pool"""
+        return [cur.token for cur in self._states]
+
+    def _is_available(self, state, now):
+        """Checks whether a token may be used. Must be called with our lock
+        held.
+
+        Args:
+            state (_TokenState): the token to check
+            now (float): the current time
+
+        Returns:
+            bool: True if requests may be sent with the token
+        """
+        if state.blocked_until is not None and now < state.blocked_until:
+            return False
+        state.quota.renew(now)
+        return True
+
+    def available(self):
+        """Checks whether any token may currently be used
+
+        Returns:
+            bool: True if at least one token is neither rate limited nor
+            cooling down after a failure
+        """
+        now = self._clock()
+        with self._lock:
+            return any(self._is_available(cur, now) for cur in self._states)
+
+    def acquire(self):
+        """Selects the token to use for the next request
+
+        Every call must be matched with a call to :meth:`release` once the
+        request completes.
+
+        Returns:
+            str:
+                the available token with the most remaining quota. Tokens
+                that have not been used yet are tried first. When no token
+                is available, the one that becomes available first is
+                returned.
+        """
+        now = self._clock()
+        with self._lock:
+            candidates = [cur for cur in self._states
+                          if self._is_available(cur, now)]
+            if candidates:
+                # rotate the starting point, so tokens with equal quota
+                # take turns
+                start = self._next % len(self._states)
+                self._next += 1
+                order = {id(cur): (pos - start) % len(self._states)
+                         for pos, cur in enumerate(self._states)}
+                best = max(candidates, key=lambda cur: (
+                    self._headroom(cur), -order[id(cur)]))
+            else:
+                best = min(self._states, key=lambda cur: cur.blocked_until)
+            best.usage.in_flight += 1
+            best.usage.calls += 1
+            return best.token
+
+    @staticmethod
+    def _headroom(state):
+        """Estimates the number of requests a token can still make
+
+        Args:
+            state (_TokenState): the token to check
+
+        Returns:
+            float: remaining quota, less requests in flight
+        """
+        if state.quota.rate_remaining is None:
+            return float("inf")
+        return state.quota.rate_remaining - state.usage.in_flight
+
+    def release(self, token, headers=None, status=None):
+        """Updates the details of a token once a request made with it
+        completes
+
+        Args:
+            token (str): the token used for the request
+            headers (Headers):
+                headers of the response, or None if no response was received
+            status (int):
+                status code of the response, or None if no response was
+                received
+        """
+        now = self._clock()
+        with self._lock:
+            state = self._by_token[token]
+            state.usage.in_flight -= 1
+            if headers is not None:
+                # the remaining quota only means something alongside the
+                # time it resets, so the details are updated together or
+                # not at all
+                try:
+                    limit = headers.rate_limit
+                    remaining = headers.rate_remaining
+                    refresh_at = now + headers.seconds_to_refresh
+                except (KeyError, TypeError, ValueError):
+                    pass
+                else:
+                    state.quota.update(limit, remaining, refresh_at)
+
+            if status is None or status < 400:
+                return
+            state.usage.errors += 1
+            if status == 429:
+                state.usage.throttled += 1
+                state.quota.rate_remaining = 0
+                state.blocked_until = state.quota.refresh_at or \
+                    now + self._failure_cooldown
+            elif status in self.AUTH_FAILURE_STATUSES:
+                state.blocked_until = now + self._failure_cooldown
+            else:
+                return
+        self._log.warning(
+            "Token %s was rejected with status %s. Switching to another "
+            "token.", _mask(token), status)
+
+    def utilization(self):
+        """Describes how each token in the pool has been used
+
+        Returns:
+            list (dict):
+                details of each token, identified by a masked copy of the
+                token
+        """
+        now = self._clock()
+        retval = list()
+        with self._lock:
+            for cur in self._states:
+                available = self._is_available(cur, now)
+                quota = cur.quota
+                used = None
+                if quota.rate_limit and quota.rate_remaining is not None:
+                    used = 1.0 - \
+                        quota.rate_remaining / float(quota.rate_limit)
+                retval.append({
+                    "token": _mask(cur.token),
+                    "calls": cur.usage.calls,
+                    "errors": cur.usage.errors,
+                    "throttled": cur.usage.throttled,
+                    "rate_limit": quota.rate_limit,
+                    "rate_remaining": quota.rate_remaining,
+                    "quota_used": used,
+                    "available": available,
+                })
+        return retval
+
+
+def _mask(token):
+    """Hides most of an authentication token, so it can be safely logged
+
+    Args:
+        token (str): the token
+
+    Returns:
+        str: the last few characters of the token
+    """
+    return "..." + token[-4:]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
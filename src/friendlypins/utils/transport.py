@@ -0,0 +1,392 @@
+"""HTTP transports used by RestIO to communicate with the REST API
+
+A transport is responsible for sending HTTP requests and returning the
+responses. Every transport returns :class:`requests.Response` objects and
+raises :mod:`requests.exceptions` errors for network failures, so the
+error handling, retry and decoding logic in
+:class:`~friendlypins.utils.rest_io.RestIO` works the same regardless of
+which transport is in use.
+
+Three transports are provided:
+
+* :class:`RequestsTransport` sends requests through a pooled
+  :class:`requests.Session`. This is the default.
+* :class:`Urllib3Transport` sends requests directly through a
+  :class:`urllib3.PoolManager`, skipping the request preparation done by
+  the requests library.
+* :class:`FakeTransport` serves canned JSON data from memory, without
+  any network traffic. It is useful for tests and benchmarks that measure
+  the overhead of the library itself.
+"""
+import json
+import threading
+from email.utils import formatdate
+from urllib.parse import urlencode, urlparse, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import urllib3
+
+
+class Transport(object):
+    """Interface implemented by all transports"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send(self, method, url, params=None, data=None, headers=None):
+        """Sends an HTTP request and waits for the complete response
+
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL to send the request to
+            params (dict): optional query parameters for the request
+            data (dict): optional form data to send in the request body
+            headers (dict): optional HTTP headers for the request
+
+        Returns:
+            requests.Response: response returned from the API
+        """
+        raise NotImplementedError()
+
+    def stream(self, method, url, params=None, headers=None):
+        """Sends an HTTP request, returning as soon as the response headers
+        have been received
+
+        The response body is read from the network as the caller iterates
+        over :meth:`requests.Response.iter_content`. Callers must close the
+        response once they are done with it.
+
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL to send the request to
+            params (dict): optional query parameters for the request
+            headers (dict): optional HTTP headers for the request
+
+        Returns:
+            requests.Response: response returned from the API
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Releases all network resources held by this transport"""
+
+
+class RequestsTransport(Transport):
+    """Sends requests through a :class:`requests.Session`, so the
+    underlying TCP / TLS connections are pooled and re-used"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0,
+                 keep_alive=True):
+        """
+        Args:
+            pool_connections (int):
+                number of distinct hosts to keep connection pools for
+            pool_maxsize (int):
+                maximum number of connections to keep open per host
+            max_retries (int):
+                number of times failed connection attempts are retried at
+                the socket level
+            keep_alive (bool):
+                when False, connections are closed after every request
+                instead of being returned to the pool
+        """
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    @property
+    def session(self):
+        """requests.Session: the session used to send requests"""
+        return self._session
+
+    def send(self, method, url, params=None, data=None, headers=None):
+        kwargs = {"params": params}
+        if data is not None:
+            kwargs["data"] = data
+        if headers:
+            kwargs["headers"] = headers
+        return getattr(self._session, method)(url, **kwargs)
+
+    def stream(self, method, url, params=None, headers=None):
+        kwargs = {"params": params, "stream": True}
+        if headers:
+            kwargs["headers"] = headers
+        return getattr(self._session, method)(url, **kwargs)
+
+    def close(self):
+        self._session.close()
+
+
+def _build_response(url, status, headers, body, reason=None):
+    """Packages the details of an HTTP response into a response object
+    compatible with the requests library
+
+    Args:
+        url (str): URL the request was sent to
+        status (int): HTTP status code
+        headers (dict): HTTP response headers
+        body:
+            response body as bytes, when it has been read already, or a
+            file-like object the body can be read from, when streaming
+        reason (str): optional description of the status code
+
+    Returns:
+        requests.Response: the response
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    if isinstance(body, bytes):
+        # pylint: disable=protected-access
+        response._content = body
+    else:
+        response.raw = body
+    return response
+
+
+class Urllib3Transport(Transport):
+    """Sends requests directly through a :class:`urllib3.PoolManager`
+
+    This avoids the overhead of preparing requests and hooks in the requests
+    library, while keeping the same connection pooling behaviour.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0,
+                 keep_alive=True, timeout=None):
+        """
+        Args:
+            pool_connections (int):
+                number of distinct hosts to keep connection pools for
+            pool_maxsize (int):
+                maximum number of connections to keep open per host
+            max_retries (int):
+                number of times failed connection attempts are retried at
+                the socket level
+            keep_alive (bool):
+                when False, connections are closed after every request
+                instead of being returned to the pool
+            timeout (float):
+                optional number of seconds to wait for the server to respond
+        """
+        self._headers = {"User-Agent": requests.utils.default_user_agent()}
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+        self._pool = urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            retries=urllib3.Retry(
+                total=max_retries, read=False, redirect=3, status=0),
+            timeout=timeout)
+
+    def _request(self, method, url, stream, **kwargs):
+        """Sends a request through our connection pool
+
+        Args:
+            method (str): name of the HTTP method to use (ie: get, post)
+            url (str): fully qualified URL to send the request to
+            stream (bool):
+                True to return before the response body has been received
+            kwargs: the params, data and headers of the request, if any
+
+        Returns:
+            requests.Response: response returned from the API
+        """
+        if kwargs.get("params"):
+            url = "{0}?{1}".format(url, urlencode(kwargs["params"]))
+        request_headers = dict(self._headers)
+        request_headers.update(kwargs.get("headers") or {})
+        body = None
+        if kwargs.get("data") is not None:
+            body = urlencode(kwargs["data"])
+            request_headers["Content-Type"] = \
+                "application/x-www-form-urlencoded"
+
+        try:
+            raw = self._pool.request(
+                method.upper(), url, body=body, headers=request_headers,
+                preload_content=not stream)
+        except urllib3.exceptions.TimeoutError as err:
+            raise requests.Timeout(err) from err
+        except urllib3.exceptions.HTTPError as err:
+            raise requests.ConnectionError(err) from err
+
+        return _build_response(
+            url, raw.status, raw.headers, raw if stream else raw.data,
+            raw.reason)
+
+    def send(self, method, url, params=None, data=None, headers=None):
+        return self._request(
+            method, url, False, params=params, data=data, headers=headers)
+
+    def stream(self, method, url, params=None, headers=None):
+        return self._request(
+            method, url, True, params=params, headers=headers)
+
+    def close(self):
+        self._pool.clear()
+
+
+class CannedResponse(object):
+    """Response served by a :class:`FakeTransport`"""
+
+    def __init__(self, data, status=200, headers=None):
+        """
+        Args:
+            data (dict): JSON data to return
+            status (int): HTTP status code to return
+            headers (dict): optional additional HTTP headers to return
+        """
+        self.data = data
+        self.status = status
+        self.headers = dict(headers or {})
+
+
+class FakeTransport(Transport):
+    """Serves canned JSON data from memory, without any network traffic
+
+    Responses are registered for a path relative to the root of the REST
+    API, optionally limited to requests with specific query parameters.
+    When several registered responses match a request, the one matching
+    the most query parameters wins. Requests that match no response get
+    a 404 error. Every response includes rate limit headers, with the
+    number of remaining requests decreasing with each request made.
+
+    Example:
+
+        >>> transport = FakeTransport()
+        >>> transport.add_response("me", {"data": {"id": "1234"}})
+        >>> transport.add_response(
+        >>>     "pins/1", CannedResponse({"message": "Gone"}, status=404))
+        >>> with API(token, transport=transport) as api:
+        >>>     print(api.user.unique_id)
+    """
+
+    def __init__(self, rate_limit=1000, rate_refresh=3600):
+        """
+        Args:
+            rate_limit (int):
+                number of requests reported as being allowed per hour
+            rate_refresh (int):
+                number of seconds reported until the rate limit refreshes
+        """
+        self._lock = threading.Lock()
+        self._responses = list()
+        self._requests = list()
+        self._rate_limit = rate_limit
+        self._rate_refresh = rate_refresh
+
+    @property
+    def requests(self):
+        """list (tuple):
+        method, URL and query parameters for every request received"""
+        return self._requests
+
+    def add_response(self, path, response, params=None, method="get"):
+        """Registers a canned response
+
+        Args:
+            path (str): sub-path with in the REST API to respond to
+            response (dict):
+                JSON data to return with a 200 status code, or a
+                :class:`CannedResponse` describing the full response
+            params (dict):
+                optional query parameters a request must have to receive
+                this response
+            method (str): HTTP method to respond to
+        """
+        if not isinstance(response, CannedResponse):
+            response = CannedResponse(response)
+        body = json.dumps(response.data).encode("utf-8")
+        with self._lock:
+            self._responses.append({
+                "path": path.strip("/"),
+                "params": dict(params or {}),
+                "method": method.lower(),
+                "status": response.status,
+                "headers": response.headers,
+                "body": body,
+            })
+
+    def _find(self, method, url, params):
+        """Locates the registered response for a request
+
+        Returns:
+            dict: details of the response, or None if there is no match
+        """
+        path = urlparse(url).path.strip("/")
+        best = None
+        best_params = -1
+        for cur in self._responses:
+            if cur["method"] != method.lower():
+                continue
+            if path != cur["path"] and not path.endswith("/" + cur["path"]):
+                continue
+            matched = all(
+                str(params.get(key)) == str(value)
+                for key, value in cur["params"].items())
+            if not matched:
+                continue
+            if len(cur["params"]) >= best_params:
+                best = cur
+                best_params = len(cur["params"])
+        return best
+
+    def _respond(self, method, url, params):
+        """Generates the response for a request
+
+        Returns:
+            tuple: status code, headers and body for the response
+        """
+        query = dict(parse_qsl(urlparse(url).query))
+        query.update(params or {})
+        with self._lock:
+            self._requests.append((method.lower(), url, query))
+            remaining = max(self._rate_limit - len(self._requests), 0)
+            found = self._find(method, url, query)
+
+        if found is None:
+            status = 404
+            headers = dict()
+            body = json.dumps({"message": "Not found"}).encode("utf-8")
+        else:
+            status = found["status"]
+            headers = dict(found["headers"])
+            body = found["body"]
+
+        headers.setdefault("Content-Type", "application/json")
+        headers.setdefault("Date", formatdate(usegmt=True))
+        headers["Content-Length"] = str(len(body))
+        headers.setdefault("X-Ratelimit-Limit", str(self._rate_limit))
+        headers.setdefault("X-Ratelimit-Remaining", str(remaining))
+        headers.setdefault("X-Ratelimit-Refresh", str(self._rate_refresh))
+        return status, headers, body
+
+    def send(self, method, url, params=None, data=None, headers=None):
+        status, response_headers, body = self._respond(method, url, params)
+        return _build_response(url, status, response_headers, body)
+
+    def stream(self, method, url, params=None, headers=None):
+        # our data is already in memory, so streaming it just means handing
+        # it out in chunks
+        response = self.send(method, url, params)
+        # pylint: disable=protected-access
+        response._content_consumed = True
+        return response
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 import yaml
 import pytest
+from friendlypins.utils.transport import FakeTransport
 
 CUR_PATH = Path(__file__).parent
 DEFAULT_KEY_FILE = CUR_PATH.parent.joinpath("key.txt")
@@ -104,6 +105,9 @@ def vcr_config(request):
         # data more readable, and to ensure there are no embedded references
         # to our authentication token
         "decode_compressed_response": True,
+        # Allow connections to our local API emulator, even
+        # when the test suite is run with the --block-network option
+        "allowed_hosts": ["127.0.0.1"],
     }
 
     # If we don't have an explicit mode set, default to "once"
@@ -144,6 +148,29 @@ def test_env(request):
     yield retval
 
 
+@pytest.fixture
+def fake_transport():
+    """Transport serving canned responses for a small Pinterest account:
+    pins 1 to 5, board 2, and the pins on board 1234 split over 2 pages"""
+    transport = FakeTransport(rate_limit=1000)
+    pins = [{"id": str(i), "note": "pin {0}".format(i),
+             "link": "http://example.com"} for i in range(1, 6)]
+    for cur in pins:
+        transport.add_response("pins/" + cur["id"], {"data": cur})
+    transport.add_response("pins/1", {}, method="delete")
+    transport.add_response("boards/2", {"data": {"id": "2", "name": "b"}})
+    transport.add_response("me/boards", {"data": {"id": "5"}}, method="post")
+    transport.add_response("boards/1234/pins", {
+        "data": pins[:3],
+        "page": {"cursor": "abc"},
+    })
+    transport.add_response("boards/1234/pins", {
+        "data": pins[3:],
+        "page": {"cursor": None},
+    }, params={"cursor": "abc"})
+    return transport
+
+
 def pytest_collection_modifyitems(config, items):
     """Applies command line customizations to filter tests to be run"""
     if not config.getoption("--skip-functional"):
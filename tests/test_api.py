@@ -18,7 +18,7 @@ def test_get_user():
             'id': str(expected_id)
         }
     }
-    with mock.patch("friendlypins.api.RestIO") as mock_io:
+    with mock.patch("friendlypins.api.RestIO.from_kwargs") as mock_io:
         mock_obj = mock.MagicMock()
         mock_obj.get.return_value = expected_data
         mock_io.return_value = mock_obj
@@ -32,31 +32,31 @@ def test_get_user():
         assert expected_id == result.unique_id
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_board_by_id(mock_requests):
     mock_response = mock.MagicMock()
-    mock_requests.get.return_value = mock_response
+    mock_requests.Session.return_value.get.return_value = mock_response
 
     obj = API("abcd1234")
     result = obj.get_board_by_id("1234")
     assert result is not None
     assert isinstance(result, Board)
-    assert mock_requests.get.call_count == 0
+    assert mock_requests.Session.return_value.get.call_count == 0
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_pin_by_id(mock_requests):
     mock_response = mock.MagicMock()
-    mock_requests.get.return_value = mock_response
+    mock_requests.Session.return_value.get.return_value = mock_response
 
     obj = API("abcd1234")
     result = obj.get_pin_by_id("1234")
     assert result is not None
     assert isinstance(result, Pin)
-    assert mock_requests.get.call_count == 0
+    assert mock_requests.Session.return_value.get.call_count == 0
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_transaction_limit(mock_requests):
     mock_response = mock.MagicMock()
     expected_rate_limit = 100
@@ -75,14 +75,16 @@ def test_transaction_limit(mock_requests):
       'Connection': 'keep-alive',
       'Pinterest-Generated-By': '',
     }
-    mock_requests.get.return_value = mock_response
+    mock_response.content = b'{"data": {"id": "1234"}}'
+    mock_requests.Session.return_value.get.return_value = mock_response
 
     obj = API("abcd1234")
+    assert obj.get_pin_by_id(1234).unique_id == 1234
     assert obj.transaction_limit == expected_rate_limit
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_transaction_remaining(mock_requests):
     mock_response = mock.MagicMock()
     expected_rate_remaining = 10
@@ -101,15 +103,17 @@ def test_transaction_remaining(mock_requests):
       'Connection': 'keep-alive',
       'Pinterest-Generated-By': '',
     }
-    mock_requests.get.return_value = mock_response
+    mock_response.content = b'{"data": {"id": "1234"}}'
+    mock_requests.Session.return_value.get.return_value = mock_response
 
     obj = API("abcd1234")
+    assert obj.get_pin_by_id(1234).unique_id == 1234
     tmp = obj.transaction_remaining
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
     assert tmp == expected_rate_remaining
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_rate_refresh(mock_requests):
     mock_response = mock.MagicMock()
     refresh_time = 30
@@ -131,11 +135,30 @@ def test_rate_refresh(mock_requests):
       'Pinterest-Generated-By': '',
       'X-Ratelimit-Refresh': str(refresh_time)
     }
-    mock_requests.get.return_value = mock_response
+    mock_requests.Session.return_value.get.return_value = mock_response
 
     obj = API("abcd1234")
+    obj.refresh_rate_limit()
     tmp = obj.rate_limit_refresh
 
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
     tmp = tmp.astimezone(tz.tzutc())
     assert tmp.strftime("%a, %d %b %Y %H:%M:%S") == expected_time_str
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rate_limit_unknown(mock_requests):
+    obj = API("abcd1234")
+    assert obj.transaction_limit is None
+    assert obj.transaction_remaining is None
+    assert obj.rate_limit_refresh is None
+    assert obj.rate_limit.stale
+    mock_requests.Session.return_value.get.assert_not_called()
+
+
+def test_close():
+    with mock.patch("friendlypins.api.RestIO.from_kwargs") as mock_io:
+        with API("abcd1234", pool_maxsize=4) as obj:
+            assert obj is not None
+        mock_io.assert_called_once_with("abcd1234", pool_maxsize=4)
+        mock_io.return_value.close.assert_called_once()
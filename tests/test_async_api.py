@@ -0,0 +1,172 @@
+import asyncio
+import mock
+import pytest
+from friendlypins.api import AsyncAPI
+from friendlypins.utils.async_rest_io import AsyncRestIO
+from friendlypins.board import Board, AsyncBoard
+from friendlypins.pin import Pin, AsyncPin
+from friendlypins.exceptions import ObjectNotLoadedError
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_load_pin(mock_io):
+    expected_note = "My pin"
+    mock_io.return_value.get.return_value = {
+        "data": {"id": "1234", "note": expected_note}
+    }
+
+    async def action():
+        async with AsyncAPI("abcd1234") as obj:
+            pin = obj.get_pin_by_id(1234)
+            assert isinstance(pin, AsyncPin)
+            assert not pin.is_loaded
+            with pytest.raises(ObjectNotLoadedError):
+                pin.note
+            await pin.load()
+            # a second load must not hit the API again
+            await pin.load()
+            return pin
+
+    result = run(action())
+    assert result.note == expected_note
+    assert result.unique_id == 1234
+    mock_io.return_value.get.assert_called_once()
+    mock_io.return_value.close.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_board_pins(mock_io):
+    mock_io.next_cursor.side_effect = lambda page: page["page"]["cursor"]
+    mock_io.return_value.get.side_effect = [
+        {"data": [{"id": "1"}, {"id": "2"}], "page": {"cursor": "abc"}},
+        {"data": [{"id": "3"}], "page": {"cursor": None}},
+    ]
+
+    async def action():
+        async with AsyncAPI("abcd1234") as obj:
+            board = obj.get_board_by_id(6789)
+            return [cur_pin async for cur_pin in board.pins]
+
+    pins = run(action())
+    assert [cur_pin.unique_id for cur_pin in pins] == [1, 2, 3]
+    assert all(isinstance(cur_pin, AsyncPin) for cur_pin in pins)
+    assert mock_io.return_value.get.call_count == 2
+    assert mock_io.return_value.get.call_args[0][0] == "boards/6789/pins"
+    assert mock_io.return_value.get.call_args[0][1]["cursor"] == "abc"
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_board_pins_prefetched(mock_io):
+    mock_io.next_cursor.side_effect = lambda page: page["page"]["cursor"]
+    mock_io.return_value.get.side_effect = [
+        {"data": [{"id": "1"}], "page": {"cursor": "abc"}},
+        {"data": [{"id": "2"}], "page": {"cursor": "def"}},
+        {"data": [{"id": "3"}], "page": {"cursor": None}},
+    ]
+
+    async def action():
+        async with AsyncAPI("abcd1234", prefetch_pages=1) as obj:
+            board = obj.get_board_by_id(6789)
+            return [cur_pin async for cur_pin in board.pins]
+
+    pins = run(action())
+    assert [cur_pin.unique_id for cur_pin in pins] == [1, 2, 3]
+    assert mock_io.return_value.get.call_count == 3
+    mock_io.assert_called_once_with("abcd1234", pool_maxsize=10, prefetch_pages=1)
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_prefetch_closes_source_when_abandoned(mock_io):
+    closed = []
+
+    async def load_pages(path, properties):
+        try:
+            for index in range(10):
+                yield {"data": [index]}
+        finally:
+            closed.append(path)
+
+    async def action():
+        obj = AsyncRestIO("abcd1234", prefetch_pages=2)
+        obj._load_pages = load_pages
+        pages = obj.get_pages("me/pins")
+        first = await pages.__anext__()
+        await pages.aclose()
+        return first
+
+    assert run(action()) == {"data": [0]}
+    assert closed == ["me/pins"]
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_user_boards_and_create(mock_io):
+    mock_io.next_cursor.return_value = None
+    expected_name = "My Board"
+    mock_io.return_value.get.return_value = {
+        "data": [{"id": "6789", "name": expected_name}]
+    }
+    mock_io.return_value.post.return_value = {
+        "data": {"id": "1111", "name": "New Board"}
+    }
+
+    async def action():
+        async with AsyncAPI("abcd1234") as obj:
+            boards = [cur async for cur in obj.user.boards]
+            new_board = await obj.user.create_board("New Board")
+            return boards, new_board
+
+    boards, new_board = run(action())
+    assert len(boards) == 1
+    assert isinstance(boards[0], AsyncBoard)
+    assert boards[0].name == expected_name
+    assert new_board.unique_id == 1111
+    mock_io.return_value.post.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_transaction_remaining(mock_io):
+    expected_remaining = 10
+    snapshot = mock_io.return_value.rate_limit_state.snapshot.return_value
+    snapshot.rate_remaining = expected_remaining
+
+    async def action():
+        async with AsyncAPI("abcd1234") as obj:
+            return obj.transaction_remaining
+
+    assert run(action()) == expected_remaining
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_refresh_rate_limit(mock_io):
+    expected_remaining = 10
+    snapshot = mock_io.return_value.rate_limit_state.snapshot.return_value
+    snapshot.rate_remaining = expected_remaining
+
+    async def action():
+        async with AsyncAPI("abcd1234") as obj:
+            return await obj.refresh_rate_limit()
+
+    assert run(action()).rate_remaining == expected_remaining
+    mock_io.return_value.probe_rate_limit.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.async_rest_io.RestIO.from_kwargs")
+def test_stream_pages_rejected(mock_io):
+    with pytest.raises(TypeError):
+        AsyncAPI("abcd1234", stream_pages=True)
+    mock_io.assert_not_called()
+
+
+def test_async_models_are_not_blocking_models():
+    # the asynchronous models share properties with the blocking ones, but
+    # can not be used in their place
+    assert not issubclass(AsyncBoard, Board)
+    assert not issubclass(AsyncPin, Pin)
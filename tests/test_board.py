@@ -68,3 +68,14 @@ def test_delete():
     obj.delete()
 
     mock_io.delete.assert_called_once_with(expected_url)
+
+
+def test_get_pins_prefetch():
+    mock_io = mock.MagicMock()
+    mock_io.get_pages.return_value = [{"data": [{"id": "1"}, {"id": "2"}]}]
+    obj = Board("boards/1234", mock_io)
+
+    pins = list(obj.get_pins(prefetch_pages=2))
+
+    assert [cur.unique_id for cur in pins] == [1, 2]
+    assert mock_io.get_pages.call_args[1]["prefetch_pages"] == 2
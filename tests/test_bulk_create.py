@@ -0,0 +1,151 @@
+import json
+import logging
+import mock
+import pytest
+from friendlypins.api import API
+from friendlypins.utils.bulk_create import bulk_create, read_manifest, \
+    write_results, row_type, board_id
+from friendlypins.utils.console_actions import create_from_manifest, \
+    estimate_create_from_manifest
+from friendlypins.testing.emulator import (
+    Emulator, EmulatorServer, SyntheticAccount)
+import friendlypins.utils.console_actions as ca
+ca.DISABLE_PROGRESS_BARS = True
+
+FIRST_BOARD_ID = 500000000000000000
+
+ROWS = [
+    {"name": "Recipes", "description": "Things to cook"},
+    {"board": "Recipes", "note": "Soup",
+     "image_url": "https://www.example.com/soup.jpg"},
+    {"board": "Board 0", "note": "Bread",
+     "image_url": "https://www.example.com/bread.jpg",
+     "link": "https://www.example.com/bread"},
+    {"board": "id:{0}".format(FIRST_BOARD_ID + 1), "note": "Cake",
+     "image_url": "https://www.example.com/cake.jpg"},
+    {"board": "Nope", "note": "Lost",
+     "image_url": "https://www.example.com/lost.jpg"},
+    {"type": "section", "name": "Unsupported"},
+    {"type": "board"},
+]
+
+
+def test_row_type():
+    assert row_type({"name": "Recipes"}) == "board"
+    assert row_type({"image_url": "https://www.example.com/a.jpg"}) == "pin"
+    assert row_type({"type": " Pin ", "name": "Recipes"}) == "pin"
+
+
+def test_board_id():
+    assert board_id("id:1234") == "1234"
+    assert board_id("2024") is None
+    assert board_id("Recipes") is None
+
+
+def test_bulk_create():
+    account = SyntheticAccount(num_boards=2, pins_per_board=1)
+    emulator = Emulator(account)
+    progress = list()
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            results = bulk_create(
+                obj, ROWS, concurrency=2, progress=progress.append)
+            boards = {cur.name: cur for cur in obj.user.boards}
+            soup = [cur.note for cur in boards["Recipes"].pins]
+            bread = [cur.link for cur in boards["Board 0"].pins]
+            cake = [cur.note for cur in boards["Board 1"].pins]
+
+    assert [cur.line for cur in results] == list(range(1, len(ROWS) + 1))
+    assert len(progress) == len(ROWS)
+    assert [cur.succeeded for cur in results] == [
+        True, True, True, True, False, False, False]
+    assert results[0].unique_id == boards["Recipes"].unique_id
+    assert "Nope" in str(results[4].error)
+    assert "section" in str(results[5].error)
+    assert soup == ["Soup"]
+    assert "https://www.example.com/bread" in bread
+    assert "Cake" in cake
+
+
+def test_numeric_board_names():
+    account = SyntheticAccount(num_boards=2, pins_per_board=1)
+    emulator = Emulator(account)
+    rows = [
+        {"board": "2024", "note": "Party",
+         "image_url": "https://www.example.com/party.jpg"},
+    ]
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            obj.user.create_board("2024")
+            results = bulk_create(obj, rows)
+            boards = {cur.name: cur for cur in obj.user.boards}
+            notes = [cur.note for cur in boards["2024"].pins]
+
+    assert all(cur.succeeded for cur in results)
+    assert notes == ["Party"]
+
+
+def test_manifest_formats(tmp_path):
+    jsonl = tmp_path / "manifest.jsonl"
+    jsonl.write_text("\n".join(json.dumps(cur) for cur in ROWS[:3]) + "\n\n")
+    csv_file = tmp_path / "manifest.csv"
+    csv_file.write_text(
+        "type,name,board,note,image_url\n"
+        "board,Recipes,,,\n"
+        "pin,,Recipes,Soup,https://www.example.com/soup.jpg\n")
+
+    assert read_manifest(str(jsonl)) == ROWS[:3]
+    assert read_manifest(str(csv_file)) == [
+        {"type": "board", "name": "Recipes"},
+        {"type": "pin", "board": "Recipes", "note": "Soup",
+         "image_url": "https://www.example.com/soup.jpg"},
+    ]
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_console_action(mock_api, tmp_path, caplog):
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "name,board,note,image_url\n"
+        "Recipes,,,\n"
+        ",Recipes,Soup,https://www.example.com/soup.jpg\n"
+        ",Nope,Lost,https://www.example.com/lost.jpg\n")
+    results = tmp_path / "results.csv"
+    account = SyntheticAccount(num_boards=2, pins_per_board=1)
+    emulator = Emulator(account)
+    with EmulatorServer(emulator) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        with caplog.at_level(logging.INFO):
+            assert estimate_create_from_manifest(
+                "1234abcd", str(manifest)) == 0
+            assert create_from_manifest(
+                "1234abcd", str(manifest), str(results)) == 2
+
+    assert "creating 3 objects from" in caplog.text
+    assert "Objects created: 2" in caplog.text
+    assert "line 3: Board not found: Nope" in caplog.text
+    lines = results.read_text().splitlines()
+    assert lines[0] == "line,type,name,board,id,error"
+    assert lines[1].startswith("1,board,Recipes,,")
+    assert lines[2].startswith("2,pin,Soup,Recipes,7")
+    assert lines[3].endswith("Board not found: Nope")
+
+
+def test_write_jsonl_results(tmp_path):
+    path = tmp_path / "results.jsonl"
+    account = SyntheticAccount(num_boards=1, pins_per_board=1)
+    emulator = Emulator(account)
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            write_results(str(path), bulk_create(obj, ROWS[:2]))
+
+    rows = [json.loads(cur) for cur in path.read_text().splitlines()]
+    assert [cur["type"] for cur in rows] == ["board", "pin"]
+    assert rows[1]["name"] == "Soup"
+    assert all(cur["id"] and cur["error"] is None for cur in rows)
+
+
+def test_no_workers():
+    with pytest.raises(ValueError):
+        bulk_create(mock.MagicMock(), ROWS, concurrency=0)
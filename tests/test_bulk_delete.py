@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+import mock
+from dateutil import tz
+from friendlypins.api import API, AsyncAPI
+from friendlypins.pin import Pin
+from friendlypins.utils.bulk_delete import older_than, media_type_in, \
+    link_domain_in, all_of, delete_pins
+from friendlypins.utils.console_actions import delete_pins as delete_action
+from friendlypins.utils.console_actions import estimate_delete_pins
+from friendlypins.testing.emulator import (
+    Emulator, EmulatorServer, SyntheticAccount)
+from friendlypins.utils.rate_governor import RateGovernor
+import friendlypins.utils.console_actions as ca
+ca.DISABLE_PROGRESS_BARS = True
+
+
+def make_pin(created_at="2020-07-21T20:49:16", media_type="image",
+             link="https://www.example.com/article"):
+    return Pin.from_json({
+        "id": "1234",
+        "created_at": created_at,
+        "media": {"type": media_type},
+        "link": link,
+    }, mock.MagicMock())
+
+
+def is_even(pin):
+    return pin.unique_id % 2 == 0
+
+
+def test_predicates():
+    pin = make_pin()
+    assert older_than(timedelta(days=30))(pin)
+    assert not older_than(datetime(2019, 1, 1, tzinfo=tz.tzutc()))(pin)
+    assert media_type_in("video", "image")(pin)
+    assert not media_type_in("video")(pin)
+    assert link_domain_in("example.com")(pin)
+    assert link_domain_in("www.example.com")(pin)
+    assert not link_domain_in("ample.com")(pin)
+    assert not link_domain_in("example.com")(make_pin(link=None))
+    assert all_of(media_type_in("image"), link_domain_in("example.com"))(pin)
+    assert not all_of(media_type_in("image"), media_type_in("video"))(pin)
+
+
+def test_delete_matching_pins():
+    account = SyntheticAccount(num_boards=1, pins_per_board=60)
+    emulator = Emulator(account, page_size=10)
+    progress = list()
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            board = next(iter(obj.user.boards))
+            summary = board.delete_pins(
+                is_even, concurrency=3,
+                progress=lambda cur: progress.append(cur.scanned))
+            remaining = [cur.unique_id for cur in board.pins]
+
+    assert summary.scanned == 60
+    assert summary.matched == 30
+    assert len(summary.deleted) == 30
+    assert not summary.failed
+    assert summary.pending == 0
+    assert all(is_even(cur) for cur in [
+        Pin.from_json({"id": str(pin_id)}, None)
+        for pin_id in summary.deleted])
+    assert len(remaining) == 30
+    assert not any(cur % 2 == 0 for cur in remaining)
+    assert progress[-1] == 60
+    assert "Pins deleted: 30" in summary.describe()
+
+
+def test_failures_reported():
+    pins = [make_pin() for _ in range(3)]
+    pins[1].delete = mock.MagicMock(side_effect=RuntimeError("Gone"))
+    pins[0].delete = mock.MagicMock()
+    pins[2].delete = mock.MagicMock()
+    broken = Pin.from_json({"id": "5678"}, None)
+
+    summary = delete_pins(pins + [broken], older_than(timedelta(days=1)))
+
+    assert summary.scanned == 4
+    assert summary.matched == 3
+    assert summary.pending == 0
+    assert len(summary.deleted) == 2
+    assert [cur[0] for cur in summary.failed].count(1234) == 1
+    assert 5678 in [cur[0] for cur in summary.failed]
+    assert "Pins that could not be deleted: 2" in summary.describe()
+
+
+def test_async_delete_pins():
+    account = SyntheticAccount(num_boards=1, pins_per_board=20)
+    emulator = Emulator(account, page_size=10)
+
+    async def action(url):
+        async with AsyncAPI("1234abcd", root_url=url) as obj:
+            async for board in obj.user.boards:
+                return await board.delete_pins(is_even, concurrency=2)
+
+    with EmulatorServer(emulator) as server:
+        summary = asyncio.run(action(server.url))
+
+    assert summary.scanned == 20
+    assert len(summary.deleted) == 10
+    assert not summary.failed
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_console_action(mock_api, caplog):
+    account = SyntheticAccount(num_boards=2, pins_per_board=30)
+    emulator = Emulator(account)
+    with EmulatorServer(emulator) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        with caplog.at_level(logging.INFO):
+            assert estimate_delete_pins(
+                "1234abcd", "Board 1", is_even) == 0
+            assert delete_action("1234abcd", "Board 1", is_even) == 0
+            assert delete_action("1234abcd", "Nope", is_even) == 1
+
+    assert isinstance(mock_api.call_args[1]["governor"], RateGovernor)
+
+    assert "deleting 15 of 30 pins from Board 1" in caplog.text
+    assert "Pins deleted: 15" in caplog.text
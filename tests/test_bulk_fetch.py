@@ -0,0 +1,81 @@
+import mock
+import pytest
+import requests
+from friendlypins.api import API
+from friendlypins.pin import Pin
+from friendlypins.utils.bulk_fetch import bulk_fetch
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer, SyntheticAccount)
+from friendlypins.utils.transport import FakeTransport
+
+FIRST_BOARD_ID = 500000000000000000
+FIRST_PIN_ID = 700000000000000000
+
+
+def test_get_pins_in_order():
+    account = SyntheticAccount(num_boards=1, pins_per_board=30)
+    emulator = Emulator(
+        account, conditions=ApiConditions(latency=lambda: 0.02))
+    pin_ids = [FIRST_PIN_ID + cur for cur in reversed(range(30))]
+    pin_ids.insert(10, 1234)
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            results = list(obj.get_pins_by_ids(pin_ids, max_workers=4))
+
+    assert [cur.unique_id for cur in results] == pin_ids
+    assert not results[10].succeeded
+    assert isinstance(results[10].error, requests.HTTPError)
+    loaded = [cur for cur in results if cur.succeeded]
+    assert len(loaded) == 30
+    assert all(cur.item.unique_id == cur.unique_id for cur in loaded)
+    # the data was loaded as part of the batch
+    assert loaded[0].item.note
+    assert emulator.requests == 31
+
+
+def test_get_boards_completion_order():
+    account = SyntheticAccount(num_boards=5, pins_per_board=1)
+    emulator = Emulator(account)
+    board_ids = [FIRST_BOARD_ID + cur for cur in range(5)]
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            results = list(obj.get_boards_by_ids(
+                iter(board_ids), max_workers=2, ordered=False))
+
+    assert sorted(cur.unique_id for cur in results) == board_ids
+    assert sorted(cur.item.name for cur in results) == [
+        "Board {0}".format(cur) for cur in range(5)]
+    assert emulator.requests == 5
+
+
+def test_governor_respected():
+    transport = FakeTransport()
+    for cur in range(10):
+        transport.add_response(
+            "pins/{0}".format(cur), {"data": {"id": str(cur)}})
+    governor = mock.MagicMock()
+    with API("1234abcd", transport=transport, governor=governor) as obj:
+        results = list(obj.get_pins_by_ids(range(10)))
+
+    assert all(cur.succeeded for cur in results)
+    assert governor.acquire.call_count == 10
+    assert governor.update.call_count == 10
+
+
+def test_stop_early():
+    transport = FakeTransport()
+    for cur in range(100):
+        transport.add_response(
+            "pins/{0}".format(cur), {"data": {"id": str(cur)}})
+    with API("1234abcd", transport=transport) as obj:
+        results = obj.get_pins_by_ids(range(100), max_workers=2)
+        assert next(results).unique_id == 0
+        results.close()
+
+    # only the first few requests were ever sent
+    assert len(transport.requests) <= 4
+
+
+def test_no_workers():
+    with pytest.raises(ValueError):
+        next(bulk_fetch(Pin, [1], mock.MagicMock(), max_workers=0))
@@ -0,0 +1,137 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from friendlypins.utils.response_cache import MemoryCache
+from friendlypins.utils.rest_io import RestIO
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Serves a single pin, honoring conditional request headers"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        state = self.server.state
+        etag = self.headers.get("If-None-Match")
+        modified = self.headers.get("If-Modified-Since")
+        if state["etag"] is not None:
+            not_modified = etag == state["etag"]
+        else:
+            not_modified = modified == state["modified"]
+        if not_modified:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"data": state["data"]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if state["etag"]:
+            self.send_header("ETag", state["etag"])
+        self.send_header("Last-Modified", state["modified"])
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = HTTPServer(("127.0.0.1", 0), ConditionalHandler)
+    server.requests = list()
+    server.state = {
+        "etag": '"v1"',
+        "modified": "Sat, 31 Mar 2018 10:58:09 GMT",
+        "data": {"id": "1234", "note": "original note"},
+    }
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(server, cache):
+    url = "http://127.0.0.1:{0}/v1".format(server.server_port)
+    return RestIO.from_kwargs("1234abcd", root_url=url, cache=cache)
+
+
+def test_not_modified(stub_server):
+    clock = FakeClock()
+    cache = MemoryCache(default_ttl=60, clock=clock)
+    with make_client(stub_server, cache) as obj:
+        first = obj.get("pins/1234")
+        first_size = obj.headers.bytes
+        # fresh data must be served from the cache
+        obj.get("pins/1234")
+        assert len(stub_server.requests) == 1
+
+        clock.now += 61
+        second = obj.get("pins/1234")
+
+    assert first == second
+    assert len(stub_server.requests) == 2
+    assert "If-None-Match" not in stub_server.requests[0]
+    assert stub_server.requests[1]["If-None-Match"] == '"v1"'
+    assert obj.bytes_saved == first_size > 0
+    assert cache.revalidations == 1
+
+
+def test_modified(stub_server):
+    clock = FakeClock()
+    cache = MemoryCache(default_ttl=60, clock=clock)
+    with make_client(stub_server, cache) as obj:
+        obj.get("pins/1234")
+        stub_server.state["etag"] = '"v2"'
+        stub_server.state["data"] = {"id": "1234", "note": "new note"}
+
+        clock.now += 61
+        result = obj.get("pins/1234")
+        assert result["data"]["note"] == "new note"
+
+        # the new validators must be used for the next revalidation
+        clock.now += 61
+        obj.get("pins/1234")
+
+    assert stub_server.requests[1]["If-None-Match"] == '"v1"'
+    assert stub_server.requests[2]["If-None-Match"] == '"v2"'
+    assert obj.bytes_saved > 0
+    assert cache.revalidations == 1
+
+
+def test_last_modified_only(stub_server):
+    clock = FakeClock()
+    cache = MemoryCache(default_ttl=60, clock=clock)
+    stub_server.state["etag"] = None
+    with make_client(stub_server, cache) as obj:
+        first = obj.get("pins/1234")
+        clock.now += 61
+        assert obj.get("pins/1234") == first
+
+    assert "If-None-Match" not in stub_server.requests[1]
+    assert stub_server.requests[1]["If-Modified-Since"] == \
+        stub_server.state["modified"]
+    assert cache.revalidations == 1
+
+
+def test_without_cache(stub_server):
+    with make_client(stub_server, None) as obj:
+        obj.get("pins/1234")
+        obj.get("pins/1234")
+
+    assert len(stub_server.requests) == 2
+    assert "If-None-Match" not in stub_server.requests[1]
+    assert obj.bytes_saved == 0
@@ -1,7 +1,7 @@
 import mock
 import os
 from friendlypins.utils.console_actions import download_thumbnails, \
-    delete_board, create_board
+    delete_board, create_board, StorageOptions
 import friendlypins.utils.console_actions as ca
 ca.DISABLE_PROGRESS_BARS = True
 
@@ -9,7 +9,7 @@ ca.DISABLE_PROGRESS_BARS = True
 @mock.patch("friendlypins.utils.console_actions.os")
 @mock.patch("friendlypins.utils.console_actions.open")
 @mock.patch("friendlypins.utils.console_actions.requests")
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_download_thumbnails(rest_io, action_requests, mock_open, mock_os):
 
     # Fake user data for the user authenticating to Pinterest
@@ -80,7 +80,7 @@ def test_download_thumbnails(rest_io, action_requests, mock_open, mock_os):
     # Make sure the call was successful, and that our mock APIs
     # that must have executed as part of the process were called
     assert result == 0
-    action_requests.get.assert_called_once_with(expected_thumbnail_url, stream=True)
+    action_requests.Session.return_value.get.assert_called_once_with(expected_thumbnail_url, stream=True)
     mock_os.makedirs.assert_called()
     mock_os.path.exists.assert_called()
     mock_open.assert_called()
@@ -89,7 +89,7 @@ def test_download_thumbnails(rest_io, action_requests, mock_open, mock_os):
 @mock.patch("friendlypins.utils.console_actions.os")
 @mock.patch("friendlypins.utils.console_actions.open")
 @mock.patch("friendlypins.utils.console_actions.requests")
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_download_thumbnails_error(rest_io, action_requests, mock_open, mock_os):
 
     # Fake user data for the user authenticating to Pinterest
@@ -157,7 +157,7 @@ def test_download_thumbnails_error(rest_io, action_requests, mock_open, mock_os)
     # Fake an exception / error condition when downloading our thumbnail
     mock_action_response = mock.MagicMock()
     mock_action_response.raise_for_status.side_effect = Exception('Ooops!')
-    action_requests.get.return_value = mock_action_response
+    action_requests.Session.return_value.get.return_value = mock_action_response
 
     # Flex our code
     result = download_thumbnails("1234abcd", expected_board_name, "/tmp")
@@ -165,7 +165,7 @@ def test_download_thumbnails_error(rest_io, action_requests, mock_open, mock_os)
     # Make sure the call was successful, and that our mock APIs
     # that must have executed as part of the process were called
     assert result != 0
-    action_requests.get.assert_called_once_with(expected_thumbnail_url, stream=True)
+    action_requests.Session.return_value.get.assert_called_once_with(expected_thumbnail_url, stream=True)
     mock_os.makedirs.assert_called()
     mock_os.path.exists.assert_called()
     assert not mock_open.called
@@ -174,7 +174,7 @@ def test_download_thumbnails_error(rest_io, action_requests, mock_open, mock_os)
 @mock.patch("friendlypins.utils.console_actions.os")
 @mock.patch("friendlypins.utils.console_actions.open")
 @mock.patch("friendlypins.utils.console_actions.requests")
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_download_thumbnails_missing_board(rest_io, action_requests, mock_open, mock_os):
 
     # Fake user data for the user authenticating to Pinterest
@@ -245,7 +245,7 @@ def test_download_thumbnails_missing_board(rest_io, action_requests, mock_open,
     # Make sure the call was successful, and that our mock APIs
     # that must have executed as part of the process were called
     assert result != 0
-    assert not action_requests.get.called
+    assert not action_requests.Session.return_value.get.called
     assert not mock_os.makedirs.called
     assert not mock_os.path.exists.called
     assert not mock_open.called
@@ -254,7 +254,7 @@ def test_download_thumbnails_missing_board(rest_io, action_requests, mock_open,
 @mock.patch("friendlypins.utils.console_actions.os")
 @mock.patch("friendlypins.utils.console_actions.open")
 @mock.patch("friendlypins.utils.console_actions.requests")
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_download_thumbnails_exists(rest_io, action_requests, mock_open, mock_os):
 
     # Fake user data for the user authenticating to Pinterest
@@ -329,13 +329,13 @@ def test_download_thumbnails_exists(rest_io, action_requests, mock_open, mock_os
     # Make sure the call was successful, and that our mock APIs
     # that must have executed as part of the process were called
     assert result == 0
-    assert not action_requests.get.called
+    assert not action_requests.Session.return_value.get.called
     assert not mock_os.makedirs.called
     mock_os.path.exists.assert_called_with(os.path.join(output_folder, expected_filename))
     assert not mock_open.called
 
 
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_delete_board(rest_io):
 
     # Fake user data for the user authenticating to Pinterest
@@ -381,7 +381,7 @@ def test_delete_board(rest_io):
     mock_response.delete.assert_called_once_with('boards/' + str(expected_board_id))
 
 
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_delete_missing_board(rest_io):
 
     # Fake user data for the user authenticating to Pinterest
@@ -427,7 +427,7 @@ def test_delete_missing_board(rest_io):
     mock_response.delete.assert_not_called()
 
 
-@mock.patch("friendlypins.api.RestIO")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
 def test_create_board(rest_io):
     # Fake user data for the user authenticating to Pinterest
     expected_user_data = {
@@ -462,3 +462,25 @@ def test_create_board(rest_io):
 
     # The post operation should have occurred once to create the board
     mock_response.post.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.console_actions.SqliteCache")
+@mock.patch("friendlypins.api.RestIO.from_kwargs")
+def test_create_board_with_cache(rest_io, mock_cache):
+    expected_name = "My Board"
+    mock_response = mock.MagicMock()
+    rest_io.return_value = mock_response
+    mock_response.post.return_value = {
+        "data": {
+            "name": expected_name,
+            "id": "12345"
+        }
+    }
+
+    res = create_board(
+        "1234abcd", expected_name, StorageOptions(cache_path="/tmp/cache.db"))
+
+    assert res == 0
+    mock_cache.assert_called_once_with("/tmp/cache.db")
+    assert rest_io.call_args[1]["cache"] is mock_cache.return_value
+    mock_cache.return_value.close.assert_called_once()
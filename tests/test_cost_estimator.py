@@ -0,0 +1,88 @@
+import logging
+import mock
+import pytest
+from friendlypins.api import API
+from friendlypins.utils.console_actions import estimate_download_thumbnails, \
+    estimate_delete_board
+from friendlypins.utils.cost_estimator import CostEstimate, Workload, \
+    Timings, QuotaWindow, pages_needed
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer, SyntheticAccount)
+
+
+def test_pages_needed():
+    assert pages_needed(0) == 1
+    assert pages_needed(100) == 1
+    assert pages_needed(101) == 2
+    assert pages_needed(20000) == 200
+
+
+def test_fits_quota():
+    obj = CostEstimate(
+        "test",
+        Workload(201, api_bytes=1000, downloads=20000, download_bytes=5000),
+        Timings(seconds_per_call=1.0, seconds_per_download=0.1),
+        QuotaWindow(rate_remaining=500, rate_limit=1000,
+                    seconds_to_refresh=600))
+    assert obj.fits_quota
+    assert obj.pauses == 0
+    assert obj.total_bytes == 6000
+    assert obj.work_seconds == 2201
+    assert obj.total_seconds == 2201
+    assert "Fits in the remaining quota of 500 calls" in obj.describe()[-1]
+
+
+def test_needs_pauses():
+    obj = CostEstimate(
+        "test", Workload(2500), Timings(seconds_per_call=0.1),
+        QuotaWindow(rate_remaining=100, rate_limit=1000,
+                    seconds_to_refresh=600))
+    assert not obj.fits_quota
+    assert obj.pauses == 3
+    # waits for the current window, plus two more full windows, before
+    # making the final 400 calls
+    assert obj.total_seconds == pytest.approx(600 + 7200 + 40)
+    assert "will pause 3 time(s)" in obj.describe()[-1]
+    assert "Time needed: 2h 10m 40s" in "\n".join(obj.describe())
+
+
+def test_unknown_quota():
+    obj = CostEstimate("test", Workload(10))
+    assert obj.fits_quota
+    assert obj.describe()[-1].strip() == "Remaining quota unknown"
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_estimate_download_thumbnails(mock_api, caplog):
+    account = SyntheticAccount(num_boards=150, pins_per_board=250)
+    emulator = Emulator(
+        account, page_size=100, conditions=ApiConditions(rate_limit=300))
+    with EmulatorServer(emulator) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        with caplog.at_level(logging.INFO):
+            result = estimate_download_thumbnails("1234abcd", "Board 120")
+            assert estimate_download_thumbnails("1234abcd", "Nope") == 1
+
+    assert result == 0
+    # 2 pages of boards, then 3 pages of pins
+    assert "API calls: 5" in caplog.text
+    assert "File downloads: 250" in caplog.text
+    assert "Fits in the remaining quota of 298 calls" in caplog.text
+    # only the list of boards was loaded, twice
+    assert emulator.requests == 4
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_estimate_delete_board_over_quota(mock_api, caplog):
+    account = SyntheticAccount(num_boards=3, pins_per_board=1)
+    emulator = Emulator(account, conditions=ApiConditions(rate_limit=1))
+    with EmulatorServer(emulator) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        with caplog.at_level(logging.INFO):
+            result = estimate_delete_board("1234abcd", "Board 2")
+
+    assert result == 0
+    assert "API calls: 2" in caplog.text
+    assert "Exceeds the remaining quota of 0 calls" in caplog.text
@@ -0,0 +1,104 @@
+import sqlite3
+from friendlypins.api import API
+from friendlypins.utils.disk_cache import SqliteCache
+from friendlypins.utils.endpoints import request_key
+from friendlypins.utils.transport import FakeTransport
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_persists_across_instances(tmp_path):
+    filename = str(tmp_path.joinpath("cache", "responses.db"))
+    key = request_key("me/boards", {"fields": "id,name"})
+    expected = {"data": [{"id": "1234", "name": "My Board"}]}
+
+    with SqliteCache(filename) as obj:
+        obj.set(key, expected)
+
+    with SqliteCache(filename) as obj:
+        assert obj.get(key) == expected
+        assert obj.hits == 1
+        assert len(obj) == 1
+
+
+def test_ttl_expiry(tmp_path):
+    clock = FakeClock()
+    key = request_key("pins/1234")
+    with SqliteCache(str(tmp_path.joinpath("a.db")), default_ttl=10,
+                     clock=clock) as obj:
+        obj.set(key, {"data": 1})
+        clock.now += 11
+        assert obj.get(key) is None
+        assert obj.misses == 1
+
+
+def test_size_eviction(tmp_path):
+    clock = FakeClock()
+    with SqliteCache(str(tmp_path.joinpath("a.db")), max_bytes=100,
+                     clock=clock) as obj:
+        # incompressible data, so each entry is over half our size limit
+        keys = [request_key("pins/{0}".format(i)) for i in range(2)]
+        obj.set(keys[0], {"data": "a1b2c3d4e5f6g7h8i9j0k!l@m#n$o%p^q&r*s(t)u_v+w=x"})
+        clock.now += 1
+        obj.set(keys[1], {"data": "Z9Y8X7W6V5U4T3S2R1Q0P-O=N+M_L)K(J*I&H^G%F$E#D@C"})
+
+        assert obj.size <= 100
+        assert obj.get(keys[0]) is None
+        assert obj.get(keys[1]) is not None
+        assert obj.evictions == 1
+
+
+def test_invalidate(tmp_path):
+    with SqliteCache(str(tmp_path.joinpath("a.db"))) as obj:
+        board_key = request_key("boards/1234")
+        list_key = request_key("me/boards")
+        obj.set(board_key, 1)
+        obj.set(list_key, 2)
+
+        obj.invalidate("boards/1234", related=True)
+        assert obj.get(board_key) is None
+        assert obj.get(list_key) is None
+
+        obj.set(board_key, 1)
+        obj.clear()
+        assert len(obj) == 0
+
+
+def test_scoped_to_token(tmp_path):
+    filename = str(tmp_path.joinpath("a.db"))
+    transport = FakeTransport()
+    transport.add_response("me", {"data": {"id": "1"}}, {"access_token": "A"})
+    transport.add_response("me", {"data": {"id": "2"}}, {"access_token": "B"})
+
+    with SqliteCache(filename) as cache:
+        with API("A", transport=transport, cache=cache) as obj:
+            assert obj.user.unique_id == 1
+    with SqliteCache(filename) as cache:
+        with API("B", transport=transport, cache=cache) as obj:
+            assert obj.user.unique_id == 2
+        with API("A", transport=transport, cache=cache) as obj:
+            assert obj.user.unique_id == 1
+
+    assert len(transport.requests) == 2
+
+
+def test_discards_unscoped_cache_files(tmp_path):
+    filename = str(tmp_path.joinpath("a.db"))
+    with sqlite3.connect(filename) as db:
+        db.execute(
+            "CREATE TABLE responses (path TEXT, params TEXT, body BLOB, "
+            "size INTEGER, expires REAL, accessed REAL, etag TEXT, "
+            "last_modified TEXT, source_size INTEGER)")
+        db.execute(
+            "INSERT INTO responses VALUES "
+            "('me', '[]', x'00', 1, 9e9, 0, NULL, NULL, 0)")
+    db.close()
+
+    with SqliteCache(filename) as obj:
+        assert len(obj) == 0
@@ -0,0 +1,143 @@
+import io
+import json
+import mock
+import pytest
+from friendlypins.api import API
+from friendlypins.exceptions import RateLimitException
+from friendlypins.utils.console_actions import download_thumbnails
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer, SyntheticAccount)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_browse_account():
+    account = SyntheticAccount(num_boards=3, pins_per_board=[0, 7, 60])
+    with EmulatorServer(Emulator(account, page_size=25)) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            user = obj.user
+            assert user.name == "Emulated User"
+            boards = list(user.boards)
+            assert [cur.num_pins for cur in boards] == [0, 7, 60]
+
+            pins = list(boards[2].pins)
+            assert len(pins) == 60
+            assert len(set(cur.unique_id for cur in pins)) == 60
+
+            pin = obj.get_pin_by_id(pins[10].unique_id)
+            assert pin.note == pins[10].note
+            assert pin.thumbnail.url.startswith("http://127.0.0.1")
+
+        # 1 user + 1 page of boards + 3 pages of pins + 1 pin
+        assert server.emulator.requests == 6
+
+
+def test_create_and_delete():
+    account = SyntheticAccount(num_boards=1, pins_per_board=5)
+    with EmulatorServer(Emulator(account)) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            board = obj.user.create_board("New Board", "My description")
+            assert board.name == "New Board"
+            assert board.num_pins == 0
+
+            existing = next(iter(obj.user.boards))
+            pins = list(existing.pins)
+            pins[0].delete()
+            assert len(list(existing.pins)) == 4
+
+            board.delete()
+            names = [cur.name for cur in obj.user.boards]
+            assert names == ["Board 0"]
+
+
+def test_rate_limit():
+    clock = FakeClock()
+    emulator = Emulator(
+        conditions=ApiConditions(rate_limit=2, rate_window=60), clock=clock)
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url) as obj:
+            obj.get_pin_by_id(700000000000000000).note
+            assert obj.transaction_remaining == 1
+            obj.get_pin_by_id(700000000000000001).note
+            assert obj.transaction_remaining == 0
+
+            with pytest.raises(RateLimitException) as err:
+                obj.get_pin_by_id(700000000000000002).note
+            assert err.value.pin_headers.seconds_to_refresh == 60
+
+            clock.now += 61
+            assert obj.get_pin_by_id(700000000000000002).note
+    assert emulator.throttled == 1
+
+
+def test_throttle_injection():
+    emulator = Emulator(conditions=ApiConditions(throttle_rate=1.0, seed=1))
+    status, headers, _ = emulator.handle("GET", "/v1/me?access_token=abcd")
+    assert status == 429
+    assert headers["X-Ratelimit-Refresh"] == "3600"
+
+
+def test_latency():
+    sleep = mock.MagicMock()
+    emulator = Emulator(
+        conditions=ApiConditions(latency=lambda: 0.25), sleep=sleep)
+    emulator.handle("GET", "/v1/me?access_token=abcd")
+    sleep.assert_called_once_with(0.25)
+
+
+def test_errors():
+    emulator = Emulator()
+    assert emulator.handle("GET", "/v1/me")[0] == 401
+    assert emulator.handle("GET", "/v1/boards/1?access_token=a")[0] == 404
+    assert emulator.handle(
+        "GET", "/v1/me/boards?access_token=a&cursor=%%%")[0] == 404
+    assert emulator.handle(
+        "POST", "/v1/boards/?access_token=a", {})[0] == 400
+
+
+def test_fields_and_limit():
+    emulator = Emulator(SyntheticAccount(1, 10), page_size=25)
+    status, _, body = emulator.handle(
+        "GET", "/v1/boards/500000000000000000/pins?access_token=a"
+               "&fields=id,note&limit=4")
+    page = json.loads(body.decode("utf-8"))
+    assert status == 200
+    assert len(page["data"]) == 4
+    assert set(page["data"][0].keys()) == {"id", "note"}
+    assert page["page"]["cursor"]
+
+
+def test_wsgi():
+    emulator = Emulator()
+    start_response = mock.MagicMock()
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/v1/boards/",
+        "QUERY_STRING": "access_token=abcd",
+        "CONTENT_LENGTH": "9",
+        "wsgi.input": io.BytesIO(b"name=test"),
+        "HTTP_HOST": "localhost:8080",
+    }
+
+    body = b"".join(emulator(environ, start_response))
+
+    assert start_response.call_args[0][0] == "201 Created"
+    assert json.loads(body.decode("utf-8"))["data"]["name"] == "test"
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_download_thumbnails(mock_api, tmp_path):
+    account = SyntheticAccount(num_boards=2, pins_per_board=30)
+    with EmulatorServer(Emulator(account, page_size=10)) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        result = download_thumbnails("1234abcd", "Board 1", str(tmp_path))
+
+    assert result == 0
+    assert len(list(tmp_path.iterdir())) == 30
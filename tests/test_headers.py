@@ -31,7 +31,7 @@ sample_header = {
 @pytest.mark.vcr()
 def test_headers_properties(test_env):
     obj = RestIO(test_env["key"])
-    headers = obj.headers
+    headers = obj.probe_rate_limit()
     assert isinstance(headers.date, datetime)
     assert headers.date.tzinfo == tz.tzlocal()
     assert isinstance(headers.rate_limit, int)
@@ -47,10 +47,9 @@ def test_rate_limit_exceeded(test_env):
     obj = RestIO(test_env["key"])
 
     # Wait for our request limit to get reached
-    headers = obj.headers
+    headers = obj.probe_rate_limit()
     while headers.rate_remaining > 0:
-        obj.refresh_headers()
-        headers = obj.headers
+        headers = obj.probe_rate_limit()
 
     assert headers.rate_remaining == 0
     assert headers.percent_rate_remaining == 0
@@ -86,3 +85,13 @@ def test_time_to_refresh():
     tmp = obj.time_to_refresh
     expected_time = datetime(year=2018, month=3, day=31, hour=10, minute=58, second=39, tzinfo=tz.tzutc())
     assert tmp == expected_time
+
+
+def test_seconds_to_refresh():
+    obj = Headers(sample_header)
+    assert obj.seconds_to_refresh == 30
+
+
+def test_seconds_to_refresh_missing():
+    obj = Headers({'Date': header_date})
+    assert obj.seconds_to_refresh is None
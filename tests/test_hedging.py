@@ -0,0 +1,174 @@
+import threading
+import time
+import mock
+import requests
+from friendlypins.api import API
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer)
+from friendlypins.utils.hedging import HedgePolicy, HedgeDelay, \
+    HedgeSamples, HedgeBudget
+from friendlypins.utils.quota_ledger import QuotaLedger
+from friendlypins.utils.rate_governor import RateGovernor
+from friendlypins.utils.rate_limit_state import RateLimitSnapshot
+
+
+class Latencies(object):
+    """Returns a fixed series of latencies, then no latency at all"""
+
+    def __init__(self, *values):
+        self._values = list(values)
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            if self._values:
+                return self._values.pop(0)
+        return 0
+
+
+def test_fast_requests_not_hedged():
+    obj = HedgePolicy(HedgeDelay(initial_delay=1.0))
+    try:
+        for cur in range(10):
+            assert obj.run(lambda: 5) == 5
+    finally:
+        obj.close()
+    assert obj.requests == 10
+    assert obj.hedges == 0
+    assert obj.denied == 0
+
+
+def test_adaptive_delay():
+    obj = HedgePolicy(
+        HedgeDelay(initial_delay=1.0, min_delay=0.2, max_delay=2.0),
+        HedgeSamples(min_samples=5))
+    try:
+        assert obj.delay == 1.0
+        for cur in range(5):
+            obj.run(lambda: None)
+        # recent requests were all fast
+        assert obj.delay == 0.2
+    finally:
+        obj.close()
+
+
+def test_failed_attempt_uses_hedge():
+    calls = list()
+
+    def send():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            raise requests.ConnectionError("Connection reset")
+        return "ok"
+
+    obj = HedgePolicy(HedgeDelay(initial_delay=0.05))
+    try:
+        assert obj.run(send) == "ok"
+    finally:
+        obj.close()
+    assert obj.hedges == 1
+    assert obj.wins == 1
+
+
+def test_low_quota_not_hedged():
+    obj = HedgePolicy(
+        HedgeDelay(initial_delay=0.01), budget=HedgeBudget(reserve=100))
+    try:
+        quota = RateLimitSnapshot(rate_limit=1000, rate_remaining=99)
+        assert obj.run(lambda: time.sleep(0.1) or "slow", quota) == "slow"
+    finally:
+        obj.close()
+    assert obj.hedges == 0
+    assert obj.denied == 1
+
+
+def test_budget():
+    obj = HedgePolicy(
+        HedgeDelay(initial_delay=0.01),
+        budget=HedgeBudget(budget_ratio=0.0, burst=1))
+    try:
+        for cur in range(3):
+            obj.run(lambda: time.sleep(0.05))
+    finally:
+        obj.close()
+    assert obj.requests == 3
+    assert obj.hedges == 1
+    assert obj.denied == 2
+
+    obj.reset_stats()
+    assert obj.requests == obj.hedges == obj.denied == 0
+
+
+def test_busy_hedge_workers():
+    release = threading.Event()
+    calls = list()
+
+    def stuck():
+        # the first attempt and its hedge both hang until released
+        calls.append(1)
+        release.wait(5)
+        return "stuck"
+
+    obj = HedgePolicy(
+        HedgeDelay(initial_delay=0.01),
+        budget=HedgeBudget(budget_ratio=1.0, burst=1))
+    try:
+        first = threading.Thread(target=obj.run, args=(stuck,))
+        first.start()
+        while len(calls) < 2:
+            time.sleep(0.01)
+
+        # the only hedge worker is busy, yet other requests are still sent
+        # straight away, just without a hedge
+        assert obj.run(lambda: time.sleep(0.05) or "slow") == "slow"
+        release.set()
+        first.join()
+    finally:
+        release.set()
+        obj.close()
+    assert obj.hedges == 1
+    assert obj.denied == 1
+
+
+def test_hedged_read():
+    emulator = Emulator(conditions=ApiConditions(latency=Latencies(2.0)))
+    policy = HedgePolicy(HedgeDelay(initial_delay=0.1))
+    with EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url,
+                 hedge_policy=policy) as obj:
+            start = time.perf_counter()
+            assert obj.get_pin_by_id(700000000000000000).note
+            elapsed = time.perf_counter() - start
+            assert obj.get_pin_by_id(700000000000000001).note
+    policy.close()
+
+    # the slow first attempt was overtaken by the hedge
+    assert elapsed < 1.5
+    assert policy.requests == 2
+    assert policy.hedges == 1
+    assert policy.wins == 1
+
+
+def test_hedged_read_charges_both_attempts():
+    emulator = Emulator(conditions=ApiConditions(latency=Latencies(0.5)))
+    policy = HedgePolicy(HedgeDelay(initial_delay=0.05))
+    governor = RateGovernor()
+    ledger = QuotaLedger()
+    with mock.patch.object(governor, "acquire", wraps=governor.acquire), \
+            EmulatorServer(emulator) as server:
+        with API("1234abcd", root_url=server.url, hedge_policy=policy,
+                 governor=governor, quota_ledger=ledger) as obj:
+            assert obj.get_pin_by_id(700000000000000000).note
+
+            # both attempts reach the API, so both are paced and recorded
+            deadline = time.monotonic() + 5
+            while ledger.usage_by_operation() != {"default": 2} and \
+                    time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert governor.acquire.call_count == 2
+    policy.close()
+
+    assert policy.wins == 1
+    assert ledger.usage_by_operation() == {"default": 2}
+    ledger.close()
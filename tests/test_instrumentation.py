@@ -0,0 +1,119 @@
+import mock
+import pytest
+import requests
+from friendlypins.api import API
+from friendlypins.utils.instrumentation import (
+    CallStats, RequestEvent, ResponseSummary, percentile)
+from friendlypins.utils.rest_io import RestIO
+
+
+def test_hooks_receive_request_details(fake_transport):
+    events = list()
+    obj = RestIO.from_kwargs(
+        "1234abcd", transport=fake_transport,
+        on_request=lambda event: events.append(("request", event.status)),
+        on_response=lambda event: events.append(("response", event)))
+
+    obj.get("pins/1")
+
+    assert events[0] == ("request", None)
+    event = events[1][1]
+    assert events[1][0] == "response"
+    assert event.method == "GET"
+    assert event.path == "pins/1"
+    assert event.template == "pins/{id}"
+    assert event.status == 200
+    assert event.latency >= 0
+    assert event.bytes > 0
+    assert event.rate_remaining == 999
+    assert event.error is None
+
+
+def test_error_hook(fake_transport):
+    on_response = mock.MagicMock()
+    on_error = mock.MagicMock()
+    obj = RestIO.from_kwargs("1234abcd", transport=fake_transport,
+                 on_response=on_response, on_error=on_error)
+
+    with pytest.raises(requests.HTTPError):
+        obj.get("pins/9")
+
+    on_response.assert_called_once()
+    event = on_error.call_args[0][0]
+    assert event.status == 404
+    assert isinstance(event.error, requests.HTTPError)
+
+
+def test_error_hook_without_response():
+    on_error = mock.MagicMock()
+    transport = mock.MagicMock()
+    transport.send.side_effect = requests.ConnectionError("offline")
+    obj = RestIO.from_kwargs("1234abcd", transport=transport, on_error=on_error)
+
+    with pytest.raises(requests.ConnectionError):
+        obj.delete("pins/1234")
+
+    event = on_error.call_args[0][0]
+    assert event.method == "DELETE"
+    assert event.template == "pins/{id}"
+    assert event.status is None
+    assert isinstance(event.error, requests.ConnectionError)
+
+
+def test_failing_hook_does_not_break_requests(fake_transport):
+    on_response = mock.MagicMock(side_effect=ValueError("broken"))
+    obj = RestIO.from_kwargs("1234abcd", transport=fake_transport,
+                 on_response=on_response)
+    assert obj.get("pins/1")["data"]["id"] == "1"
+    on_response.assert_called_once()
+
+
+def test_api_stats(fake_transport):
+    with API("1234abcd", transport=fake_transport) as obj:
+        list(obj.get_board_by_id(1234).pins)
+        obj.get_pin_by_id(1).note
+        obj.get_pin_by_id(2).note
+        with pytest.raises(requests.HTTPError):
+            obj.get_pin_by_id(9).note
+
+        snapshot = obj.stats.snapshot()
+        assert snapshot["calls"] == 5
+        assert snapshot["errors"] == 1
+        assert snapshot["rate_remaining"] == 995
+        assert obj.stats.calls == 5
+
+        endpoints = {cur["endpoint"]: cur for cur in snapshot["endpoints"]}
+        assert set(endpoints) == {"boards/{id}/pins", "pins/{id}"}
+        pins = endpoints["pins/{id}"]
+        assert pins["method"] == "GET"
+        assert pins["calls"] == 3
+        assert pins["errors"] == 1
+        assert pins["statuses"] == {200: 2, 404: 1}
+        assert pins["bytes"] > 0
+        assert pins["latency"]["p50"] <= pins["latency"]["max"]
+
+        obj.stats.reset_stats()
+        assert obj.stats.snapshot()["endpoints"] == []
+        # snapshots are copies, unaffected by the reset
+        assert endpoints["pins/{id}"]["calls"] == 3
+
+
+def test_percentiles():
+    stats = CallStats(max_samples=100)
+    for i in range(1, 201):
+        event = RequestEvent("GET", "pins/{0}".format(i), "pins/{id}")
+        event.response = ResponseSummary(200)
+        event.latency = float(i)
+        stats.on_response(event)
+
+    latency = stats.snapshot()["endpoints"][0]["latency"]
+    # only the most recent samples are used for percentiles
+    assert latency["p50"] == 150.0
+    assert latency["p99"] == 199.0
+    assert latency["max"] == 200.0
+    # but the average covers every request
+    assert latency["mean"] == 100.5
+
+    assert percentile([], 0.5) is None
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 1.0) == 4
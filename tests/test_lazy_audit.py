@@ -0,0 +1,77 @@
+import logging
+import pytest
+from friendlypins.api import API
+from friendlypins.exceptions import LazyLoadError
+from friendlypins.utils.lazy_audit import LazyLoadAudit
+
+
+def test_detects_repeated_fetches(fake_transport, caplog):
+    audit = LazyLoadAudit()
+    with API("1234abcd", transport=fake_transport, lazy_audit=audit) as obj:
+        with caplog.at_level(logging.WARNING):
+            notes = [obj.get_pin_by_id(i).note for i in range(1, 6)]
+        # a single lazy fetch is not a repeated pattern
+        obj.get_pin_by_id(1).link
+
+    assert notes[4] == "pin 5"
+    assert audit.fetches == 6
+    report = audit.report()
+    assert len(report) == 1
+    group = report[0]
+    assert group.count == 5
+    assert group.object_type == "Pin"
+    assert group.attribute == "note"
+    assert group.template == "pins/{id}"
+    assert group.source.filename == __file__
+    assert group.source.function == "test_detects_repeated_fetches"
+    assert group.paths == ["pins/{0}".format(i) for i in range(1, 6)]
+
+    text = audit.format_report()
+    assert "5 x Pin.note from " + __file__ in text
+    assert len([cur for cur in caplog.records
+                if "Repeated lazy loading" in cur.message]) == 1
+
+    audit.clear()
+    assert audit.fetches == 0
+    assert audit.format_report().startswith("No repeated lazy loading")
+
+
+def test_preloaded_objects_not_recorded(fake_transport):
+    audit = LazyLoadAudit()
+    transport = fake_transport
+    with API("1234abcd", transport=transport, lazy_audit=audit) as obj:
+        notes = [cur.note for cur in obj.get_board_by_id(1234).pins]
+
+    assert len(notes) == 5
+    assert audit.fetches == 0
+    assert audit.report() == []
+
+
+def test_strict_mode(fake_transport):
+    audit = LazyLoadAudit(threshold=3, strict=True)
+    transport = fake_transport
+    with API("1234abcd", transport=transport, lazy_audit=audit) as obj:
+        with pytest.raises(LazyLoadError) as err:
+            for i in range(1, 6):
+                obj.get_pin_by_id(i).note
+
+    assert err.value.fetch.count == 3
+    assert "Pin.note was loaded 3 times" in str(err.value)
+    # the fetch that reached the threshold is never sent
+    assert len(transport.requests) == 2
+
+
+def test_user_fetches_recorded(fake_transport):
+    audit = LazyLoadAudit()
+    transport = fake_transport
+    transport.add_response("me", {
+        "data": {"id": "1", "first_name": "Jane", "last_name": "Doe"}})
+    with API("1234abcd", transport=transport, lazy_audit=audit) as obj:
+        names = [obj.user.first_name for _ in range(2)]
+
+    assert names == ["Jane", "Jane"]
+    assert audit.fetches == 2
+    group = audit.report()[0]
+    assert group.object_type == "User"
+    assert group.attribute == "first_name"
+    assert group.template == "me"
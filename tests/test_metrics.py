@@ -0,0 +1,151 @@
+import mock
+import pytest
+import requests
+from friendlypins.api import API
+from friendlypins.utils.console_actions import download_thumbnails
+from friendlypins.testing.emulator import (
+    Emulator, EmulatorServer, SyntheticAccount)
+from friendlypins.utils.metrics import ClientMetrics, MetricsServer
+from friendlypins.utils.response_cache import MemoryCache
+from friendlypins.utils.retry_policy import RetryLimits, RetryPolicy
+from friendlypins.utils.transport import CannedResponse
+
+
+@pytest.fixture
+def transport(fake_transport):
+    fake_transport.add_response(
+        "pins/2", CannedResponse({"message": "slow down"}, 429))
+    fake_transport.add_response(
+        "pins/3", CannedResponse({"message": "oops"}, 503))
+    return fake_transport
+
+
+def parse(text):
+    """Extracts the samples from metrics in the OpenMetrics format"""
+    assert text.endswith("# EOF\n")
+    samples = dict()
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    return samples
+
+
+def test_request_metrics(transport):
+    metrics = ClientMetrics(buckets=(0.5, 1.0))
+    with API("1234abcd", transport=transport, metrics=metrics,
+             cache=MemoryCache()) as obj:
+        obj.get_pin_by_id(1).note
+        obj.get_pin_by_id(1).note
+        with pytest.raises(requests.HTTPError):
+            obj.get_pin_by_id(2).note
+
+    samples = parse(metrics.exposition())
+    pins = 'method="GET",endpoint="pins/{id}"'
+    assert samples['friendlypins_requests_total{' + pins + ',status="200"}'] == 1
+    assert samples['friendlypins_requests_total{' + pins + ',status="429"}'] == 1
+    assert samples['friendlypins_request_duration_seconds_count{' + pins + '}'] == 2
+    assert samples['friendlypins_request_duration_seconds_bucket{' + pins + ',le="+Inf"}'] == 2
+    assert 'friendlypins_request_duration_seconds_bucket{' + pins + ',le="0.5"}' in samples
+    assert samples['friendlypins_response_bytes_total{' + pins + '}'] > 0
+    assert samples["friendlypins_rate_limited_total"] == 1
+    assert samples["friendlypins_requests_in_flight"] == 0
+    assert samples["friendlypins_rate_limit"] == 1000
+    assert samples["friendlypins_rate_limit_remaining"] == 998
+    assert samples["friendlypins_cache_hits_total"] == 1
+    assert samples["friendlypins_cache_misses_total"] == 2
+
+
+def test_retry_and_failure_metrics(transport):
+    metrics = ClientMetrics()
+    policy = RetryPolicy(
+        RetryLimits(max_attempts=3), sleep=mock.MagicMock())
+    with API("1234abcd", transport=transport, metrics=metrics,
+             retry_policy=policy) as obj:
+        with pytest.raises(requests.HTTPError):
+            obj.get_pin_by_id(3).note
+
+        transport.send = mock.MagicMock(
+            side_effect=requests.ConnectionError("offline"))
+        with pytest.raises(requests.ConnectionError):
+            obj.get_pin_by_id(1).note
+
+    samples = parse(metrics.exposition())
+    pins = '{method="GET",endpoint="pins/{id}"}'
+    assert samples["friendlypins_retries_total" + pins] == 4
+    assert samples["friendlypins_request_failures_total" + pins] == 3
+    assert samples["friendlypins_requests_in_flight"] == 0
+    assert metrics.in_flight == 0
+
+
+def test_unexpected_transport_errors(transport):
+    metrics = ClientMetrics()
+    transport.send = mock.MagicMock(side_effect=RuntimeError("broken"))
+    with API("1234abcd", transport=transport, metrics=metrics) as obj:
+        with pytest.raises(RuntimeError):
+            obj.get_pin_by_id(1).note
+
+    samples = parse(metrics.exposition())
+    pins = '{method="GET",endpoint="pins/{id}"}'
+    assert samples["friendlypins_request_failures_total" + pins] == 1
+    assert metrics.in_flight == 0
+
+
+def test_label_escaping():
+    metrics = ClientMetrics()
+    metrics.on_request(None)
+    event = mock.MagicMock(
+        method="GET", template='a"b\\c\nd', status=200, latency=0.1,
+        bytes=10, rate_limit=None, rate_remaining=None)
+    metrics.on_response(event)
+    text = metrics.exposition()
+    assert 'endpoint="a\\"b\\\\c\\nd"' in text
+    # quota gauges are omitted until the API reports them
+    assert "friendlypins_rate_limit_remaining" not in text
+
+
+def test_write_file(tmp_path):
+    metrics = ClientMetrics()
+    metrics.add_download(1234)
+    output = tmp_path / "friendlypins.prom"
+    metrics.write(str(output))
+
+    samples = parse(output.read_text())
+    assert samples["friendlypins_downloads_total"] == 1
+    assert samples["friendlypins_download_bytes_total"] == 1234
+    assert [cur.name for cur in tmp_path.iterdir()] == ["friendlypins.prom"]
+
+
+def test_metrics_server():
+    metrics = ClientMetrics()
+    metrics.add_download(10)
+    with MetricsServer(metrics) as server:
+        response = requests.get(server.url)
+        missing = requests.get(server.url.replace("metrics", "other"))
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith(
+        "application/openmetrics-text")
+    assert parse(response.text)["friendlypins_download_bytes_total"] == 10
+    assert missing.status_code == 404
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_download_thumbnails_metrics(mock_api, tmp_path):
+    account = SyntheticAccount(num_boards=1, pins_per_board=12)
+    metrics = ClientMetrics()
+    with EmulatorServer(Emulator(account, page_size=5)) as server:
+        mock_api.side_effect = lambda token, **kwargs: API(
+            token, root_url=server.url, **kwargs)
+        result = download_thumbnails(
+            "1234abcd", "Board 0", str(tmp_path), metrics=metrics)
+
+    assert result == 0
+    samples = parse(metrics.exposition())
+    assert samples["friendlypins_downloads_total"] == 12
+    total = sum(cur.stat().st_size for cur in tmp_path.iterdir())
+    assert samples["friendlypins_download_bytes_total"] == total
+    assert samples[
+        'friendlypins_requests_total{method="GET",'
+        'endpoint="boards/{id}/pins",status="200"}'] == 3
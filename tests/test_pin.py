@@ -1,5 +1,7 @@
 import mock
 import pytest
+from datetime import datetime
+from dateutil import tz
 from friendlypins.api import API
 from friendlypins.pin import Pin
 
@@ -54,6 +56,19 @@ def test_delete():
     mock_io.delete.assert_called_once()
 
 
+def test_creation_date():
+    data = {
+        "id": "12345678",
+        "created_at": "2020-07-21T20:49:16"
+    }
+
+    obj = Pin.from_json(data, mock.MagicMock())
+
+    expected = datetime(year=2020, month=7, day=21, hour=20, minute=49,
+                        second=16, tzinfo=tz.tzutc())
+    assert obj.creation_date == expected
+
+
 def test_get_thumbnail():
     expected_url = "https://i.pinimg.com/r/pin/12345"
     data = {
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+import mock
+import pytest
+from friendlypins.utils.prefetch import prefetch
+from friendlypins.utils.rest_io import RestIO
+
+
+def test_preserves_order():
+    assert list(prefetch(iter(range(10)), 3)) == list(range(10))
+
+
+def test_empty_source():
+    assert list(prefetch(iter([]), 1)) == []
+
+
+def test_invalid_depth():
+    with pytest.raises(ValueError):
+        next(prefetch(iter([1]), 0))
+
+
+def test_loads_ahead_of_consumer():
+    loaded = list()
+    ready = threading.Event()
+
+    def source():
+        for i in range(10):
+            loaded.append(i)
+            if len(loaded) == 3:
+                ready.set()
+            yield i
+
+    pages = prefetch(source(), 2)
+    assert next(pages) == 0
+    # while we hold the first result, the next 2 are loaded and no more
+    assert ready.wait(5)
+    time.sleep(0.3)
+    assert len(loaded) == 3
+    assert list(pages) == list(range(1, 10))
+
+
+def test_error_raised_after_earlier_results():
+    def source():
+        yield 1
+        yield 2
+        raise RuntimeError("failed")
+
+    pages = prefetch(source(), 5)
+    assert next(pages) == 1
+    assert next(pages) == 2
+    with pytest.raises(RuntimeError):
+        next(pages)
+
+
+def test_early_stop_closes_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    pages = prefetch(source(), 1)
+    assert next(pages) == 0
+    pages.close()
+    assert closed.wait(5)
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_prefetch_pages(mock_requests):
+    pages = [
+        {"data": [{"id": "1"}], "page": {"cursor": "abc"}},
+        {"data": [{"id": "2"}], "page": {"cursor": "def"}},
+        {"data": [{"id": "3"}], "page": {"cursor": None}},
+    ]
+    responses = list()
+    for cur_page in pages:
+        mock_response = mock.MagicMock()
+        mock_response.content = json.dumps(cur_page).encode("utf-8")
+        responses.append(mock_response)
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.side_effect = responses
+
+    obj = RestIO.from_kwargs("1234abcd", prefetch_pages=2)
+    assert obj.options.paging.prefetch_pages == 2
+    assert list(obj.get_pages("boards/1234/pins")) == pages
+    assert mock_session.get.call_count == 3
+    assert mock_session.get.call_args[1]["params"]["cursor"] == "def"
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_prefetch_depth(mock_requests):
+    mock_response = mock.MagicMock()
+    mock_response.content = json.dumps(
+        {"data": [{"id": "1"}], "page": {"cursor": "abc"}}).encode("utf-8")
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.return_value = mock_response
+
+    obj = RestIO.from_kwargs("1234abcd", prefetch_pages=1)
+    pages = obj.get_pages("boards/1234/pins")
+    next(pages)
+    time.sleep(0.3)
+    pages.close()
+    # only one page is ever loaded ahead of the one we stopped at
+    assert mock_session.get.call_count == 2
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import threading
+import mock
+from friendlypins.api import API, AsyncAPI
+from friendlypins.utils.hedging import HedgePolicy
+from friendlypins.utils.console_actions import check_rate_limit, \
+    StorageOptions
+from friendlypins.utils.quota_ledger import QuotaLedger
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1600000000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_operations_tagged(fake_transport):
+    clock = FakeClock()
+    ledger = QuotaLedger(clock=clock, default_operation="misc")
+    with API("1234abcd", transport=fake_transport,
+             quota_ledger=ledger) as obj:
+        obj.get_pin_by_id(1).note
+        with ledger.operation("crawl"):
+            assert ledger.current_operation == "crawl"
+            obj.get_board_by_id(2).name
+            with ledger.operation("nested"):
+                obj.get_pin_by_id(1).refresh()
+                obj.get_pin_by_id(1).note
+
+            # other threads are not affected by our label
+            other = list()
+            thread = threading.Thread(
+                target=lambda: other.append(ledger.current_operation))
+            thread.start()
+            thread.join()
+            assert other == ["misc"]
+
+        clock.now += 3600
+        obj.get_board_by_id(2).name
+
+    assert ledger.usage_by_operation() == {"misc": 1}
+    assert ledger.usage_by_operation(7200) == {
+        "misc": 2, "crawl": 1, "nested": 1}
+
+    usage = ledger.hourly_usage(hours=2)
+    assert [(cur[1], cur[2]) for cur in usage] == [
+        ("crawl", 1), ("misc", 1), ("nested", 1), ("misc", 1)]
+    assert (usage[3][0] - usage[0][0]).total_seconds() == 3600
+    assert len(ledger.hourly_usage(hours=1)) == 1
+    ledger.close()
+
+
+def test_operations_follow_background_work(fake_transport):
+    transport = fake_transport
+    transport.add_response(
+        "boards/2/pins", {"data": [{"id": "1"}], "page": {"cursor": "abc"}})
+    transport.add_response(
+        "boards/2/pins", {"data": [{"id": "3"}], "page": {}},
+        {"cursor": "abc"})
+    ledger = QuotaLedger()
+    with API("1234abcd", transport=transport, quota_ledger=ledger,
+             prefetch_pages=1, hedge_policy=HedgePolicy()) as obj:
+        with ledger.operation("crawl"):
+            assert len(list(obj.get_board_by_id(2).pins)) == 2
+        with ledger.operation("bulk"):
+            assert all(cur.succeeded for cur in obj.get_pins_by_ids([1, 1]))
+
+    async def action():
+        async with AsyncAPI(
+                "1234abcd", transport=transport, quota_ledger=ledger) as obj:
+            with ledger.operation("async"):
+                pin = obj.get_pin_by_id(1)
+                await pin.load()
+
+    asyncio.run(action())
+    assert ledger.usage_by_operation() == {"crawl": 2, "bulk": 2, "async": 1}
+    ledger.close()
+
+
+def test_projection(fake_transport):
+    clock = FakeClock()
+    ledger = QuotaLedger(clock=clock)
+    assert ledger.projection().exhausted_at is None
+
+    with API("1234abcd", transport=fake_transport,
+             quota_ledger=ledger) as obj:
+        for _ in range(10):
+            obj.get_pin_by_id(1).note
+            obj.get_pin_by_id(1).refresh()
+            clock.now += 60
+
+    # 10 calls in the past 15 minutes, with 990 calls remaining
+    projection = ledger.projection(window=900)
+    assert projection.remaining == 990
+    assert projection.calls_per_hour == 40
+    assert projection.seconds_left == 990 * 90
+    assert (projection.exhausted_at.timestamp() - clock.now) == 990 * 90
+
+
+def test_persistence(fake_transport, tmp_path):
+    filename = str(tmp_path / "ledger" / "calls.db")
+    with QuotaLedger(filename, default_operation="first") as ledger:
+        with API("1234abcd", transport=fake_transport,
+                 quota_ledger=ledger) as obj:
+            obj.get_pin_by_id(1).note
+
+    with QuotaLedger(filename, flush_size=1) as ledger:
+        with API("1234abcd", transport=fake_transport,
+                 quota_ledger=ledger) as obj:
+            obj.get_pin_by_id(1).note
+        assert ledger.usage_by_operation() == {"first": 1, "default": 1}
+
+
+@mock.patch("friendlypins.utils.console_actions.API")
+def test_check_rate_limit_report(mock_api, fake_transport, tmp_path,
+                                 caplog):
+    filename = str(tmp_path / "calls.db")
+    with QuotaLedger(filename, default_operation="download_thumbnails") \
+            as ledger:
+        with API("1234abcd", transport=fake_transport,
+                 quota_ledger=ledger) as obj:
+            for _ in range(5):
+                obj.get_pin_by_id(1).note
+                obj.get_pin_by_id(1).refresh()
+
+    mock_api.side_effect = lambda token, **kwargs: API(
+        token, transport=fake_transport, **kwargs)
+    with caplog.at_level(logging.INFO):
+        storage = StorageOptions(ledger_path=filename)
+        assert check_rate_limit("1234abcd", storage) == 0
+
+    assert "download_thumbnails: 5" in caplog.text
+    assert "check_rate_limit: 1" in caplog.text
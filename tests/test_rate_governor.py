@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+import mock
+from dateutil import tz
+from friendlypins.headers import Headers
+from friendlypins.utils.rate_governor import RateGovernor
+from friendlypins.utils.rest_io import RestIO
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = list()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_headers(remaining, refresh):
+    return Headers({
+        'X-Ratelimit-Limit': "1000",
+        'X-Ratelimit-Remaining': str(remaining),
+        'X-Ratelimit-Refresh': str(refresh),
+        'Date': 'Sat, 31 Mar 2018 10:58:09 GMT',
+    })
+
+
+def test_no_delay_before_first_response():
+    clock = FakeClock()
+    obj = RateGovernor(burst=1, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        assert obj.acquire() == 0
+    assert obj.rate is None
+    assert not clock.sleeps
+
+
+def test_paces_requests_until_refresh():
+    clock = FakeClock()
+    obj = RateGovernor(burst=2, clock=clock, sleep=clock.sleep)
+    # 100 requests left over the next 1000 seconds: one every 10 seconds
+    obj.update(make_headers(100, 1000))
+    assert obj.rate == 0.1
+
+    # the first requests fit in our burst allowance
+    assert obj.acquire() == 0
+    assert obj.acquire() == 0
+    # then we are held to the steady rate
+    assert obj.acquire() == 10
+    assert obj.acquire() == 10
+    assert obj.total_delay == 20
+
+
+def test_burst_refills_while_idle():
+    clock = FakeClock()
+    obj = RateGovernor(burst=3, clock=clock, sleep=clock.sleep)
+    obj.update(make_headers(100, 1000))
+    for _ in range(3):
+        obj.acquire()
+    clock.now += 1000
+    for _ in range(3):
+        assert obj.acquire() == 0
+
+
+def test_reserve_floor():
+    clock = FakeClock()
+    obj = RateGovernor(burst=1, reserve=50, clock=clock, sleep=clock.sleep)
+    obj.update(make_headers(100, 1000))
+    assert obj.rate == 0.05
+
+
+def test_blocks_when_quota_spent():
+    clock = FakeClock()
+    obj = RateGovernor(burst=5, reserve=10, clock=clock, sleep=clock.sleep)
+    obj.update(make_headers(10, 300))
+
+    assert obj.acquire() == 300
+    # once the quota has been renewed, requests flow freely until we
+    # receive new rate limit details
+    assert obj.acquire() == 0
+    assert obj.rate is None
+
+
+def test_target_finish():
+    clock = FakeClock()
+    finish = datetime.now(tz=tz.tzutc()) + timedelta(seconds=100)
+    obj = RateGovernor(target_finish=finish, clock=clock, sleep=clock.sleep)
+    obj.update(make_headers(100, 1000))
+    # quota is spread over the 100 seconds until the target, give or take
+    # the time it takes to run the test
+    assert 0.99 < obj.rate <= 1.05
+
+
+def test_ignores_missing_rate_headers():
+    clock = FakeClock()
+    obj = RateGovernor(clock=clock, sleep=clock.sleep)
+    obj.update(Headers({}))
+    assert obj.rate is None
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_uses_governor(mock_requests):
+    mock_governor = mock.MagicMock()
+    mock_response = mock.MagicMock()
+    mock_response.headers = {"X-Ratelimit-Remaining": "10"}
+    mock_response.content = b"{}"
+    mock_requests.Session.return_value.get.return_value = mock_response
+
+    obj = RestIO.from_kwargs("1234abcd", governor=mock_governor)
+    obj.get("me")
+
+    mock_governor.acquire.assert_called_once()
+    mock_governor.update.assert_called_once()
+    assert mock_governor.update.call_args[0][0].rate_remaining == 10
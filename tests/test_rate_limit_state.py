@@ -0,0 +1,123 @@
+import threading
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from dateutil import tz
+from friendlypins.api import API
+from friendlypins.headers import Headers
+from friendlypins.utils.rate_limit_state import RateLimitState
+from friendlypins.utils.rest_io import RestIO
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_headers(remaining, limit=1000, refresh=3600):
+    return Headers({
+        "X-Ratelimit-Limit": str(limit),
+        "X-Ratelimit-Remaining": str(remaining),
+        "X-Ratelimit-Refresh": str(refresh),
+        "Date": formatdate(usegmt=True),
+    })
+
+
+def test_unknown():
+    obj = RateLimitState().snapshot()
+    assert not obj.known
+    assert obj.stale
+    assert obj.age is None
+    assert obj.rate_remaining is None
+
+
+def test_update():
+    clock = FakeClock()
+    obj = RateLimitState(max_age=30, clock=clock)
+    assert obj.update(make_headers(10, refresh=60))
+    snapshot = obj.snapshot()
+    assert snapshot.known
+    assert snapshot.rate_limit == 1000
+    assert snapshot.rate_remaining == 10
+    assert not snapshot.expired
+    assert not snapshot.stale
+    expected = datetime.now(tz=tz.tzlocal()) + timedelta(seconds=60)
+    assert abs((snapshot.time_to_refresh - expected).total_seconds()) < 2
+
+    clock.now += 31
+    assert snapshot.age == 31
+    assert snapshot.stale
+    assert obj.updates == 1
+
+
+def test_expired_window_is_stale():
+    obj = RateLimitState()
+    obj.update(make_headers(0, refresh=0))
+    assert obj.snapshot().expired
+    assert obj.snapshot().stale
+
+
+def test_responses_without_rate_limit_ignored():
+    obj = RateLimitState()
+    obj.update(make_headers(10))
+    assert not obj.update(Headers({"Content-Length": "100"}))
+    assert obj.snapshot().rate_remaining == 10
+    assert obj.updates == 1
+
+
+def test_updated_from_every_request(fake_transport):
+    clock = FakeClock()
+    state = RateLimitState(clock=clock)
+    transport = fake_transport
+    obj = RestIO.from_kwargs("1234abcd", transport=transport, rate_limit_state=state)
+
+    obj.get("pins/1")
+    assert state.snapshot().rate_remaining == 999
+    obj.post("me/boards", {"name": "b"})
+    assert state.snapshot().rate_remaining == 998
+    obj.delete("pins/1")
+    assert state.snapshot().rate_remaining == 997
+    assert len(list(obj.get_pages("boards/1234/pins"))) == 2
+    assert state.snapshot().rate_remaining == 995
+    assert state.updates == 5
+    assert len(transport.requests) == 5
+
+
+def test_quota_checks_send_no_requests(fake_transport):
+    transport = fake_transport
+    with API("1234abcd", transport=transport) as obj:
+        assert obj.transaction_remaining is None
+        assert not transport.requests
+
+        assert obj.get_pin_by_id(1).unique_id == 1
+        assert obj.transaction_remaining == 999
+        assert obj.transaction_limit == 1000
+        assert obj.rate_limit_refresh is not None
+        assert len(transport.requests) == 1
+
+        assert obj.refresh_rate_limit().rate_remaining == 998
+        assert len(transport.requests) == 2
+
+
+def test_concurrent_reads():
+    state = RateLimitState()
+    stop = threading.Event()
+    seen = list()
+
+    def reader():
+        while not stop.is_set():
+            snapshot = state.snapshot()
+            seen.append((snapshot.rate_limit, snapshot.rate_remaining))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for remaining in range(500, 0, -1):
+        state.update(make_headers(remaining, limit=remaining + 1))
+    stop.set()
+    thread.join()
+
+    # every snapshot describes a single response
+    assert all(limit is None or limit == remaining + 1
+               for limit, remaining in seen)
@@ -0,0 +1,133 @@
+import json
+import mock
+from friendlypins.api import API
+from friendlypins.board import Board
+from friendlypins.utils.endpoints import request_key, path_template
+from friendlypins.utils.response_cache import MemoryCache
+from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.token_pool import TokenPool
+from friendlypins.utils.transport import FakeTransport
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_path_template():
+    assert path_template("boards/1234/pins") == "boards/{id}/pins"
+    assert path_template("/me/boards/") == "me/boards"
+
+
+def test_hit_and_miss():
+    obj = MemoryCache()
+    key = request_key("pins/1234")
+    assert obj.get(key) is None
+    obj.set(key, {"data": 1})
+    assert obj.get(key) == {"data": 1}
+    assert obj.hits == 1
+    assert obj.misses == 1
+
+    obj.reset_stats()
+    assert obj.hits == 0
+    assert obj.misses == 0
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    obj = MemoryCache(default_ttl=10, endpoint_ttls={"me": 100}, clock=clock)
+    pin_key = request_key("pins/1234")
+    user_key = request_key("me")
+    obj.set(pin_key, {"data": 1})
+    obj.set(user_key, {"data": 2})
+
+    clock.now += 50
+    assert obj.get(pin_key) is None
+    assert obj.get(user_key) == {"data": 2}
+
+
+def test_zero_ttl_disables_caching():
+    obj = MemoryCache(endpoint_ttls={"boards/{id}/pins": 0})
+    key = request_key("boards/1234/pins")
+    obj.set(key, {"data": 1})
+    assert obj.get(key) is None
+    assert len(obj) == 0
+
+
+def test_lru_eviction():
+    obj = MemoryCache(max_entries=2)
+    keys = [request_key("pins/{0}".format(i)) for i in range(3)]
+    obj.set(keys[0], 0)
+    obj.set(keys[1], 1)
+    # touch the first entry so the second one is the least recently used
+    obj.get(keys[0])
+    obj.set(keys[2], 2)
+
+    assert obj.get(keys[1]) is None
+    assert obj.get(keys[0]) == 0
+    assert obj.get(keys[2]) == 2
+    assert obj.evictions == 1
+
+
+def test_invalidate():
+    obj = MemoryCache()
+    board_key = request_key("boards/1234", {"fields": "id"})
+    pins_key = request_key("boards/1234/pins")
+    list_key = request_key("me/boards")
+    obj.set(board_key, 1)
+    obj.set(pins_key, 2)
+    obj.set(list_key, 3)
+
+    obj.invalidate("boards/1234")
+    assert obj.get(board_key) is None
+    assert obj.get(pins_key) is None
+    assert obj.get(list_key) == 3
+
+    obj.invalidate("boards/1234", related=True)
+    assert obj.get(list_key) is None
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_read_through(mock_requests):
+    mock_response = mock.MagicMock()
+    mock_response.content = json.dumps({"data": {"id": "1234", "url": "abc"}}).encode("utf-8")
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.return_value = mock_response
+
+    cache = MemoryCache()
+    obj = RestIO.from_kwargs("1234abcd", cache=cache)
+    first = Board("boards/1234", obj)
+    second = Board("boards/1234", obj)
+    assert first.url == second.url == "abc"
+    mock_session.get.assert_called_once()
+    assert cache.hits == 1
+
+    # refreshing an object must force a new request
+    first.refresh()
+    assert first.url == "abc"
+    assert mock_session.get.call_count == 2
+
+    # deleting an object drops cached data for it
+    first.delete()
+    assert len(cache) == 0
+
+
+def test_scoped_to_token_pool():
+    transport = FakeTransport()
+    transport.add_response("me", {"data": {"id": "1"}}, {"access_token": "A"})
+    transport.add_response("me", {"data": {"id": "2"}}, {"access_token": "B"})
+    transport.add_response("me", {"data": {"id": "2"}}, {"access_token": "C"})
+    cache = MemoryCache()
+
+    with API("A", transport=transport, cache=cache) as obj:
+        assert obj.user.unique_id == 1
+    with API(TokenPool(["B", "C"]), transport=transport, cache=cache) as obj:
+        assert obj.user.unique_id == 2
+    with API(TokenPool(["C", "B"]), transport=transport, cache=cache) as obj:
+        assert obj.user.unique_id == 2
+
+    assert len(transport.requests) == 2
+    assert cache.hits == 1
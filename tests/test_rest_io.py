@@ -1,8 +1,14 @@
+import json
 import mock
+import pytest
 from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.rest_options import RestOptions, RequestPolicies, \
+    PagingOptions
+from friendlypins.utils.response_cache import MemoryCache
+from friendlypins.utils.transport import FakeTransport
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_method(mock_requests):
     expected_token = "1234abcd"
     obj = RestIO(expected_token)
@@ -12,19 +18,19 @@ def test_get_method(mock_requests):
         "id": "abcd1234"
     }
     mock_response = mock.MagicMock()
-    mock_response.json.return_value = expected_result
-    mock_requests.get.return_value = mock_response
+    mock_response.content = json.dumps(expected_result).encode("utf-8")
+    mock_requests.Session.return_value.get.return_value = mock_response
     res = obj.get(expected_path)
 
     assert res == expected_result
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
     mock_response.raise_for_status.assert_called_once()
-    assert expected_path in mock_requests.get.call_args[0][0]
-    assert "access_token" in mock_requests.get.call_args[1]['params']
-    assert mock_requests.get.call_args[1]['params']['access_token'] == expected_token
+    assert expected_path in mock_requests.Session.return_value.get.call_args[0][0]
+    assert "access_token" in mock_requests.Session.return_value.get.call_args[1]['params']
+    assert mock_requests.Session.return_value.get.call_args[1]['params']['access_token'] == expected_token
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_pages_one_page(mock_requests):
     expected_token = "1234abcd"
     obj = RestIO(expected_token)
@@ -34,22 +40,22 @@ def test_get_pages_one_page(mock_requests):
         "id": "abcd1234"
     }
     mock_response = mock.MagicMock()
-    mock_response.json.return_value = expected_result
-    mock_requests.get.return_value = mock_response
+    mock_response.content = json.dumps(expected_result).encode("utf-8")
+    mock_requests.Session.return_value.get.return_value = mock_response
     res = list()
     for cur_res in obj.get_pages(expected_path):
         res.append(cur_res)
 
     assert len(res) == 1
     assert res[0] == expected_result
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
     mock_response.raise_for_status.assert_called_once()
-    assert expected_path in mock_requests.get.call_args[0][0]
-    assert "access_token" in mock_requests.get.call_args[1]['params']
-    assert mock_requests.get.call_args[1]['params']['access_token'] == expected_token
+    assert expected_path in mock_requests.Session.return_value.get.call_args[0][0]
+    assert "access_token" in mock_requests.Session.return_value.get.call_args[1]['params']
+    assert mock_requests.Session.return_value.get.call_args[1]['params']['access_token'] == expected_token
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_headers(mock_requests):
     obj = RestIO("1234abcd")
 
@@ -58,16 +64,17 @@ def test_get_headers(mock_requests):
     mock_response.headers = {
         "Content-Length": str(expected_bytes)
     }
-    mock_requests.get.return_value = mock_response
+    mock_response.content = b"{}"
+    mock_requests.Session.return_value.get.return_value = mock_response
     obj.get("me/boards")
     tmp = obj.headers
 
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
     assert tmp is not None
     assert tmp.bytes == expected_bytes
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_get_default_headers(mock_requests):
     obj = RestIO("1234abcd")
 
@@ -76,15 +83,18 @@ def test_get_default_headers(mock_requests):
     mock_response.headers = {
         "Content-Length": str(expected_bytes)
     }
-    mock_requests.get.return_value = mock_response
+    mock_requests.Session.return_value.get.return_value = mock_response
 
-    tmp = obj.headers
-    assert tmp is not None
+    assert obj.headers is None
+    mock_requests.Session.return_value.get.assert_not_called()
+
+    tmp = obj.probe_rate_limit()
+    assert tmp is obj.headers
     assert tmp.bytes == expected_bytes
-    mock_requests.get.assert_called_once()
+    mock_requests.Session.return_value.get.assert_called_once()
 
 
-@mock.patch("friendlypins.utils.rest_io.requests")
+@mock.patch("friendlypins.utils.transport.requests")
 def test_post(mock_requests):
     obj = RestIO("1234abcd")
     expected_path = "me/boards"
@@ -97,15 +107,105 @@ def test_post(mock_requests):
         "testing": "123"
     }
     mock_response = mock.MagicMock()
-    mock_requests.post.return_value = mock_response
-    mock_response.json.return_value = expected_results
+    mock_requests.Session.return_value.post.return_value = mock_response
+    mock_response.content = json.dumps(expected_results).encode("utf-8")
 
     res = obj.post(expected_path, expected_data)
 
-    mock_response.json.assert_called_once()
-    mock_requests.post.assert_called_once()
+    mock_requests.Session.return_value.post.assert_called_once()
 
-    assert expected_path in mock_requests.post.call_args[0][0]
-    assert "data" in mock_requests.post.call_args[1]
-    assert mock_requests.post.call_args[1]["data"] == expected_data
+    assert expected_path in mock_requests.Session.return_value.post.call_args[0][0]
+    assert "data" in mock_requests.Session.return_value.post.call_args[1]
+    assert mock_requests.Session.return_value.post.call_args[1]["data"] == expected_data
     assert res == expected_results
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_session_reused(mock_requests):
+    obj = RestIO("1234abcd")
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.return_value.content = b"{}"
+
+    obj.get("me/boards")
+    obj.get("me/pins")
+    obj.delete("pins/1234")
+
+    mock_requests.Session.assert_called_once()
+    assert mock_session.get.call_count == 2
+    mock_session.delete.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_get_skips_text_decode(mock_requests):
+    obj = RestIO("1234abcd")
+    expected_result = {"data": {"id": "1234", "note": "caf\u00e9"}}
+    mock_response = mock.MagicMock()
+    mock_response.content = json.dumps(expected_result).encode("utf-8")
+    mock_text = mock.PropertyMock(return_value="")
+    type(mock_response).text = mock_text
+    mock_requests.Session.return_value.get.return_value = mock_response
+
+    res = obj.get("pins/1234")
+
+    assert res == expected_result
+    mock_text.assert_not_called()
+
+
+@mock.patch("friendlypins.utils.transport.HTTPAdapter")
+@mock.patch("friendlypins.utils.transport.requests")
+def test_pool_configuration(mock_requests, mock_adapter):
+    RestIO.from_kwargs("1234abcd", pool_connections=2, pool_maxsize=20, max_retries=3)
+
+    mock_adapter.assert_called_once_with(
+        pool_connections=2, pool_maxsize=20, max_retries=3)
+    mock_session = mock_requests.Session.return_value
+    mock_session.mount.assert_any_call("https://", mock_adapter.return_value)
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_context_manager_closes_session(mock_requests):
+    with RestIO("1234abcd") as obj:
+        assert obj is not None
+        mock_requests.Session.return_value.close.assert_not_called()
+
+    mock_requests.Session.return_value.close.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_custom_root_url(mock_requests):
+    obj = RestIO("1234abcd", root_url="http://localhost:8080/v1/")
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.return_value.content = b"{}"
+
+    obj.get("me")
+
+    assert obj.root_url == "http://localhost:8080/v1"
+    assert mock_session.get.call_args[0][0] == "http://localhost:8080/v1/me"
+
+
+def test_grouped_options():
+    governor = mock.MagicMock()
+    cache = MemoryCache()
+    options = RestOptions(
+        policies=RequestPolicies(governor=governor, coalesce_requests=True),
+        paging=PagingOptions(prefetch_pages=2),
+        cache=cache)
+    obj = RestIO("1234abcd", transport=FakeTransport(), options=options)
+
+    assert obj.options.policies.governor is governor
+    assert obj.options.paging.prefetch_pages == 2
+    assert obj.options.cache is cache
+    assert obj.single_flight is not None
+
+
+def test_options_from_kwargs():
+    on_request = mock.MagicMock()
+    obj = RestIO.from_kwargs(
+        "1234abcd", transport=FakeTransport(), stream_pages=True,
+        retry_policy="retry", on_request=on_request)
+
+    assert obj.options.paging.stream_pages
+    assert obj.options.policies.retry_policy == "retry"
+    assert obj.options.cache is None
+    with pytest.raises(TypeError):
+        RestIO.from_kwargs("1234abcd", prefetch=2)
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import mock
+import pytest
+import requests
+from dateutil import tz
+from friendlypins.exceptions import RateLimitException
+from friendlypins.utils.retry_policy import Backoff, RetryLimits, \
+    RetryPolicy, RetryableRequests
+from friendlypins.utils.rest_io import RestIO
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b'{"data": {"id": "1234"}}'
+    return response
+
+
+def rate_limited_response(seconds):
+    renewal = datetime.now(tz=tz.tzutc())
+    return make_response(429, {
+        "Date": renewal.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        "X-Ratelimit-Refresh": str(seconds),
+    })
+
+
+def test_backoff_grows_exponentially():
+    obj = Backoff(factor=1, max_delay=5, jitter=0)
+    assert [obj.delay(i) for i in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_backoff_jitter():
+    obj = Backoff(factor=4, jitter=0.5)
+    for _ in range(20):
+        assert 2 <= obj.delay(1) <= 6
+
+
+def test_retryable_errors():
+    obj = RetryPolicy()
+    server_error = requests.HTTPError(response=make_response(503))
+    client_error = requests.HTTPError(response=make_response(404))
+    rate_error = RateLimitException(rate_limited_response(10))
+
+    assert obj.is_retryable("get", server_error)
+    assert obj.is_retryable("delete", requests.ConnectionError())
+    assert obj.is_retryable("get", rate_error)
+    assert not obj.is_retryable("get", client_error)
+    assert not obj.is_retryable("post", server_error)
+
+    obj = RetryPolicy(retryable=RetryableRequests([404], ["post"]))
+    assert obj.is_retryable("post", client_error)
+    assert not obj.is_retryable("post", server_error)
+    assert not obj.is_retryable("get", client_error)
+
+
+def test_rate_limit_waits_for_renewal():
+    obj = RetryPolicy(backoff=Backoff(jitter=0))
+    error = RateLimitException(rate_limited_response(120))
+    assert 100 < obj.get_delay(1, error) <= 120
+
+
+def test_total_wait_cap():
+    sleep = mock.MagicMock()
+    obj = RetryPolicy(RetryLimits(max_total_wait=60), sleep=sleep)
+    error = RateLimitException(rate_limited_response(120))
+    assert obj.wait("get", "url", 1, error, 0) is None
+    sleep.assert_not_called()
+
+
+def test_max_attempts():
+    sleep = mock.MagicMock()
+    obj = RetryPolicy(RetryLimits(max_attempts=2), sleep=sleep)
+    error = requests.ConnectionError()
+    assert obj.wait("get", "url", 1, error, 0) is not None
+    assert obj.wait("get", "url", 2, error, 0) is None
+    sleep.assert_called_once()
+
+
+def test_rest_io_retries_transient_errors():
+    on_retry = mock.MagicMock()
+    sleep = mock.MagicMock()
+    policy = RetryPolicy(on_retry=on_retry, sleep=sleep)
+    obj = RestIO.from_kwargs("1234abcd", retry_policy=policy)
+    obj.transport._session = mock.MagicMock()
+    obj.transport._session.get.side_effect = [
+        make_response(503),
+        rate_limited_response(5),
+        make_response(200),
+    ]
+
+    result = obj.get("pins/1234")
+
+    assert result == {"data": {"id": "1234"}}
+    assert obj.transport._session.get.call_count == 3
+    assert on_retry.call_count == 2
+    assert on_retry.call_args_list[0][0][2] == 1
+    assert isinstance(on_retry.call_args_list[1][0][4], RateLimitException)
+    assert sleep.call_count == 2
+
+
+def test_rest_io_without_policy_raises():
+    obj = RestIO("1234abcd")
+    obj.transport._session = mock.MagicMock()
+    obj.transport._session.get.return_value = make_response(503)
+
+    with pytest.raises(requests.HTTPError):
+        obj.get("pins/1234")
+    obj.transport._session.get.assert_called_once()
+
+
+def test_rest_io_does_not_retry_post():
+    policy = RetryPolicy(sleep=mock.MagicMock())
+    obj = RestIO.from_kwargs("1234abcd", retry_policy=policy)
+    obj.transport._session = mock.MagicMock()
+    obj.transport._session.post.return_value = make_response(503)
+
+    with pytest.raises(requests.HTTPError):
+        obj.post("boards", {"name": "test"})
+    obj.transport._session.post.assert_called_once()
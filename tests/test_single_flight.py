@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+import mock
+import pytest
+from friendlypins.utils.endpoints import request_key
+from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.single_flight import SingleFlight
+
+
+def test_request_key_ignores_token_and_order():
+    key1 = request_key("boards/1234", {"fields": "id,name", "access_token": "a", "limit": 100})
+    key2 = request_key("boards/1234/", {"limit": "100", "access_token": "b", "fields": "id,name"})
+    key3 = request_key("boards/1234", {"fields": "id"})
+    assert key1 == key2
+    assert key1 != key3
+
+
+def test_sequential_calls_not_coalesced():
+    obj = SingleFlight()
+    assert obj.run("key", lambda: 1) == 1
+    assert obj.run("key", lambda: 2) == 2
+    assert obj.calls == 2
+    assert obj.coalesced == 0
+
+
+def test_concurrent_calls_coalesced():
+    obj = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    num_waiters = 4
+    results = list()
+    func = mock.MagicMock()
+
+    def slow_call():
+        func()
+        started.set()
+        release.wait(5)
+        return {"data": "result"}
+
+    def worker():
+        results.append(obj.run("key", slow_call))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=worker) for _ in range(num_waiters)]
+    for cur_thread in waiters:
+        cur_thread.start()
+    # give the waiting threads time to queue up behind the leader
+    while obj.calls < num_waiters + 1:
+        time.sleep(0.001)
+    release.set()
+    for cur_thread in [leader] + waiters:
+        cur_thread.join(5)
+
+    func.assert_called_once()
+    assert len(results) == num_waiters + 1
+    assert all(cur is results[0] for cur in results)
+    assert obj.coalesced == num_waiters
+
+    obj.reset_stats()
+    assert obj.calls == 0
+    assert obj.coalesced == 0
+
+
+def test_errors_propagate():
+    obj = SingleFlight()
+
+    def failing_call():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        obj.run("key", failing_call)
+    # failed calls must not linger and block future requests
+    assert obj.run("key", lambda: 5) == 5
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_coalescing_enabled(mock_requests):
+    obj = RestIO.from_kwargs("1234abcd", coalesce_requests=True)
+    mock_response = mock.MagicMock()
+    mock_response.content = json.dumps({"data": {}}).encode("utf-8")
+    mock_requests.Session.return_value.get.return_value = mock_response
+
+    assert obj.get("pins/1234") == {"data": {}}
+    assert obj.single_flight.calls == 1
+
+
+def test_rest_io_coalescing_disabled():
+    obj = RestIO("1234abcd")
+    assert obj.single_flight is None
@@ -0,0 +1,132 @@
+import json
+import mock
+import pytest
+from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.stream_decoder import StreamedPage
+
+SAMPLE_PAGE = {
+    "data": [
+        {"id": "1", "note": "café ☃", "counts": {"saves": 12345}},
+        {"id": "2", "note": "", "media": None, "score": -1.5e3},
+        {"id": "3", "note": "with \"quotes\" and \\ slashes", "tags": []},
+    ],
+    "page": {
+        "cursor": "LT4xMjM0NTY3ODkwfDEyMzQ1Njc4OTA=",
+        "next": None,
+    },
+}
+
+
+def chunked(data, size):
+    """Splits raw response data into chunks of a fixed size"""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+def test_decode_chunked(chunk_size):
+    raw = json.dumps(SAMPLE_PAGE, ensure_ascii=False, indent=2).encode("utf-8")
+    obj = StreamedPage(chunked(raw, chunk_size))
+
+    assert "data" in obj
+    assert list(obj["data"]) == SAMPLE_PAGE["data"]
+    assert obj["page"] == SAMPLE_PAGE["page"]
+    assert RestIO.next_cursor(obj) == SAMPLE_PAGE["page"]["cursor"]
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'{"data": [0.', b'5], "page": {}}'],
+    [b'{"data": [1', b'e3, -', b'2.5E-', b'1], "page": {}}'],
+    [b'{"data": [12', b'34]', b', "page": {}}'],
+])
+def test_numbers_split_across_chunks(chunks):
+    obj = StreamedPage(chunks)
+
+    assert list(obj["data"]) == json.loads(b"".join(chunks))["data"]
+    assert obj["page"] == {}
+
+
+def test_items_decoded_incrementally():
+    raw = json.dumps(SAMPLE_PAGE).encode("utf-8")
+    chunks = iter(chunked(raw, 16))
+    obj = StreamedPage(chunks)
+
+    first = next(iter(obj["data"]))
+    assert first == SAMPLE_PAGE["data"][0]
+    # the rest of the response must not have been read yet
+    assert next(chunks, None) is not None
+
+
+def test_fields_before_data():
+    raw = b'{"page": {"cursor": null}, "data": [{"id": "1"}]}'
+    obj = StreamedPage(chunked(raw, 5))
+    assert list(obj["data"]) == [{"id": "1"}]
+    assert RestIO.next_cursor(obj) is None
+
+
+def test_cursor_skips_unread_items():
+    close = mock.MagicMock()
+    raw = json.dumps(SAMPLE_PAGE).encode("utf-8")
+    obj = StreamedPage(chunked(raw, 10), close)
+    items = iter(obj["data"])
+    next(items)
+
+    assert RestIO.next_cursor(obj) == SAMPLE_PAGE["page"]["cursor"]
+    assert list(items) == []
+    close.assert_called_once()
+
+
+def test_empty_data_and_missing_fields():
+    obj = StreamedPage([b'{"data": []}'])
+    assert list(obj["data"]) == []
+    assert "page" not in obj
+    assert obj.get("page") is None
+    with pytest.raises(KeyError):
+        obj["page"]
+
+
+def test_non_list_data():
+    obj = StreamedPage([b'{"data": {"id": "1"}}'])
+    assert obj["data"] == {"id": "1"}
+
+
+def test_invalid_json():
+    obj = StreamedPage([b'{"data": [{"id": "1"}, {"id": '])
+    items = iter(obj["data"])
+    assert next(items) == {"id": "1"}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_close_releases_response():
+    close = mock.MagicMock()
+    with StreamedPage([b'{"data": [1, 2, 3]}'], close) as obj:
+        assert next(iter(obj["data"])) == 1
+    close.assert_called_once()
+
+
+@mock.patch("friendlypins.utils.transport.requests")
+def test_rest_io_stream_pages(mock_requests):
+    pages = [
+        {"data": [{"id": "1"}, {"id": "2"}], "page": {"cursor": "abc"}},
+        {"data": [{"id": "3"}], "page": {"cursor": None}},
+    ]
+    responses = list()
+    for cur_page in pages:
+        mock_response = mock.MagicMock()
+        mock_response.iter_content.return_value = chunked(
+            json.dumps(cur_page).encode("utf-8"), 8)
+        responses.append(mock_response)
+    mock_session = mock_requests.Session.return_value
+    mock_session.get.side_effect = responses
+
+    obj = RestIO.from_kwargs("1234abcd", stream_pages=True, prefetch_pages=2)
+    items = list()
+    for cur_page in obj.get_pages("boards/1234/pins"):
+        items.extend(cur_page["data"])
+
+    assert items == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert mock_session.get.call_count == 2
+    assert mock_session.get.call_args[1]["stream"] is True
+    assert mock_session.get.call_args[1]["params"]["cursor"] == "abc"
+    for cur_response in responses:
+        cur_response.close.assert_called_once()
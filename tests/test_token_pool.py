@@ -0,0 +1,186 @@
+import pytest
+import requests
+from friendlypins.api import API
+from friendlypins.headers import Headers
+from friendlypins.testing.emulator import (
+    ApiConditions, Emulator, EmulatorServer, SyntheticAccount)
+from friendlypins.utils.retry_policy import RetryLimits, RetryPolicy
+from friendlypins.utils.token_pool import TokenPool
+from friendlypins.utils.transport import CannedResponse, FakeTransport
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_headers(remaining, limit=100, refresh=60):
+    return Headers({
+        "X-Ratelimit-Limit": str(limit),
+        "X-Ratelimit-Remaining": str(remaining),
+        "X-Ratelimit-Refresh": str(refresh),
+        "Date": "Sat, 17 Oct 2026 12:00:00 GMT",
+    })
+
+
+def test_empty_pool():
+    with pytest.raises(ValueError):
+        TokenPool([])
+
+
+def test_most_remaining_quota_wins():
+    obj = TokenPool(["token1", "token2", "token3"], clock=FakeClock())
+    # unused tokens take turns
+    first = [obj.acquire() for _ in range(3)]
+    assert sorted(first) == ["token1", "token2", "token3"]
+    obj.release("token1", make_headers(10))
+    obj.release("token2", make_headers(50))
+    obj.release("token3", make_headers(30))
+
+    assert obj.acquire() == "token2"
+    obj.release("token2", make_headers(5))
+    assert obj.acquire() == "token3"
+
+
+def test_requests_in_flight_reduce_headroom():
+    obj = TokenPool(["token1", "token2"], clock=FakeClock())
+    for cur in ("token1", "token2"):
+        obj.acquire()
+    obj.release("token1", make_headers(10))
+    obj.release("token2", make_headers(11))
+
+    assert obj.acquire() == "token2"
+    assert obj.acquire() == "token2"
+    assert obj.acquire() == "token1"
+
+
+def test_headers_without_refresh_are_ignored():
+    clock = FakeClock()
+    obj = TokenPool(["token1"], clock=clock)
+    obj.acquire()
+    obj.release("token1", make_headers(10, refresh=60))
+
+    obj.acquire()
+    headers = Headers({
+        "X-Ratelimit-Limit": "100",
+        "X-Ratelimit-Remaining": "3",
+        "Date": "Sat, 17 Oct 2026 12:00:00 GMT",
+    })
+    obj.release("token1", headers)
+    assert obj.utilization()[0]["rate_remaining"] == 10
+
+    # the quota is still restored when the original window ends
+    clock.now += 61
+    assert obj.utilization()[0]["rate_remaining"] == 100
+
+
+def test_throttled_token_blocked_until_refresh():
+    clock = FakeClock()
+    obj = TokenPool(["token1", "token2"], clock=clock)
+    obj.acquire()
+    obj.acquire()
+    obj.release("token1", make_headers(0, refresh=60), 429)
+    obj.release("token2", make_headers(0, refresh=120), 429)
+    assert not obj.available()
+
+    # when every token is blocked, the one that refreshes first is used
+    assert obj.acquire() == "token1"
+    obj.release("token1")
+
+    clock.now += 60
+    assert obj.available()
+    assert obj.acquire() == "token1"
+    usage = obj.utilization()
+    assert usage[0]["rate_remaining"] == 100
+    assert usage[0]["throttled"] == 1
+    assert not usage[1]["available"]
+
+
+def test_invalid_token_cools_down():
+    clock = FakeClock()
+    obj = TokenPool(["token1", "token2"], failure_cooldown=30, clock=clock)
+    obj.acquire()
+    obj.release("token1", status=401)
+    assert obj.acquire() == "token2"
+    obj.release("token2", make_headers(1))
+    assert obj.acquire() == "token2"
+
+    clock.now += 30
+    assert obj.acquire() == "token1"
+
+
+def test_utilization():
+    obj = TokenPool(["secret-token-1234", "secret-token-5678"])
+    assert obj.acquire() == "secret-token-1234"
+    obj.release("secret-token-1234", make_headers(75), 200)
+
+    usage = obj.utilization()
+    assert usage[0] == {
+        "token": "...1234",
+        "calls": 1,
+        "errors": 0,
+        "throttled": 0,
+        "rate_limit": 100,
+        "rate_remaining": 75,
+        "quota_used": 0.25,
+        "available": True,
+    }
+    assert usage[1]["token"] == "...5678"
+    assert usage[1]["calls"] == 0
+    assert usage[1]["quota_used"] is None
+
+
+def test_switch_token_on_auth_failure():
+    transport = FakeTransport()
+    transport.add_response("pins/1", {"data": {"id": "1", "note": "a"}})
+    transport.add_response(
+        "pins/1", CannedResponse({"message": "Authorization failed."}, 401),
+        params={"access_token": "revoked"})
+    pool = TokenPool(["revoked", "valid"])
+
+    with API(pool, transport=transport) as obj:
+        assert obj.get_pin_by_id(1).note == "a"
+        assert obj.get_pin_by_id(1).note == "a"
+
+    tokens = [cur[2]["access_token"] for cur in transport.requests]
+    assert tokens == ["revoked", "valid", "valid"]
+    usage = pool.utilization()
+    assert usage[0]["errors"] == 1
+    assert not usage[0]["available"]
+
+
+def test_failures_without_spare_tokens_are_raised():
+    transport = FakeTransport()
+    transport.add_response(
+        "pins/1", CannedResponse({"message": "Authorization failed."}, 401))
+    pool = TokenPool(["token1", "token2"])
+
+    with API(pool, transport=transport) as obj:
+        with pytest.raises(requests.HTTPError):
+            obj.get_pin_by_id(1).note
+
+    # each token is tried once
+    assert len(transport.requests) == 2
+
+
+def test_spread_across_rate_limits():
+    account = SyntheticAccount(num_boards=1, pins_per_board=100)
+    emulator = Emulator(
+        account, page_size=10, conditions=ApiConditions(rate_limit=4))
+    pool = TokenPool(["token1", "token2", "token3"])
+    policy = RetryPolicy(RetryLimits(max_attempts=1))
+
+    with EmulatorServer(emulator) as server:
+        with API(pool, root_url=server.url, retry_policy=policy) as obj:
+            board = next(iter(obj.user.boards))
+            pins = list(board.pins)
+
+    # 11 requests were needed, while each token alone is only allowed 4
+    assert len(pins) == 100
+    usage = pool.utilization()
+    assert sorted(cur["calls"] for cur in usage) == [3, 4, 4]
+    assert sorted(cur["rate_remaining"] for cur in usage) == [0, 0, 1]
+    assert emulator.throttled == 0
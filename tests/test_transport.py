@@ -0,0 +1,155 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qsl
+import pytest
+import requests
+from friendlypins.api import API
+from friendlypins.exceptions import RateLimitException
+from friendlypins.utils.rest_io import RestIO
+from friendlypins.utils.transport import CannedResponse, FakeTransport, \
+    Urllib3Transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Describes every request it receives in the JSON response data"""
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status=200):
+        length = int(self.headers.get("Content-Length", 0))
+        form = self.rfile.read(length).decode("utf-8")
+        url = urlparse(self.path)
+        body = json.dumps({"data": {
+            "method": self.command,
+            "path": url.path,
+            "params": dict(parse_qsl(url.query)),
+            "form": dict(parse_qsl(form)),
+            "if_none_match": self.headers.get("If-None-Match"),
+        }}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Ratelimit-Remaining", "42")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(500 if "fail" in self.path else 200)
+
+    def do_POST(self):
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = HTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{0}/v1".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_urllib3_get_and_post(echo_server):
+    with RestIO("1234abcd", root_url=echo_server,
+                transport=Urllib3Transport()) as obj:
+        result = obj.get("boards/1234", {"fields": "id,name"})["data"]
+        assert obj.headers.rate_remaining == 42
+        posted = obj.post("boards", {"name": "My Board"})["data"]
+
+    assert result["method"] == "GET"
+    assert result["path"] == "/v1/boards/1234"
+    assert result["params"]["fields"] == "id,name"
+    assert result["params"]["access_token"] == "1234abcd"
+    assert posted["method"] == "POST"
+    assert posted["form"] == {"name": "My Board"}
+
+
+def test_urllib3_stream(echo_server):
+    transport = Urllib3Transport()
+    response = transport.stream(
+        "get", echo_server + "/me", {"limit": "100"}, {"If-None-Match": "abc"})
+    try:
+        body = b"".join(response.iter_content(4))
+    finally:
+        response.close()
+        transport.close()
+
+    data = json.loads(body.decode("utf-8"))["data"]
+    assert data["params"] == {"limit": "100"}
+    assert data["if_none_match"] == "abc"
+
+
+def test_urllib3_errors(echo_server):
+    with RestIO("1234abcd", root_url=echo_server,
+                transport=Urllib3Transport()) as obj:
+        with pytest.raises(requests.HTTPError):
+            obj.get("fail")
+
+    # find a port nobody is listening on
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    transport = Urllib3Transport()
+    with pytest.raises(requests.ConnectionError):
+        transport.send("get", "http://127.0.0.1:{0}/v1/me".format(port))
+
+
+def test_fake_transport_pagination():
+    transport = FakeTransport()
+    transport.add_response("me", {"data": {"id": "1234"}})
+    transport.add_response("me/boards", {
+        "data": [{"id": "1", "name": "first"}],
+        "page": {"cursor": "abc"},
+    })
+    transport.add_response("me/boards", {
+        "data": [{"id": "2", "name": "second"}],
+        "page": {"cursor": None},
+    }, params={"cursor": "abc"})
+
+    with API("1234abcd", transport=transport) as obj:
+        names = [cur_board.name for cur_board in obj.user.boards]
+
+    assert names == ["first", "second"]
+    assert len(transport.requests) == 2
+    assert transport.requests[1][2]["cursor"] == "abc"
+
+
+def test_fake_transport_streaming():
+    transport = FakeTransport()
+    transport.add_response("boards/1/pins", {
+        "data": [{"id": str(i)} for i in range(250)],
+        "page": {"cursor": None},
+    })
+
+    obj = RestIO.from_kwargs("1234abcd", transport=transport, stream_pages=True)
+    ids = [
+        cur_item["id"]
+        for cur_page in obj.get_pages("boards/1/pins")
+        for cur_item in cur_page["data"]]
+    assert ids == [str(i) for i in range(250)]
+
+
+def test_fake_transport_headers_and_errors():
+    transport = FakeTransport(rate_limit=10)
+    transport.add_response("pins/1", CannedResponse(
+        {"message": "slow down"}, status=429,
+        headers={"X-Ratelimit-Refresh": "60"}))
+
+    obj = RestIO("1234abcd", transport=transport)
+    with pytest.raises(requests.HTTPError) as err:
+        obj.get("pins/2")
+    assert err.value.response.status_code == 404
+    assert obj.headers.rate_limit == 10
+    assert obj.headers.rate_remaining == 9
+
+    with pytest.raises(RateLimitException) as err:
+        obj.get("pins/1")
+    assert err.value.pin_headers.seconds_to_refresh == 60
+    assert obj.headers.rate_remaining == 8